@@ -1,3 +1,10 @@
+from core.models import OutboxEmail
 from django.contrib import admin
 
-# Register your models here.
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "to_email", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("to_email", "subject")
+    readonly_fields = ("created_at", "sent_at", "last_error")
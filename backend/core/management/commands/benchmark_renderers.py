@@ -0,0 +1,83 @@
+"""
+Django command to benchmark the JSON renderers on a large course payload.
+"""
+import json
+import time
+from datetime import date
+
+from core import renderers as core_renderers
+from course.renderers import CourseRenderer
+from django.core.management.base import BaseCommand
+from rest_framework import renderers
+from rest_framework.response import Response
+
+
+class PreviousRenderer(renderers.JSONRenderer):
+    """The renderer CourseRenderer/UserRenderer used before the shared one."""
+
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if "ErrorDetail" in str(data):
+            return json.dumps({"errors": data})
+        return json.dumps(data)
+
+
+def course_payload(count):
+    """A CourseDetailSerializer-shaped payload with `count` courses."""
+    return {
+        "courses": [
+            {
+                "id": i,
+                "category": "Programming",
+                "instructors": [
+                    {"full_name": "Jane Doe", "email": "jane@example.com", "bio": "Instructor " * 10}
+                ],
+                "title": f"Course {i}",
+                "description": "Lorem ipsum dolor sit amet. " * 20,
+                "course_image_url": f"http://localhost:8000/media/uploads/courses/{i}.png",
+                "price": "1500.00",
+                "duration": 120,
+                "batch": "Batch 1",
+                "remaining_seat": 100,
+                "start_date": date(2026, 1, 1).isoformat(),
+                "slug": f"course-{i}",
+                "time_remaining": 42,
+                "modules": [
+                    {"title": f"Module {m}", "description": "Module description", "order": m}
+                    for m in range(10)
+                ],
+            }
+            for i in range(count)
+        ]
+    }
+
+
+class Command(BaseCommand):
+    """Compare the previous str()-scanning renderer with FastJSONRenderer."""
+
+    help = "Benchmark JSON renderers on a 1,000-course payload."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--courses", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        data = course_payload(options["courses"])
+        context = {"response": Response(status=200)}
+        backend = "orjson" if core_renderers.orjson is not None else "json (stdlib)"
+        self.stdout.write(f"FastJSONRenderer backend: {backend}")
+
+        for label, renderer in (
+            ("previous", PreviousRenderer()),
+            ("fast", CourseRenderer()),
+        ):
+            body = renderer.render(data, renderer_context=context)
+            start = time.perf_counter()
+            for _ in range(options["repeat"]):
+                renderer.render(data, renderer_context=context)
+            elapsed_ms = (time.perf_counter() - start) * 1000 / options["repeat"]
+            self.stdout.write(
+                f"{label:<9} {elapsed_ms:8.2f}ms per render  {len(body):>9} bytes"
+            )
@@ -0,0 +1,112 @@
+"""
+Django command to print the query plan of each hot query.
+"""
+import uuid
+from collections import namedtuple
+
+from course.models import Course, QuizResult, StudentProgress
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from payment.models import Enrollment, Payment
+
+HotQuery = namedtuple("HotQuery", ["name", "source", "index", "queryset"])
+
+# Placeholder keys: plans depend on the filters used, not on the values
+STUDENT_ID = uuid.UUID(int=1)
+COURSE_ID = 1
+QUIZ_ID = 1
+ENROLLMENT_ID = uuid.UUID(int=2)
+
+# The recorded workload: the filters run on every request or quiz submission.
+# `index` names the index the plan must use (None: print the plan only), or
+# the names it goes by on each backend: SQLite names the index of a table's
+# UNIQUE constraint sqlite_autoindex_<table>_<n>.
+HOT_QUERIES = [
+    HotQuery(
+        "Enrollment of a student in a course",
+        "EnrollmentRepository.get_enrollment, update_enrollment_progress, CheckoutSerializer",
+        ("enrollment_unique_student_course", "sqlite_autoindex_payment_enrollment"),
+        lambda: Enrollment.objects.filter(
+            student_id=STUDENT_ID, course_id=COURSE_ID, status__in=["active", "completed"]
+        ),
+    ),
+    HotQuery(
+        "Paid enrollments of a student",
+        "EntitlementService.get_enrollment_ids (IsStudent)",
+        "enrollment_student_paid_idx",
+        lambda: Enrollment.objects.filter(student_id=STUDENT_ID, payment_status="success")
+        .exclude(status="cancelled")
+        .values_list("id", flat=True),
+    ),
+    HotQuery(
+        "Submitted result of a quiz",
+        "QuizService.submit_quiz, QuizRepository.get_submitted_result_ids",
+        "quizresult_student_quiz_idx",
+        lambda: QuizResult.objects.filter(
+            student_id=STUDENT_ID, quiz_id=QUIZ_ID, submitted=True
+        ),
+    ),
+    HotQuery(
+        "Completed quizzes of a student in a course",
+        "EnrollmentRepository.reconcile_progress, payment migration 0006 backfill",
+        "studentprogress_completed_idx",
+        lambda: StudentProgress.objects.filter(
+            student_id=STUDENT_ID, quiz__module__course_id=COURSE_ID, completed=True
+        ).values("quiz_id"),
+    ),
+    HotQuery(
+        "Pending payments of expired enrollments",
+        "EnrollmentRepository.release_expired_pending",
+        None,  # served by the unique enrollment_id index
+        lambda: Payment.objects.filter(enrollment_id__in=[ENROLLMENT_ID], status="pending"),
+    ),
+    HotQuery(
+        "Courses of a category",
+        "CatalogService.get_course_ids",
+        "category_id",  # the foreign key index
+        lambda: Course.objects.filter(category_id=1),
+    ),
+]
+
+
+class Command(BaseCommand):
+    """
+    Prints EXPLAIN for every query of HOT_QUERIES against the configured
+    database. With --check it fails when a plan stops using the index the
+    query was given, so run it after schema or query changes.
+    """
+
+    help = "Print the query plan of each hot query (--check: fail on a missing index)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check", action="store_true",
+            help="Exit with an error when a plan does not use its expected index.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        missing = []
+        for query in HOT_QUERIES:
+            plan = query.queryset().explain()
+            names = (query.index,) if isinstance(query.index, str) else query.index or ()
+            uses_index = not names or any(name in plan for name in names)
+            if not uses_index:
+                missing.append(query.name)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(query.name))
+            self.stdout.write(f"  source: {query.source}")
+            if query.index:
+                status = "ok" if uses_index else "MISSING"
+                self.stdout.write(f"  index:  {' / '.join(names)} ({status})")
+            for line in plan.splitlines():
+                self.stdout.write(f"  {line}")
+            self.stdout.write("")
+
+        self.stdout.write(
+            f"{len(HOT_QUERIES)} hot queries explained on {connection.vendor}."
+        )
+        if options["check"] and missing:
+            raise CommandError(
+                "Plans without their expected index: " + ", ".join(missing)
+            )
@@ -0,0 +1,133 @@
+"""
+Django command to aggregate the request performance log into per-endpoint percentiles.
+"""
+import json
+import math
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+METRICS = ("total_ms", "db_queries", "db_ms", "serializer_ms", "render_ms", "bytes")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def read_records(lines):
+    """Yield the request records of a core.perf log, skipping anything else."""
+    for line in lines:
+        start = line.find("{")
+        if start == -1:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except ValueError:
+            continue
+        if isinstance(record, dict) and record.get("event") == "request":
+            yield record
+
+
+def aggregate(records, percentiles):
+    """Group records by "METHOD endpoint" and compute each metric's percentiles."""
+    samples = defaultdict(lambda: defaultdict(list))
+    for record in records:
+        bucket = samples[f'{record["method"]} {record["endpoint"]}']
+        for metric in METRICS:
+            if record.get(metric) is not None:
+                bucket[metric].append(record[metric])
+        bucket["errors"].append(1 if record["status"] >= 500 else 0)
+
+    report = {}
+    for key, bucket in samples.items():
+        row = {"count": len(bucket["errors"]), "errors": sum(bucket["errors"])}
+        for metric in METRICS:
+            values = sorted(bucket[metric])
+            row[metric] = {f"p{pct:g}": percentile(values, pct) for pct in percentiles}
+        report[key] = row
+    return report
+
+
+class Command(BaseCommand):
+    """
+    Reads the JSON lines PerformanceMiddleware writes to the "core.perf"
+    logger and prints request count, 5xx count and the requested
+    percentiles of latency, queries, SQL/serializer/render time and size
+    for every endpoint.
+    """
+
+    help = "Per-endpoint percentile report from the request performance log."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "logs", nargs="*",
+            help="Log files to read (default: stdin).",
+        )
+        parser.add_argument(
+            "--percentiles", default="50,95,99",
+            help="Comma-separated percentiles to report.",
+        )
+        parser.add_argument(
+            "--sort", default="total_ms",
+            choices=METRICS + ("count",),
+            help="Metric to order endpoints by, highest last percentile first.",
+        )
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        try:
+            percentiles = [float(p) for p in options["percentiles"].split(",")]
+        except ValueError:
+            raise CommandError("--percentiles must be a comma-separated list of numbers.")
+        if not percentiles or not all(0 < p <= 100 for p in percentiles):
+            raise CommandError("Percentiles must be between 0 and 100.")
+
+        records = []
+        if options["logs"]:
+            for path in options["logs"]:
+                try:
+                    with open(path, encoding="utf-8") as log:
+                        records.extend(read_records(log))
+                except OSError as exc:
+                    raise CommandError(f"Cannot read {path}: {exc}")
+        else:
+            records.extend(read_records(sys.stdin))
+
+        report = aggregate(records, percentiles)
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        if not report:
+            self.stdout.write("No request records found.")
+            return
+
+        last = f"p{percentiles[-1]:g}"
+        sort = options["sort"]
+
+        def sort_key(item):
+            row = item[1]
+            return row["count"] if sort == "count" else (row[sort][last] or 0)
+
+        labels = [f"p{p:g}" for p in percentiles]
+        columns = [("total_ms", "ms"), ("db_queries", "queries"), ("db_ms", "sql ms"),
+                   ("serializer_ms", "ser ms"), ("render_ms", "render ms"), ("bytes", "bytes")]
+        width = max(len(key) for key in report)
+        header = f"{'endpoint':<{width}} {'count':>6} {'5xx':>4}"
+        for _, title in columns:
+            header += f"  {title + ' ' + '/'.join(labels):>24}"
+        self.stdout.write(header)
+        for key, row in sorted(report.items(), key=sort_key, reverse=True):
+            line = f"{key:<{width}} {row['count']:>6} {row['errors']:>4}"
+            for metric, _ in columns:
+                values = "/".join(
+                    "-" if row[metric][label] is None else f"{row[metric][label]:g}"
+                    for label in labels
+                )
+                line += f"  {values:>24}"
+            self.stdout.write(line)
@@ -0,0 +1,39 @@
+"""
+Django command to deliver queued emails from the outbox.
+"""
+import time
+
+from core.services.email_outbox_service import EmailOutboxService
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+
+class Command(BaseCommand):
+    """Background worker draining the email outbox in batches."""
+
+    help = "Send queued outbox emails, retrying failures with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true", help="Drain the due emails and exit."
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+            help="Seconds to sleep when the outbox is empty.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        while True:
+            close_old_connections()
+            sent, failed = EmailOutboxService.send_batch(options["batch_size"])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} email(s), {failed} failed.")
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,130 @@
+"""
+Per-request performance instrumentation.
+"""
+import json
+import logging
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework import serializers
+
+logger = logging.getLogger("core.perf")
+
+_metrics = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Counters collected while one request is being handled."""
+
+    __slots__ = ("queries", "sql", "serializer", "render", "render_start")
+
+    def __init__(self):
+        self.queries = 0
+        self.sql = 0.0
+        self.serializer = 0.0
+        self.render = 0.0
+        self.render_start = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute_wrapper: counts and times every statement."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql += time.perf_counter() - start
+            self.queries += 1
+
+
+_serializer_data = serializers.BaseSerializer.data
+
+
+def _timed_serializer_data(self):
+    metrics = _metrics.get()
+    if metrics is None:
+        return _serializer_data.fget(self)
+    start = time.perf_counter()
+    try:
+        return _serializer_data.fget(self)
+    finally:
+        metrics.serializer += time.perf_counter() - start
+
+
+class PerformanceMiddleware:
+    """
+    Records per-request query count, SQL time, serializer time, renderer
+    time and response size. They are sent back as a Server-Timing header and
+    logged as one JSON line on the "core.perf" logger, tagged with the
+    resolved URL name; `manage.py perf_report` aggregates that log.
+
+    Disabled unless PERF_INSTRUMENTATION is set, in which case Django drops
+    the middleware at startup and requests pay nothing for it. Serializer
+    time is the time spent in `serializer.data`, queries evaluated lazily
+    from there included.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PERF_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        serializers.BaseSerializer.data = property(_timed_serializer_data)
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _metrics.reset(token)
+        total = time.perf_counter() - start
+
+        if not response.streaming:
+            size = len(response.content)
+        elif response.has_header("Content-Length"):
+            size = int(response["Content-Length"])
+        else:
+            size = None
+        match = request.resolver_match
+        record = {
+            "event": "request",
+            "endpoint": match.url_name if match and match.url_name else "unresolved",
+            "method": request.method,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "db_queries": metrics.queries,
+            "db_ms": round(metrics.sql * 1000, 2),
+            "serializer_ms": round(metrics.serializer * 1000, 2),
+            "render_ms": round(metrics.render * 1000, 2),
+            "bytes": size,
+        }
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;desc="{metrics.queries} queries";dur={record["db_ms"]}',
+                f'ser;dur={record["serializer_ms"]}',
+                f'render;dur={record["render_ms"]}',
+                f'total;dur={record["total_ms"]}',
+            ]
+        )
+        logger.info(json.dumps(record))
+        return response
+
+    def process_template_response(self, request, response):
+        """Runs right before DRF renders the response; times the render."""
+        metrics = _metrics.get()
+        if metrics is not None:
+            metrics.render_start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: self._rendered(metrics)
+            )
+        return response
+
+    @staticmethod
+    def _rendered(metrics):
+        metrics.render += time.perf_counter() - metrics.render_start
@@ -0,0 +1,40 @@
+from django.db import models
+
+
+class OutboxEmailStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    SENT = "sent", "Sent"
+    DEAD = "dead", "Dead"
+
+
+class OutboxEmail(models.Model):
+    """
+    An email waiting to be delivered by the `send_outbox_emails` worker.
+    Rows are written in the request's transaction, so the mail only goes out
+    if the work that produced it was committed.
+    """
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True, null=True)
+    to_email = models.EmailField()
+    status = models.CharField(
+        max_length=10,
+        choices=OutboxEmailStatus.choices,
+        default=OutboxEmailStatus.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="outbox_status_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
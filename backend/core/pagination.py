@@ -0,0 +1,190 @@
+"""
+Keyset (cursor) pagination and field projection shared by the list endpoints.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from bisect import bisect_right
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination.
+
+    Pages are read with `WHERE (keys) > (last keys) ORDER BY keys LIMIT n`,
+    so every page costs the same whatever its depth and memory stays bounded.
+    The cursor is an opaque token holding the ordering keys of the last row.
+    Subclasses set `ordering` (unique, e.g. ending with the primary key) and
+    `results_key`, the name of the list in the response body.
+    """
+
+    ordering = ("id",)
+    results_key = "results"
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def get_page_size(self, request):
+        page_size = getattr(settings, "API_PAGE_SIZE", 50)
+        max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", 200)
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return page_size
+        return max(1, min(requested, max_page_size))
+
+    def encode_cursor(self, values):
+        data = json.dumps([str(value) for value in values]).encode("utf-8")
+        return urlsafe_b64encode(data).decode("ascii")
+
+    def decode_cursor(self, request, model=None):
+        """Return the ordering keys carried by the request's cursor, or None."""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode("ascii")))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            if model is not None:
+                values = [
+                    model._meta.get_field(name.lstrip("-")).to_python(value)
+                    for name, value in zip(self.ordering, values)
+                ]
+        except (ValueError, TypeError, DjangoValidationError):
+            raise NotFound("Invalid cursor.")
+        return values
+
+    def keyset_filter(self, values):
+        """Build `(a, b, c) > (x, y, z)` for the ordering, honoring '-' prefixes."""
+        condition = Q()
+        for position, name in enumerate(self.ordering):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            step = Q(**{f"{field}__{lookup}": values[position]})
+            for previous, value in zip(self.ordering[:position], values):
+                step &= Q(**{previous.lstrip("-"): value})
+            condition |= step
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        after = self.decode_cursor(request, queryset.model)
+        if after is not None:
+            queryset = queryset.filter(self.keyset_filter(after))
+
+        # Fetch one extra row to know whether there is a next page
+        rows = list(queryset.order_by(*self.ordering)[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        page = rows[: self.page_size]
+        self.next_values = (
+            [getattr(page[-1], name.lstrip("-")) for name in self.ordering]
+            if self.has_next
+            else None
+        )
+        return page
+
+    def paginate_keys(self, keys, request):
+        """
+        Paginate an already sorted in-memory list of single-column keys
+        (ascending ordering only). Returns the keys of the page.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        after = self.decode_cursor(request)
+        start = 0
+        if after is not None:
+            try:
+                start = bisect_right(keys, type(keys[0])(after[0])) if keys else 0
+            except ValueError:
+                raise NotFound("Invalid cursor.")
+
+        page = keys[start : start + self.page_size]
+        self.has_next = start + self.page_size < len(keys)
+        self.next_values = [page[-1]] if self.has_next else None
+        return page
+
+    def paginate_ranked(self, hits, request):
+        """
+        Paginate search hits, a list of (score, id) sorted best first with
+        ties by id. The cursor carries the last hit's score and id, so pages
+        stay stable while the ranking is recomputed. Returns the page's ids.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        after = self.decode_cursor(request)
+        start = 0
+        if after is not None:
+            try:
+                last = (-float(after[0]), int(after[1]))
+            except (ValueError, IndexError):
+                raise NotFound("Invalid cursor.")
+            start = bisect_right(hits, last, key=lambda hit: (-hit[0], hit[1]))
+
+        page = hits[start : start + self.page_size]
+        self.has_next = start + self.page_size < len(hits)
+        self.next_values = list(page[-1]) if self.has_next else None
+        return [doc_id for _, doc_id in page]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_values)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({self.results_key: data, "next": self.get_next_link()})
+
+
+def get_requested_fields(request, serializer_class):
+    """
+    Parse `?fields=a,b,c` into the subset of the serializer's fields to
+    return. Unknown names are ignored; None means "all fields".
+    """
+    requested = request.query_params.get("fields")
+    if not requested:
+        return None
+    available = serializer_class.Meta.fields
+    fields = [name for name in requested.split(",") if name in available]
+    return fields or None
+
+
+class FieldProjectionMixin:
+    """
+    Serializer mixin that only outputs the requested `fields`, and can tell
+    which model columns those fields read so the queryset can use `.only()`.
+
+    `projection_sources` maps serializer fields that are not plain model
+    columns (methods, nested sources) to the model fields they need.
+    """
+
+    projection_sources = {}
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def get_only_fields(cls, fields, extra=()):
+        """Model fields to pass to `QuerySet.only()` for the requested fields."""
+        only = set(extra)
+        for name in fields:
+            if name in cls.projection_sources:
+                only.update(cls.projection_sources[name])
+            else:
+                only.add(name)
+        return sorted(only)
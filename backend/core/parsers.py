@@ -0,0 +1,33 @@
+"""
+Request parsers shared by the API views.
+"""
+import csv
+import io
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+def parse_csv(stream, encoding=None):
+    """Read a CSV upload into a list of {header: value} rows."""
+    try:
+        reader = csv.DictReader(
+            io.StringIO(stream.read().decode(encoding or settings.DEFAULT_CHARSET))
+        )
+        rows = list(reader)
+    except (csv.Error, UnicodeDecodeError) as exc:
+        raise ParseError(f"CSV parse error - {exc}")
+    if reader.fieldnames is None:
+        raise ParseError("CSV parse error - the file is empty")
+    return rows
+
+
+class CSVParser(BaseParser):
+    """Parses a text/csv body into a list of rows keyed by the header line."""
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        return parse_csv(stream, parser_context.get("encoding"))
@@ -0,0 +1,62 @@
+"""
+JSON renderer shared by the API views.
+"""
+import json
+
+from rest_framework import renderers
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.utils.encoders import JSONEncoder
+
+try:  # optional fast backend
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+_encoder = JSONEncoder()
+
+
+def contains_error_detail(data):
+    """Walk the payload and stop at the first DRF ErrorDetail."""
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, ErrorDetail):
+            return True
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def dumps(data):
+    """Encode data to UTF-8 JSON bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(
+            data, default=_encoder.default, option=orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(
+        data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    Renders the payload in a single encoding pass. DRF validation errors are
+    wrapped as {"errors": ...}; the payload is only searched for them on
+    error responses (or when rendered outside a response).
+    """
+
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        response = (renderer_context or {}).get("response")
+        if response is None or response.status_code >= 400:
+            if contains_error_detail(data):
+                data = {"errors": data}
+
+        return dumps(data)
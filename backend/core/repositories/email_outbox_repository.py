@@ -0,0 +1,54 @@
+from core.models import OutboxEmail, OutboxEmailStatus
+from django.db import transaction
+
+
+class EmailOutboxRepository:
+    """Handles database operations for the email outbox"""
+
+    @staticmethod
+    def create_email(subject, body, to_email, from_email, next_attempt_at):
+        """Queue a new email."""
+        return OutboxEmail.objects.create(
+            subject=subject,
+            body=body,
+            to_email=to_email,
+            from_email=from_email,
+            next_attempt_at=next_attempt_at,
+        )
+
+    @staticmethod
+    def claim_due_emails(now, batch_size, lease_until):
+        """
+        Lock up to `batch_size` due emails, push their next attempt to
+        `lease_until` and count the attempt, so a worker that dies mid-batch
+        only delays them. Rows locked by another worker are skipped.
+        """
+        with transaction.atomic():
+            emails = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True)
+                .filter(status=OutboxEmailStatus.PENDING, next_attempt_at__lte=now)
+                .order_by("next_attempt_at", "id")[:batch_size]
+            )
+            if emails:
+                for email in emails:
+                    email.attempts += 1
+                    email.next_attempt_at = lease_until
+                OutboxEmail.objects.bulk_update(emails, ["attempts", "next_attempt_at"])
+        return emails
+
+    @staticmethod
+    def mark_sent(emails, sent_at):
+        """Mark delivered emails as sent in one query."""
+        OutboxEmail.objects.filter(id__in=[email.id for email in emails]).update(
+            status=OutboxEmailStatus.SENT, sent_at=sent_at, last_error=""
+        )
+
+    @staticmethod
+    def mark_failed(email, error, next_attempt_at=None):
+        """Schedule a retry, or move the email to the dead state when `next_attempt_at` is None."""
+        fields = {"last_error": error}
+        if next_attempt_at is None:
+            fields["status"] = OutboxEmailStatus.DEAD
+        else:
+            fields["next_attempt_at"] = next_attempt_at
+        OutboxEmail.objects.filter(id=email.id).update(**fields)
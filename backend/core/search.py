@@ -0,0 +1,153 @@
+"""
+In-process inverted index with ranked, prefix-matching search.
+"""
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lower-cased word tokens of a text."""
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+class InvertedIndex:
+    """
+    Maps terms to the documents holding them, with a per-field weight.
+
+    A query matches the documents containing every query term, where a term
+    also matches the indexed terms it is a prefix of ("pyth" finds
+    "python"). Documents are ranked by the sum of their best TF-IDF score
+    per query term, prefix matches counting for less than exact ones.
+    Ranked results are memoized until the index changes.
+    """
+
+    prefix_boost = 0.7
+    cache_size = 256
+
+    def __init__(self, weights, min_prefix=2, max_expansions=64):
+        self.weights = weights
+        self.min_prefix = min_prefix
+        self.max_expansions = max_expansions
+        self.postings = {}  # term -> {doc_id: weighted term frequency}
+        self.doc_terms = {}  # doc_id -> terms, to remove a document
+        self.terms = []  # sorted, for prefix lookups
+        self._results = {}
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def add(self, doc_id, fields):
+        """Index (or re-index) a document given as {field: text}."""
+        self.remove(doc_id)
+        for term in self._add(doc_id, fields):
+            insort(self.terms, term)
+        self._results.clear()
+
+    def add_many(self, documents):
+        """Index an iterable of (doc_id, {field: text}), sorting the terms once."""
+        for doc_id, fields in documents:
+            self.remove(doc_id)
+            self.terms.extend(self._add(doc_id, fields))
+        self.terms.sort()
+        self._results.clear()
+
+    def _add(self, doc_id, fields):
+        """Add a document's postings; returns the terms new to the index."""
+        frequencies = Counter()
+        for field, text in fields.items():
+            weight = self.weights.get(field, 1.0)
+            for term in tokenize(text):
+                frequencies[term] += weight
+        new_terms = []
+        for term, frequency in frequencies.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                new_terms.append(term)
+            postings[doc_id] = 1 + math.log(frequency)
+        self.doc_terms[doc_id] = tuple(frequencies)
+        return new_terms
+
+    def remove(self, doc_id):
+        """Drop a document from the index; unknown ids are ignored."""
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+                del self.terms[bisect_left(self.terms, term)]
+        self._results.clear()
+
+    def expand(self, term):
+        """The indexed terms a query term matches, with their boost."""
+        matches = [(term, 1.0)] if term in self.postings else []
+        if len(term) < self.min_prefix:
+            return matches
+        start = bisect_left(self.terms, term)
+        for candidate in self.terms[start : start + self.max_expansions + 1]:
+            if not candidate.startswith(term):
+                break
+            if candidate != term:
+                matches.append((candidate, self.prefix_boost))
+        return matches
+
+    def search(self, query, limit=None):
+        """
+        Return [(score, doc_id)] for the (first `limit`) documents matching
+        every term of the query, best first (ties by id).
+        """
+        terms = tuple(dict.fromkeys(tokenize(query)))
+        ranked = self._results.get(terms)
+        if ranked is None:
+            ranked = self._rank(terms)
+            if len(self._results) >= self.cache_size:
+                self._results.clear()
+            self._results[terms] = ranked
+        return [(-negative, doc_id) for negative, doc_id in ranked[:limit]]
+
+    def _rank(self, terms):
+        """[(-score, doc_id)] of the documents matching every term, sorted."""
+
+        total = len(self.doc_terms)
+        weighted = [
+            [(self.postings[term], boost * math.log(1 + total / len(self.postings[term])))
+             for term, boost in self.expand(term)]
+            for term in terms
+        ]
+        # Start from the rarest query term, then only score its candidates
+        weighted.sort(key=lambda matches: sum(len(postings) for postings, _ in matches))
+
+        scores = {}
+        for position, matches in enumerate(weighted):
+            if position == 0:
+                if len(matches) == 1:
+                    postings, weight = matches[0]
+                    scores = {doc_id: weight * freq for doc_id, freq in postings.items()}
+                    continue
+                for postings, weight in matches:
+                    for doc_id, freq in postings.items():
+                        score = weight * freq
+                        if score > scores.get(doc_id, 0):
+                            scores[doc_id] = score
+                continue
+            next_scores = {}
+            for doc_id, score in scores.items():
+                best = 0
+                for postings, weight in matches:
+                    freq = postings.get(doc_id)
+                    if freq is not None and freq * weight > best:
+                        best = freq * weight
+                if best:
+                    next_scores[doc_id] = score + best
+            scores = next_scores
+            if not scores:
+                break
+
+        return sorted((-score, doc_id) for doc_id, score in scores.items())
@@ -0,0 +1,86 @@
+import os
+from datetime import timedelta
+
+from core.repositories.email_outbox_repository import EmailOutboxRepository
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+
+class EmailOutboxService:
+    """
+    Queues outgoing email in the database and delivers it in batches from a
+    background worker, so requests never wait on the SMTP server.
+    """
+
+    @staticmethod
+    def enqueue(subject, body, to_email):
+        """Queue an email; it is picked up once the current transaction commits."""
+        return EmailOutboxRepository.create_email(
+            subject=subject,
+            body=body,
+            to_email=to_email,
+            from_email=os.environ.get("EMAIL_FROM"),
+            next_attempt_at=timezone.now(),
+        )
+
+    @staticmethod
+    def get_retry_delay(attempts):
+        """Exponential backoff: base, 2x base, 4x base, ... capped."""
+        delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+        return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_RETRY_DELAY))
+
+    @staticmethod
+    def send_batch(batch_size=None):
+        """
+        Deliver one batch of due emails over a single backend connection.
+        Returns (sent, failed) counts.
+        """
+        batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        now = timezone.now()
+        emails = EmailOutboxRepository.claim_due_emails(
+            now, batch_size, now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+        )
+        if not emails:
+            return 0, 0
+
+        sent, failed = [], 0
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+            for email in emails:
+                message = EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    from_email=email.from_email,
+                    to=[email.to_email],
+                    connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as exc:
+                    failed += 1
+                    EmailOutboxService._fail(email, exc)
+                else:
+                    sent.append(email)
+        except Exception as exc:
+            # Could not even connect: retry whatever has not been sent yet
+            for email in emails[len(sent) + failed :]:
+                failed += 1
+                EmailOutboxService._fail(email, exc)
+        finally:
+            connection.close()
+
+        if sent:
+            EmailOutboxRepository.mark_sent(sent, timezone.now())
+        return len(sent), failed
+
+    @staticmethod
+    def _fail(email, exc):
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            next_attempt_at = None  # dead letter
+        else:
+            next_attempt_at = timezone.now() + EmailOutboxService.get_retry_delay(
+                email.attempts
+            )
+        EmailOutboxRepository.mark_failed(email, repr(exc), next_attempt_at)
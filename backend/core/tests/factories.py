@@ -0,0 +1,279 @@
+"""
+Fixture factory for the endpoint budget suite: seeds a realistic dataset
+with bulk INSERTs, sized by a scale factor (1.0: a thousand courses).
+"""
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from course.models import (
+    Bannerdata,
+    Course,
+    CourseCategory,
+    CourseClass,
+    Lesson,
+    MCQQuestion,
+    Module,
+    Option,
+    Quiz,
+    QuizAttempt,
+    QuizResult,
+    StudentProgress,
+)
+from course.services.course_search_service import CourseSearchService
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+from payment.models import Enrollment, Payment
+from useraccount.models import Instructor, RoleChoices, User
+
+PASSWORD = "Budget@Pass123"
+COURSE_PRICE = Decimal("1500.00")
+MODULES_PER_COURSE = 2
+LESSONS_PER_MODULE = 2
+QUESTIONS_PER_QUIZ = 5
+
+
+def bulk_create(model, objects, batch_size=1000):
+    """
+    bulk_create that always leaves primary keys set. MySQL returns no keys
+    from bulk INSERTs, so they are read back; the factory seeds empty tables.
+    """
+    objects = model.objects.bulk_create(objects, batch_size=batch_size)
+    if objects and objects[0].pk is None:
+        pks = model.objects.order_by("-pk").values_list("pk", flat=True)[: len(objects)]
+        for obj, pk in zip(objects, reversed(list(pks))):
+            obj.pk = pk
+    return objects
+
+
+def seed_dataset(scale=1.0):
+    """
+    Seed categories, courses with modules, lessons, classes and quizzes,
+    students with paid enrollments, payments, quiz results and progress.
+    Returns the handles the endpoint specs use.
+    """
+    course_count = max(int(1000 * scale), 10)
+    student_count = max(int(2000 * scale), 10)
+    password = make_password(PASSWORD)
+
+    def user(index, role=RoleChoices.STUDENT, **fields):
+        fields = {"is_verified": True, **fields}
+        return User(
+            email=f"{role}{index}@example.com",
+            full_name=f"{role.title()} {index}",
+            contact_number=f"{1000000000 + len(users)}",
+            role=role,
+            password=password,
+            accept_terms=True,
+            **fields,
+        )
+
+    users = []
+    users.append(user(0, RoleChoices.ADMIN, is_staff=True))
+    for i in range(10):
+        users.append(user(i, RoleChoices.INSTRUCTOR))
+    for i in range(student_count):
+        users.append(user(i))
+    users.append(user(0, RoleChoices.STUDENT, is_verified=False, otp="123456"))
+    users[-1].email = "unverified@example.com"
+    bulk_create(User, users)
+    admin, instructors = users[0], users[1:11]
+    students = users[11 : 11 + student_count]
+    unverified = users[-1]
+    instructor_profiles = bulk_create(
+        Instructor, [Instructor(user=instructor, bio="Teaches " * 20) for instructor in instructors]
+    )
+
+    categories = bulk_create(
+        CourseCategory, [CourseCategory(name=f"Category {i}") for i in range(10)]
+    )
+    courses = bulk_create(
+        Course,
+        [
+            Course(
+                category=categories[i % len(categories)],
+                title=f"Course {i}",
+                slug=f"course-{i}",
+                description="A realistic course description. " * 20,
+                price=COURSE_PRICE,
+                duration=120,
+                batch=f"Batch {i % 5}",
+                remaining_seat=100,
+                demo_url="https://example.com/demo",
+                total_quiz_count=MODULES_PER_COURSE,
+            )
+            for i in range(course_count)
+        ],
+    )
+    Course.instructors.through.objects.bulk_create(
+        [
+            Course.instructors.through(
+                course_id=course.id,
+                instructor_id=instructor_profiles[i % len(instructor_profiles)].id,
+            )
+            for i, course in enumerate(courses)
+        ],
+        batch_size=1000,
+    )
+    CourseSearchService.rebuild()  # bulk writes skip the signals that keep it
+    bulk_create(
+        CourseClass,
+        [
+            CourseClass(course=course, title=f"Live class {order}", order=order)
+            for course in courses
+            for order in (1, 2)
+        ],
+    )
+    bulk_create(
+        Bannerdata, [Bannerdata(title=f"Banner {i}", sub_title="Enroll now") for i in range(5)]
+    )
+
+    modules = bulk_create(
+        Module,
+        [
+            Module(course=course, title=f"Module {order}", description="", order=order)
+            for course in courses
+            for order in range(1, MODULES_PER_COURSE + 1)
+        ],
+    )
+    bulk_create(
+        Lesson,
+        [
+            Lesson(
+                module=module,
+                title=f"Lesson {order}",
+                content="https://example.com/video",
+                duration=15,
+                order=order,
+            )
+            for module in modules
+            for order in range(1, LESSONS_PER_MODULE + 1)
+        ],
+    )
+    quizzes = bulk_create(
+        Quiz,
+        [
+            Quiz(
+                module=module,
+                title=f"{module.title} quiz",
+                total_questions=QUESTIONS_PER_QUIZ,
+                passing_score=3,
+            )
+            for module in modules
+        ],
+    )
+    questions = bulk_create(
+        MCQQuestion,
+        [
+            MCQQuestion(quiz=quiz, question_text=f"Question {i}", correct_option_index=i % 4 + 1)
+            for quiz in quizzes
+            for i in range(QUESTIONS_PER_QUIZ)
+        ],
+    )
+    bulk_create(
+        Option,
+        [
+            Option(
+                question=question,
+                option_text=f"Option {order}",
+                order=order,
+                is_correct=order == question.correct_option_index,
+            )
+            for question in questions
+            for order in range(1, 5)
+        ],
+        batch_size=5000,
+    )
+
+    # Each student holds two paid enrollments; the ones in course 1 are complete
+    enrollments = []
+    for i, student in enumerate(students):
+        for course in (courses[(2 * i) % course_count], courses[(2 * i + 1) % course_count]):
+            completed = course is courses[1]
+            enrollments.append(
+                Enrollment(
+                    student=student,
+                    course=course,
+                    status="completed" if completed else "active",
+                    payment_status="success",
+                    progress=100 if completed else 50,
+                    completed_quiz_count=MODULES_PER_COURSE if completed else 1,
+                    certificate_issued=completed,
+                    certificate_issue_date=timezone.now() if completed else None,
+                    completion_date=timezone.now() if completed else None,
+                )
+            )
+    pending = Enrollment(student=students[1], course=courses[4])
+    bulk_create(Enrollment, enrollments + [pending])
+    bulk_create(
+        Payment,
+        [
+            Payment(
+                enrollment=enrollment,
+                amount=COURSE_PRICE,
+                transaction_id=f"TX-{i}",
+                status="success",
+            )
+            for i, enrollment in enumerate(enrollments)
+        ]
+        + [Payment(enrollment=pending, amount=COURSE_PRICE, transaction_id="TX-PENDING")],
+    )
+
+    # Every enrollment has the first module's quiz submitted
+    first_quizzes = {quiz.module.course_id: quiz for quiz in quizzes if quiz.module.order == 1}
+    submitted = [(e.student, first_quizzes[e.course_id]) for e in enrollments]
+    quiz_results = bulk_create(
+        QuizResult,
+        [
+            QuizResult(
+                student=student,
+                quiz=quiz,
+                selected_options={},
+                obtained_marks=3,
+                total_marks=QUESTIONS_PER_QUIZ,
+                submitted=True,
+                submission_time=timezone.now(),
+            )
+            for student, quiz in submitted
+        ],
+    )
+    bulk_create(
+        StudentProgress,
+        [StudentProgress(student=student, quiz=quiz, completed=True) for student, quiz in submitted],
+    )
+
+    # An open attempt at the quiz the student has not submitted yet
+    quiz_attempt = QuizAttempt.objects.create(
+        student=students[0], quiz=quizzes[1], deadline=timezone.now() + timedelta(days=1)
+    )
+
+    course = courses[0]
+    extra_module = Module.objects.create(
+        course=course, title="Module without quiz", description="", order=MODULES_PER_COURSE + 1
+    )
+    first_module, second_module = modules[0], modules[1]
+    return SimpleNamespace(
+        admin=admin,
+        student=students[0],
+        unverified=unverified,
+        course=course,
+        completed_course=courses[1],
+        open_course=courses[2],
+        enrollment=enrollments[0],
+        completed_enrollment=enrollments[1],
+        module=first_module,
+        open_module=second_module,
+        extra_module=extra_module,
+        quiz=quizzes[0],
+        open_quiz=quizzes[1],
+        quiz_attempt=quiz_attempt,
+        question=questions[0],
+        quiz_result=quiz_results[0],
+        pending_transaction_id="TX-PENDING",
+        counts={
+            "courses": course_count,
+            "students": student_count,
+            "enrollments": len(enrollments) + 1,
+            "quiz_results": len(quiz_results),
+        },
+    )
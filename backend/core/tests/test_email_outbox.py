@@ -0,0 +1,75 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from core.models import OutboxEmail, OutboxEmailStatus
+from core.services.email_outbox_service import EmailOutboxService
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    EMAIL_OUTBOX_MAX_ATTEMPTS=2,
+)
+class EmailOutboxTestCase(TestCase):
+
+    def test_registration_queues_otp_without_sending(self):
+        response = self.client.post(
+            reverse("register"),
+            {
+                "full_name": "Test User",
+                "email": "testuser@example.com",
+                "password": "TestPassword@123",
+                "password2": "TestPassword@123",
+                "contact_number": "1234567890",
+                "accept_terms": True,
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(mail.outbox), 0)
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to_email, "testuser@example.com")
+        self.assertEqual(email.status, OutboxEmailStatus.PENDING)
+
+    def test_worker_sends_due_emails(self):
+        for i in range(3):
+            EmailOutboxService.enqueue("Subject", "Body", f"user{i}@example.com")
+
+        call_command("send_outbox_emails", "--once", stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(
+            OutboxEmail.objects.filter(status=OutboxEmailStatus.SENT).count(), 3
+        )
+
+    def test_failed_email_is_retried_then_dead_lettered(self):
+        email = EmailOutboxService.enqueue("Subject", "Body", "user@example.com")
+
+        with patch(
+            "django.core.mail.EmailMessage.send", side_effect=OSError("SMTP down")
+        ):
+            self.assertEqual(EmailOutboxService.send_batch(), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual(email.status, OutboxEmailStatus.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+            self.assertIn("SMTP down", email.last_error)
+
+            # Not due yet, so nothing is claimed
+            self.assertEqual(EmailOutboxService.send_batch(), (0, 0))
+
+            OutboxEmail.objects.update(
+                next_attempt_at=timezone.now() - timedelta(seconds=1)
+            )
+            EmailOutboxService.send_batch()
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboxEmailStatus.DEAD)
+        self.assertEqual(email.attempts, 2)
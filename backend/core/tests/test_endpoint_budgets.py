@@ -0,0 +1,363 @@
+"""
+Query-count, latency and response-size budgets for every API endpoint.
+
+The dataset is seeded once (core.tests.factories, PERF_SCALE=1.0 is a
+thousand courses and two thousand students). Each endpoint is requested
+once to warm its caches, then PERF_ITERATIONS times; every request runs
+in a rolled-back savepoint so writes can be repeated. Results are checked
+against endpoint_budgets.json. Query counts are budgeted per database
+vendor: MySQL reads back the keys of bulk-inserted rows and searches
+courses through its FULLTEXT index, so some endpoints take more queries
+there than on SQLite. Run only this suite with `manage.py test --tag perf`,
+skip it with `--exclude-tag perf` (as the CI test job does; budgets run
+in their own job on pull requests, on MySQL), and rewrite the budgets
+from a run with PERF_RECORD_BUDGETS=1; the query counts of other vendors
+are kept.
+"""
+import gc
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+from base64 import urlsafe_b64encode
+from collections import namedtuple
+from pathlib import Path
+
+from core.tests.factories import PASSWORD, QUESTIONS_PER_QUIZ, seed_dataset
+from course import urls as course_urls
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.encoding import force_bytes, smart_str
+from payment import urls as payment_urls
+from rest_framework.test import APIClient
+from useraccount import urls as useraccount_urls
+from useraccount.authentication import get_token_with_claims
+
+BUDGETS_PATH = Path(__file__).with_name("endpoint_budgets.json")
+SCALE = float(os.getenv("PERF_SCALE", 1.0))
+ITERATIONS = int(os.getenv("PERF_ITERATIONS", 10))
+MEDIA_ROOT = tempfile.mkdtemp(prefix="slms-budget-media-")
+
+# method, URL name, acting user (None: anonymous), request builder, expected status.
+# The builder takes the seeded dataset and returns (path, payload).
+Endpoint = namedtuple("Endpoint", ["method", "name", "user", "build", "status"])
+
+
+def question_payload(correct=1):
+    return {
+        "question_text": "Which option is right?",
+        "correct_option_index": correct,
+        "Options": [[f"Answer {order}", order == correct] for order in range(1, 5)],
+    }
+
+
+ENDPOINTS = [
+    # useraccount
+    Endpoint("post", "register", None, lambda d: (reverse("register"), {
+        "full_name": "New Student",
+        "email": "new.student@example.com",
+        "password": PASSWORD,
+        "password2": PASSWORD,
+        "contact_number": "1999999999",
+        "accept_terms": True,
+    }), 201),
+    Endpoint("post", "login", None, lambda d: (
+        reverse("login"), {"email": d.student.email, "password": PASSWORD}
+    ), 200),
+    Endpoint("post", "token_refresh", None, lambda d: (
+        reverse("token_refresh"), {"refresh": str(get_token_with_claims(d.student))}
+    ), 200),
+    Endpoint("post", "verify-email", None, lambda d: (
+        reverse("verify-email"), {"email": d.unverified.email, "otp": "123456"}
+    ), 200),
+    Endpoint("post", "resend-otp", None, lambda d: (
+        reverse("resend-otp"), {"email": d.unverified.email}
+    ), 200),
+    Endpoint("get", "profile", "student", lambda d: (reverse("profile"), None), 200),
+    Endpoint("patch", "profile", "student", lambda d: (
+        reverse("profile"), {"full_name": "Renamed Student"}
+    ), 200),
+    Endpoint("post", "changepassword", "student", lambda d: (
+        reverse("changepassword"), {"password": "Changed@Pass123", "password2": "Changed@Pass123"}
+    ), 200),
+    Endpoint("post", "send-reset-password-email", None, lambda d: (
+        reverse("send-reset-password-email"), {"email": d.student.email}
+    ), 200),
+    Endpoint("post", "reset-password", None, lambda d: (
+        reverse("reset-password", args=[
+            smart_str(urlsafe_b64encode(force_bytes(d.student.id))),
+            PasswordResetTokenGenerator().make_token(d.student),
+        ]),
+        {"password": "Changed@Pass123", "password2": "Changed@Pass123"},
+    ), 200),
+    Endpoint("get", "all-users", "admin", lambda d: (reverse("all-users"), None), 200),
+    # course catalog
+    Endpoint("get", "course-list", None, lambda d: (reverse("course-list"), None), 200),
+    Endpoint("get", "course-search", None, lambda d: (f'{reverse("course-search")}?q=cours', None), 200),
+    Endpoint("get", "course-filter", None, lambda d: (
+        f'{reverse("course-filter")}?category=Category 0&available=true', None
+    ), 200),
+    Endpoint("get", "course-banner", None, lambda d: (reverse("course-banner"), None), 200),
+    Endpoint("get", "course-category", None, lambda d: (reverse("course-category"), None), 200),
+    Endpoint("get", "course-detail", None, lambda d: (
+        reverse("course-detail", args=[d.course.slug]), None
+    ), 200),
+    Endpoint("post", "course-create", "admin", lambda d: (reverse("course-create"), {
+        "category_name": "Category 0",
+        "title": "Budget Course",
+        "description": "A new course.",
+        "price": "1500.00",
+        "duration": 120,
+        "batch": "Batch 1",
+        "remaining_seat": 100,
+        "demo_url": "https://example.com/demo",
+    }), 201),
+    Endpoint("put", "update-course", "admin", lambda d: (
+        reverse("update-course", args=[d.course.id]), {"batch": "Batch 9"}
+    ), 200),
+    Endpoint("delete", "delete-course", "admin", lambda d: (
+        reverse("delete-course", args=[d.open_course.id]), None
+    ), 204),
+    # enrolled students
+    Endpoint("get", "enrollment-detail", "student", lambda d: (
+        reverse("enrollment-detail", args=[d.enrollment.id]), None
+    ), 200),
+    Endpoint("get", "enrolled-course-modules", "student", lambda d: (
+        reverse("enrolled-course-modules", args=[d.enrollment.id]), None
+    ), 200),
+    Endpoint("get", "enrollment-classes", "student", lambda d: (
+        reverse("enrollment-classes", args=[d.enrollment.id]), None
+    ), 200),
+    Endpoint("get", "enrolled-course-module-quizzes", "student", lambda d: (
+        reverse("enrolled-course-module-quizzes", args=[d.enrollment.id, d.module.id]), None
+    ), 200),
+    Endpoint("get", "quiz-result-detail", "student", lambda d: (
+        reverse("quiz-result-detail", args=[d.enrollment.id, d.module.id, d.quiz_result.id]),
+        None,
+    ), 200),
+    Endpoint("post", "quiz-attempt-start", "student", lambda d: (
+        reverse("quiz-attempt-start", args=[d.enrollment.id, d.open_module.id, d.open_quiz.id]),
+        None,
+    ), 201),
+    Endpoint("patch", "quiz-attempt-answers", "student", lambda d: (
+        reverse("quiz-attempt-answers", args=[d.quiz_attempt.id]),
+        {"answers": {str(d.open_quiz.questions.first().id): 2}},
+    ), 202),
+    Endpoint("post", "submit_quiz", "student", lambda d: (
+        reverse("submit_quiz"), {"quiz_id": d.open_quiz.id, "selected_options": {}}
+    ), 200),
+    Endpoint("get", "download-certificate", "student", lambda d: (
+        reverse("download-certificate", args=[d.completed_enrollment.id]), None
+    ), 200),
+    Endpoint("get", "export-certificates", "admin", lambda d: (
+        reverse("export-certificates", args=[d.completed_course.slug]), None
+    ), 200),
+    # quiz authoring
+    Endpoint("get", "quiz-list", "admin", lambda d: (reverse("quiz-list"), None), 200),
+    Endpoint("post", "quiz-create", "admin", lambda d: (reverse("quiz-create"), {
+        "module_id": d.extra_module.id,
+        "title": "New quiz",
+        "total_questions": QUESTIONS_PER_QUIZ,
+        "passing_score": 3,
+    }), 201),
+    Endpoint("put", "quiz-update", "admin", lambda d: (
+        reverse("quiz-update", args=[d.quiz.id]), {"title": "Renamed quiz"}
+    ), 200),
+    Endpoint("delete", "quiz-delete", "admin", lambda d: (
+        reverse("quiz-delete", args=[d.quiz.id]), None
+    ), 204),
+    Endpoint("post", "quiz-import", "admin", lambda d: (
+        reverse("quiz-import", args=[d.quiz.id]),
+        {
+            "questions": [
+                {
+                    "question_text": f"Imported question {i}",
+                    "options": [f"Answer {order}" for order in range(1, 5)],
+                    "correct_option_index": i % 4 + 1,
+                }
+                for i in range(40)
+            ]
+        },
+    ), 201),
+    Endpoint("get", "mcq-question-list-create", "admin", lambda d: (
+        reverse("mcq-question-list-create", args=[d.quiz.id]), None
+    ), 200),
+    Endpoint("post", "mcq-question-list-create", "admin", lambda d: (
+        reverse("mcq-question-list-create", args=[d.quiz.id]), question_payload()
+    ), 201),
+    Endpoint("put", "mcq-question-update-delete", "admin", lambda d: (
+        reverse("mcq-question-update-delete", args=[d.question.id]), question_payload(3)
+    ), 200),
+    Endpoint("delete", "mcq-question-update-delete", "admin", lambda d: (
+        reverse("mcq-question-update-delete", args=[d.question.id]), None
+    ), 204),
+    # payment
+    Endpoint("get", "checkout-course", None, lambda d: (
+        reverse("checkout-course", args=[d.open_course.slug]), None
+    ), 200),
+    Endpoint("post", "checkout", "student", lambda d: (
+        f"{reverse('checkout')}?course={d.open_course.slug}",
+        {"payment_method": "bkash", "amount": "1500.00", "transaction_id": "TX-BUDGET"},
+    ), 201),
+    Endpoint("post", "verify-payment", "admin", lambda d: (
+        reverse("verify-payment"), {"transaction_id": d.pending_transaction_id, "status": "success"}
+    ), 200),
+    Endpoint("get", "my-courses", "student", lambda d: (reverse("my-courses"), None), 200),
+]
+
+
+def endpoint_key(endpoint):
+    return f"{endpoint.method.upper()} {endpoint.name}"
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def measure(client, path, method, payload, iterations):
+    """
+    Request an endpoint once to warm it, then `iterations` times, each in
+    a rolled-back savepoint. Returns (status, queries, timings in ms, size).
+    """
+    timings, query_counts = [], []
+    # Like timeit: a collection pause triggered by earlier tests' garbage
+    # would otherwise land in one endpoint's p95
+    gc.collect()
+    gc.disable()
+    try:
+        for run in range(iterations + 1):
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = getattr(client, method)(path, payload, format="json")
+                    if response.streaming:
+                        body = b"".join(response.streaming_content)
+                    else:
+                        body = response.content
+                    elapsed = (time.perf_counter() - start) * 1000
+                response.close()
+                transaction.set_rollback(True)
+            if run:
+                timings.append(elapsed)
+                query_counts.append(len(queries))
+    finally:
+        gc.enable()
+    return response.status_code, max(query_counts), timings, len(body)
+
+
+@tag("perf")
+@override_settings(
+    # Budgets cover the application, not the password hasher's work factor
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    MEDIA_ROOT=MEDIA_ROOT,
+    CERTIFICATE_EXPORT_WORKERS=0,
+)
+class EndpointBudgetTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed_dataset(SCALE)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def client_for(self, user):
+        client = APIClient()
+        if user is not None:
+            token = get_token_with_claims(getattr(self.dataset, user)).access_token
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def test_every_endpoint_has_a_budget(self):
+        names = {
+            pattern.name
+            for module in (course_urls, useraccount_urls, payment_urls)
+            for pattern in module.urlpatterns
+        }
+        self.assertEqual(names, {endpoint.name for endpoint in ENDPOINTS})
+
+        budgets = json.loads(BUDGETS_PATH.read_text())
+        self.assertEqual(set(budgets), {endpoint_key(e) for e in ENDPOINTS})
+        for key, budget in budgets.items():
+            self.assertEqual(set(budget["queries"]), {"mysql", "sqlite"}, key)
+
+    def test_endpoints_stay_within_budget(self):
+        budgets = json.loads(BUDGETS_PATH.read_text())
+        results, failures = {}, []
+
+        for endpoint in ENDPOINTS:
+            key = endpoint_key(endpoint)
+            cache.clear()
+            path, payload = endpoint.build(self.dataset)
+            status, queries, timings, size = measure(
+                self.client_for(endpoint.user), path, endpoint.method, payload, ITERATIONS
+            )
+            results[key] = {
+                "status": status,
+                "queries": queries,
+                "p50_ms": round(percentile(timings, 0.5), 2),
+                "p95_ms": round(percentile(timings, 0.95), 2),
+                "bytes": size,
+            }
+            if status != endpoint.status:
+                failures.append(f"{key}: status {status}, expected {endpoint.status}")
+                continue
+
+            budget = dict(budgets.get(key, {}))
+            if "queries" in budget:
+                budget["queries"] = budget["queries"].get(connection.vendor)
+            for metric in ("queries", "p95_ms", "bytes"):
+                if budget.get(metric) is not None and results[key][metric] > budget[metric]:
+                    failures.append(
+                        f"{key}: {metric} {results[key][metric]} over budget {budget[metric]}"
+                    )
+
+        if os.getenv("PERF_REPORT"):
+            Path(os.environ["PERF_REPORT"]).write_text(json.dumps(results, indent=2))
+        if os.getenv("PERF_RECORD_BUDGETS"):
+            BUDGETS_PATH.write_text(
+                json.dumps(record_budgets(results, budgets), indent=2) + "\n"
+            )
+            return
+
+        self.assertFalse(failures, "\n" + "\n".join(failures) + "\n\n" + report(results))
+
+
+def record_budgets(results, budgets):
+    """
+    Budgets from a measured run: exact query counts for this database
+    vendor (other vendors' counts are kept from `budgets`), some headroom
+    on the response size, and wide headroom on latency, which varies by
+    machine.
+    """
+    return {
+        key: {
+            "queries": {
+                **budgets.get(key, {}).get("queries", {}),
+                connection.vendor: result["queries"],
+            },
+            "p95_ms": max(50, math.ceil(result["p95_ms"] * 4 / 10) * 10),
+            "bytes": math.ceil(result["bytes"] * 1.25),
+        }
+        for key, result in results.items()
+    }
+
+
+def report(results):
+    lines = [f"{'endpoint':48} {'queries':>7} {'p50 ms':>8} {'p95 ms':>8} {'bytes':>9}"]
+    for key, result in results.items():
+        lines.append(
+            f"{key:48} {result['queries']:>7} {result['p50_ms']:>8} "
+            f"{result['p95_ms']:>8} {result['bytes']:>9}"
+        )
+    return "\n".join(lines)
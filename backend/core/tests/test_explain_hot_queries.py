@@ -0,0 +1,12 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class ExplainHotQueriesTestCase(TestCase):
+
+    def test_hot_queries_use_their_indexes(self):
+        out = StringIO()
+        call_command("explain_hot_queries", "--check", stdout=out)
+        self.assertNotIn("MISSING", out.getvalue())
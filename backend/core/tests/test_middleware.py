@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from core.middleware import PerformanceMiddleware
+from course.models import Bannerdata
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+class PerformanceMiddlewareTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Bannerdata.objects.create(title="Banner", sub_title="Enroll now")
+
+    @override_settings(PERF_INSTRUMENTATION=False)
+    def test_disabled_middleware_is_dropped(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            PerformanceMiddleware(lambda request: None)
+
+        response = self.client.get(reverse("course-banner"))
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(PERF_INSTRUMENTATION=True)
+    def test_request_is_timed_and_logged(self):
+        with self.assertLogs("core.perf", level="INFO") as logs:
+            response = self.client.get(reverse("course-banner"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('db;desc="1 queries"', response["Server-Timing"])
+        for metric in ("ser;dur=", "render;dur=", "total;dur="):
+            self.assertIn(metric, response["Server-Timing"])
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["endpoint"], "course-banner")
+        self.assertEqual(record["method"], "GET")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["db_queries"], 1)
+        self.assertEqual(record["bytes"], len(response.content))
+        self.assertGreater(record["serializer_ms"], 0)
+        self.assertGreater(record["render_ms"], 0)
+
+    @override_settings(PERF_INSTRUMENTATION=True)
+    def test_unresolved_url_is_tagged(self):
+        with self.assertLogs("core.perf", level="INFO") as logs:
+            self.client.get("/no-such-page/")
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["endpoint"], "unresolved")
+        self.assertEqual(record["status"], 404)
+
+
+class PerfReportTestCase(TestCase):
+
+    def write_log(self, lines):
+        handle, path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(handle, "w") as log:
+            log.write("\n".join(lines))
+        self.addCleanup(os.remove, path)
+        return path
+
+    def record(self, endpoint, total_ms, status=200):
+        return json.dumps({
+            "event": "request", "endpoint": endpoint, "method": "GET", "status": status,
+            "total_ms": total_ms, "db_queries": 2, "db_ms": 1.0, "serializer_ms": 0.5,
+            "render_ms": 0.2, "bytes": 100,
+        })
+
+    def test_report_aggregates_percentiles_per_endpoint(self):
+        path = self.write_log(
+            [self.record("course-list", ms) for ms in range(1, 101)]
+            + [self.record("course-banner", 5, status=500), "not a record"]
+        )
+        out = StringIO()
+        call_command("perf_report", path, "--json", stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(set(report), {"GET course-list", "GET course-banner"})
+        course_list = report["GET course-list"]
+        self.assertEqual(course_list["count"], 100)
+        self.assertEqual(course_list["total_ms"], {"p50": 50, "p95": 95, "p99": 99})
+        self.assertEqual(report["GET course-banner"]["errors"], 1)
+
+    def test_table_lists_slowest_endpoint_first(self):
+        path = self.write_log([self.record("course-banner", 5), self.record("course-list", 50)])
+        out = StringIO()
+        call_command("perf_report", path, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[1].startswith("GET course-list"))
+        self.assertTrue(lines[2].startswith("GET course-banner"))
@@ -0,0 +1,73 @@
+from course.models import Course, CourseCategory
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from useraccount.models import RoleChoices, User
+
+
+@override_settings(API_PAGE_SIZE=2)
+class KeysetPaginationTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        category = CourseCategory.objects.create(name="Programming")
+        for i in range(5):
+            Course.objects.create(
+                category=category,
+                title=f"Course {i}",
+                description="",
+                duration=60,
+                batch="Batch 1",
+                demo_url="https://example.com/demo",
+            )
+        self.admin = User.objects.create_user(
+            email="admin@example.com",
+            password="TestPassword123",
+            full_name="Admin User",
+            contact_number="1000000000",
+            role=RoleChoices.ADMIN,
+        )
+        for i in range(4):
+            User.objects.create_user(
+                email=f"student{i}@example.com",
+                password="TestPassword123",
+                full_name=f"Student {i}",
+                contact_number=f"100000000{i + 1}",
+            )
+
+    def collect(self, url, key, **params):
+        """Follow `next` links and return every page."""
+        pages = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+            pages.append(data[key])
+            if not data["next"]:
+                return pages
+            response = self.client.get(data["next"])
+
+    def test_course_list_pages_from_snapshot(self):
+        pages = self.collect(reverse("course-list"), "courses")
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        titles = [course["title"] for page in pages for course in page]
+        self.assertEqual(titles, [f"Course {i}" for i in range(5)])
+
+    def test_course_list_field_projection(self):
+        pages = self.collect(reverse("course-list"), "courses", fields="id,title", page_size=3)
+        self.assertEqual([len(page) for page in pages], [3, 2])
+        self.assertEqual(set(pages[0][0]), {"id", "title"})
+
+    def test_user_list_pages_with_projection(self):
+        self.client.force_authenticate(user=self.admin)
+        pages = self.collect(reverse("all-users"), "users", fields="email")
+        emails = [user["email"] for page in pages for user in page]
+        self.assertEqual(len(emails), 5)
+        self.assertEqual(len(set(emails)), 5)
+        self.assertEqual(set(pages[0][0]), {"email"})
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("course-list"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
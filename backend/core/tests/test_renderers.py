@@ -0,0 +1,30 @@
+import json
+from datetime import date
+
+from core.renderers import FastJSONRenderer
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.response import Response
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+
+    def render(self, data, status_code=200):
+        context = {"response": Response(status=status_code)}
+        return FastJSONRenderer().render(data, renderer_context=context)
+
+    def test_success_payload_is_not_wrapped(self):
+        body = self.render({"start_date": date(2026, 1, 1), "title": "Café"})
+        self.assertIsInstance(body, bytes)
+        self.assertEqual(json.loads(body), {"start_date": "2026-01-01", "title": "Café"})
+
+    def test_validation_errors_are_wrapped(self):
+        body = self.render({"email": [ErrorDetail("Required.", code="required")]}, 400)
+        self.assertEqual(json.loads(body), {"errors": {"email": ["Required."]}})
+
+    def test_errors_detected_without_response_context(self):
+        body = FastJSONRenderer().render({"detail": ErrorDetail("Nope.")})
+        self.assertEqual(json.loads(body), {"errors": {"detail": "Nope."}})
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(self.render(None, 204), b"")
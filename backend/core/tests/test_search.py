@@ -0,0 +1,48 @@
+from core.search import InvertedIndex, tokenize
+from django.test import SimpleTestCase
+
+
+class InvertedIndexTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.index = InvertedIndex({"title": 3.0, "description": 1.0})
+        self.index.add_many(
+            [
+                (1, {"title": "Python Basics", "description": "Learn programming"}),
+                (2, {"title": "Django for Beginners", "description": "Web apps in Python"}),
+                (3, {"title": "Figma 101", "description": "Design for the web"}),
+            ]
+        )
+
+    def ids(self, query):
+        return [doc_id for _, doc_id in self.index.search(query)]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Python, Django & REST!"), ["python", "django", "rest"])
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self.ids("python"), [1, 2])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.ids("python web"), [2])
+        self.assertEqual(self.ids("python figma"), [])
+
+    def test_prefix_matching(self):
+        self.assertEqual(self.ids("pyth"), [1, 2])
+        self.assertEqual(self.ids("dja beg"), [2])
+        # Single letters do not expand
+        self.assertEqual(self.ids("p"), [])
+
+    def test_reindex_and_remove(self):
+        self.assertEqual(self.ids("python"), [1, 2])
+
+        self.index.add(3, {"title": "Python for Designers", "description": "Python"})
+        self.assertEqual(self.ids("python"), [3, 1, 2])
+        self.assertEqual(self.ids("figma"), [])
+
+        self.index.remove(1)
+        self.assertEqual(self.ids("python"), [3, 2])
+        self.assertNotIn("basics", self.index.terms)
+
+    def test_limit(self):
+        self.assertEqual(len(self.index.search("python", limit=1)), 1)
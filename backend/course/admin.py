@@ -13,7 +13,53 @@ from course.models import (
     QuizResult,
     StudentProgress,
 )
+from course.validators import OPTIONS_PER_QUESTION, validate_question_options
 from django.contrib import admin
+from django.forms.models import BaseInlineFormSet
+
+
+class OptionInlineFormSet(BaseInlineFormSet):
+    """Validates a question's options together, from the submitted forms."""
+
+    def clean(self):
+        super().clean()
+        if any(self.errors):
+            return
+        options = [
+            (form.cleaned_data["order"], form.cleaned_data.get("is_correct", False))
+            for form in self.forms
+            if form.cleaned_data and not form.cleaned_data.get("DELETE")
+        ]
+        validate_question_options(
+            options, self.instance.correct_option_index
+        )
+
+    def save(self, commit=True):
+        if commit:
+            # Only one option may be correct at any moment, so drop the old
+            # correct flag before the forms save the new one
+            outgoing = [
+                form.instance.pk
+                for form in self.initial_forms
+                if form.initial.get("is_correct")
+                and (self._should_delete_form(form) or not form.cleaned_data.get("is_correct"))
+            ]
+            if outgoing:
+                Option.objects.filter(pk__in=outgoing).update(is_correct=False)
+        return super().save(commit)
+
+
+class OptionInline(admin.TabularInline):
+    model = Option
+    formset = OptionInlineFormSet
+    extra = OPTIONS_PER_QUESTION
+    max_num = OPTIONS_PER_QUESTION
+
+
+@admin.register(MCQQuestion)
+class MCQQuestionAdmin(admin.ModelAdmin):
+    list_display = ("question_text", "quiz", "correct_option_index")
+    inlines = [OptionInline]
 
 # Register your models here.
 admin.site.register(Bannerdata)
@@ -23,7 +69,6 @@ admin.site.register(Module)
 admin.site.register(Lesson)
 admin.site.register(Quiz)
 admin.site.register(StudentProgress)
-admin.site.register(MCQQuestion)
 admin.site.register(Option)
 admin.site.register(QuizResult)
 admin.site.register(CourseClass)
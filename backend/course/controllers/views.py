@@ -1,32 +1,45 @@
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from core.pagination import KeysetPagination, get_requested_fields
+from core.parsers import CSVParser, parse_csv
 from course.models import Bannerdata, CourseClass, Lesson, MCQQuestion, Module, Option, Quiz, QuizResult
 from course.renderers import CourseRenderer
+from course.repositories.quiz_answer_key_repository import QuizAnswerKeyRepository
 from course.serializers import (
     BannerdataSerializer,
-    CourseCategorySerializer,
     CourseClassSerializer,
     CourseCreateUpdateSerializer,
-    CourseDetailSerializer,
     CourseEnrollmentSerializer,
+    CourseFilterSerializer,
     CourseListSerializer,
     EnrollmentModuleLessonSerializer,
     MCQQuestionSerializer,
+    QuizAttemptAnswersSerializer,
     QuizDetailSerializer,
+    QuizImportSerializer,
     QuizResultSerializer,
     QuizResultShowSerializer,
     QuizSerializer,
 )
-from course.services.course_category_service import CourseCategoryService
+from course.services.catalog_service import CatalogService
+from course.services.course_search_service import CourseSearchService
 from course.services.course_service import CourseService
 from course.services.lesson_service import LessonService
+from course.services.quiz_attempt_service import QuizAttemptService
 from course.services.quiz_service import QuizService
 from course.services.student_progress_service import StudentProgressService
+from course.validators import validate_question_options
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
 from payment.models import Enrollment
 from payment.services.enrollment_service import EnrollmentService
+from payment.services.entitlement_service import EntitlementService
 from rest_framework import status
 from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -34,24 +47,40 @@ from useraccount.permissions import IsAdminOrStaff, IsStudent
 from useraccount.renderers import UserRenderer
 
 
+def snapshot_response(request, snapshot):
+    """
+    Send a precomputed catalog snapshot as-is, answering conditional
+    requests with 304 Not Modified.
+    """
+    etag = quote_etag(snapshot["etag"])
+    last_modified = snapshot["last_modified"].timestamp()
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified)
+    )
+    if response is None:
+        response = HttpResponse(snapshot["body"], content_type="application/json")
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
 class CourseCategoryListView(APIView):
     """
-    category list view
+    category list view, served from the precomputed catalog snapshot
     """
 
     renderer_classes = [UserRenderer]
+    authentication_classes = []  # public, keep the hot path off the database
     permission_classes = [AllowAny]
 
     def get(self, request):
-        allCategory = CourseCategoryService.get_all_categories()
-        if not allCategory:
+        snapshot = CatalogService.get_category_snapshot()
+        if snapshot["is_empty"]:
             return Response(
                 {"error": "Course Category not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        serializer = CourseCategorySerializer(allCategory, many=True)
-        category = serializer.data
-        return Response({"category": category}, status=status.HTTP_200_OK)
+        return snapshot_response(request, snapshot)
 
 
 class CourseCreateUpdateAPIView(APIView):
@@ -108,31 +137,49 @@ class CourseCreateUpdateAPIView(APIView):
             )
 
 
+class CoursePagination(KeysetPagination):
+    # Course ids follow creation order, as the cached course ids are sorted
+    ordering = ("id",)
+    results_key = "courses"
+
+
 class CourseListView(APIView):
     """
-    retrieve all courses.
+    retrieve courses page by page, assembled from the cached catalog rows.
+    `?fields=` projections are read from the database with `.only()`.
     """
 
     renderer_classes = [CourseRenderer]
+    authentication_classes = []  # public, keep the hot path off the database
     permission_classes = [AllowAny]
 
     def get(self, request):
         try:
             category_name = request.query_params.get("category", None)
-
-            if category_name:
-                courses = CourseService.get_all_courses_by_category_name(category_name)
-            else:
-                courses = CourseService.get_all_courses()
-
-            serializer = CourseListSerializer(courses, many=True)
-            courses = serializer.data
-            return Response({"courses": courses}, status=status.HTTP_200_OK)
-
-        except ObjectDoesNotExist:
-            return Response(
-                {"error": "Category not found"}, status=status.HTTP_404_NOT_FOUND
+            pagination = CoursePagination()
+            fields = get_requested_fields(request, CourseListSerializer)
+
+            if fields:
+                if category_name:
+                    courses = CourseService.get_all_courses_by_category_name(category_name)
+                else:
+                    courses = CourseService.get_all_courses()
+                courses = courses.only(
+                    *CourseListSerializer.get_only_fields(fields, extra=["id"])
+                )
+                page = pagination.paginate_queryset(courses, request)
+                serializer = CourseListSerializer(page, many=True, fields=fields)
+                return pagination.get_paginated_response(serializer.data)
+
+            course_ids = CatalogService.get_course_ids(category_name)
+            ids = pagination.paginate_keys(course_ids["ids"], request)
+            page = CatalogService.get_course_page(
+                course_ids, ids, pagination.get_next_link()
             )
+            return snapshot_response(request, page)
+
+        except NotFound:
+            raise
 
         except Exception as e:
             # Log the exception for debugging purposes
@@ -143,9 +190,71 @@ class CourseListView(APIView):
             )
 
 
+class CourseFilterView(APIView):
+    """
+    Faceted catalog filter: a page of matching courses, the number of
+    matches, and per-facet counts served from the facet cache.
+    """
+
+    renderer_classes = [CourseRenderer]
+    authentication_classes = []  # public, keep the hot path off the database
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        serializer = CourseFilterSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        filters = serializer.validated_data
+
+        pagination = CoursePagination()
+        page = pagination.paginate_queryset(CourseService.filter_courses(filters), request)
+        return Response(
+            {
+                "courses": CourseListSerializer(page, many=True).data,
+                "next": pagination.get_next_link(),
+                **CatalogService.get_facets(filters),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class CourseSearchPagination(KeysetPagination):
+    ordering = ("-score", "id")
+    results_key = "courses"
+
+
+class CourseSearchView(APIView):
+    """
+    Ranked search over course titles, batches, descriptions and instructor
+    names. `?q=` words must all match, each as a prefix.
+    """
+
+    renderer_classes = [CourseRenderer]
+    authentication_classes = []  # public, keep the hot path off the database
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"error": "Search query `q` is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        pagination = CourseSearchPagination()
+        ids = pagination.paginate_ranked(CourseSearchService.search(query), request)
+        courses = CourseService.get_courses_by_ids(ids)
+        serializer = CourseListSerializer(
+            [courses[course_id] for course_id in ids if course_id in courses], many=True
+        )
+        return pagination.get_paginated_response(serializer.data)
+
+
 class CourseDetailView(APIView):
     """
-    Retrieve single course details.
+    Retrieve single course details from the cached detail snapshot.
+    Anonymous visitors get the snapshot as-is; signed-in users get their
+    own enrollment_status added on top.
     """
 
     renderer_classes = [CourseRenderer]
@@ -153,9 +262,14 @@ class CourseDetailView(APIView):
 
     def get(self, request, slug):
         try:
-            course = CourseService.get_course_by_slug(slug)
-            serializer = CourseDetailSerializer(course, context={"request": request})
-            data = serializer.data
+            snapshot = CatalogService.get_course_detail_snapshot(slug)
+            if not request.user.is_authenticated:
+                return snapshot_response(request, snapshot)
+
+            data = dict(snapshot["course"])
+            data["enrollment_status"] = EnrollmentService.get_enrollment_status(
+                request.user, data["id"]
+            )
             return Response({"course": data}, status=status.HTTP_200_OK)
 
         except ObjectDoesNotExist:
@@ -179,15 +293,20 @@ class CourseEnrollmentModuleLessonView(APIView):
     renderer_classes = [UserRenderer]
 
     def get(self, request, enrollment_id):
-        course = EnrollmentService.get_enrolled_course(enrollment_id, request.user)
+        enrollment = EnrollmentService.get_enrollment_with_course_content(
+            enrollment_id, request.user
+        )
 
-        if not course:
+        if not enrollment:
             return Response(
                 {"error": "Enrollment not found."}, status=status.HTTP_404_NOT_FOUND
             )
 
         # Serialize the course with modules and lessons
-        serializer = CourseEnrollmentSerializer(course, context={"user": request.user})
+        serializer = CourseEnrollmentSerializer(
+            enrollment.course,
+            context={"user": request.user, "enrollment": enrollment},
+        )
         return Response({"course_enroll": serializer.data}, status=status.HTTP_200_OK)
 
 
@@ -224,9 +343,7 @@ class CompleteLessonAPIView(APIView):
     def post(self, request, lesson_id, enrollment_id):
         try:
             # Ensure the student is enrolled with the provided enrollment_id
-            if not Enrollment.objects.filter(
-                student=request.user, id=enrollment_id, payment_status="success"
-            ).exists():
+            if not EntitlementService.is_entitled(request, enrollment_id):
                 return Response(
                     {
                         "error": "You must be enrolled in the course to complete this lesson."
@@ -252,6 +369,31 @@ class CompleteLessonAPIView(APIView):
             )
 
 
+def question_from_request(data):
+    """
+    Read and validate a question payload (question_text, correct_option_index
+    and four [option_text, is_correct] Options) in memory.
+    """
+    question_text = data.get("question_text")
+    correct_option_index = data.get("correct_option_index")
+    options_data = data.get("Options") or []
+
+    if not question_text or not correct_option_index or len(options_data) != 4:
+        raise ValidationError(
+            "Each question must have a question text, a correct Option index, and exactly 4 Options."
+        )
+    try:
+        validate_question_options(
+            [(order, bool(is_correct)) for order, (_, is_correct) in enumerate(options_data, start=1)],
+            correct_option_index,
+        )
+    except (TypeError, ValueError):
+        raise ValidationError("Each Option must be an [option_text, is_correct] pair.")
+    except DjangoValidationError as e:
+        raise ValidationError(e.messages)
+    return question_text, correct_option_index, options_data
+
+
 class MCQQuestionAPIView(APIView):
 
     def post(self, request, quiz_id):
@@ -262,14 +404,9 @@ class MCQQuestionAPIView(APIView):
             raise NotFound(detail="Quiz not found")
 
         # Get the data from the request
-        question_text = request.data.get("question_text")
-        correct_option_index = request.data.get("correct_option_index")
-        Options_data = request.data.get("Options")
-
-        if not question_text or not correct_option_index or len(Options_data) != 4:
-            raise ValidationError(
-                "Each question must have a question text, a correct Option index, and exactly 4 Options."
-            )
+        question_text, correct_option_index, Options_data = question_from_request(
+            request.data
+        )
 
         # Create the question and Options in a transaction to ensure atomicity
         try:
@@ -305,14 +442,9 @@ class MCQQuestionAPIView(APIView):
             raise NotFound(detail="Question not found")
 
         # Get the data from the request
-        question_text = request.data.get("question_text")
-        correct_option_index = request.data.get("correct_option_index")
-        Options_data = request.data.get("Options")
-
-        if not question_text or not correct_option_index or len(Options_data) != 4:
-            raise ValidationError(
-                "Each question must have a question text, a correct Option index, and exactly 4 Options."
-            )
+        question_text, correct_option_index, Options_data = question_from_request(
+            request.data
+        )
 
         # Update the question and Options in a transaction to ensure atomicity
         try:
@@ -322,12 +454,21 @@ class MCQQuestionAPIView(APIView):
                 question.correct_option_index = correct_option_index
                 question.save()
 
-                # Update the Options
+                # Update the Options; the old correct flag is cleared first
+                # since only one option of a question may be correct at a time
+                options = {option.order: option for option in question.options.all()}
+                question.options.filter(is_correct=True).update(is_correct=False)
                 for idx, (option_text, is_correct) in enumerate(Options_data):
-                    Option = question.Options.get(order=idx + 1)
-                    Option.option_text = option_text
-                    Option.is_correct = is_correct
-                    Option.save()
+                    option = options[idx + 1]
+                    option.option_text = option_text
+                    option.is_correct = is_correct
+                Option.objects.bulk_update(options.values(), ["option_text", "is_correct"])
+                # bulk_update sends no signals: drop the cached answer key here,
+                # and again once readers can see the new rows
+                QuizAnswerKeyRepository.invalidate(question.quiz_id)
+                transaction.on_commit(
+                    lambda: QuizAnswerKeyRepository.invalidate(question.quiz_id)
+                )
 
             # Serialize and return the updated question and Options
             serializer = MCQQuestionSerializer(question)
@@ -345,7 +486,7 @@ class MCQQuestionAPIView(APIView):
         # Delete the question and related Options in a transaction to ensure atomicity
         try:
             with transaction.atomic():
-                question.Options.all().delete()  # Delete all Options associated with the question
+                question.options.all().delete()  # Delete all Options associated with the question
                 question.delete()  # Delete the question itself
             return Response(status=status.HTTP_204_NO_CONTENT)
         except Exception as e:
@@ -364,6 +505,50 @@ class MCQQuestionAPIView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class QuizImportAPIView(APIView):
+    """
+    Bulk question import for a quiz. Accepts JSON ({"questions": [...],
+    "replace": bool}), a text/csv body or a multipart CSV `file`; CSV
+    columns are question_text, option_1..option_4, correct_option_index.
+    The whole set is validated before a single row is written.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdminOrStaff]
+    renderer_classes = [UserRenderer]
+    parser_classes = [JSONParser, CSVParser, MultiPartParser]
+
+    def post(self, request, quiz_id):
+        payload = {"replace": request.query_params.get("replace", False)}
+        if "file" in request.FILES:
+            rows = parse_csv(request.FILES["file"])
+            payload["questions"] = QuizService.questions_from_csv(rows)
+        elif isinstance(request.data, list):
+            payload["questions"] = QuizService.questions_from_csv(request.data)
+        else:
+            payload.update(request.data.items())
+
+        serializer = QuizImportSerializer(data=payload)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            created, replaced = QuizService.import_questions(
+                quiz_id,
+                serializer.validated_data["questions"],
+                replace=serializer.validated_data["replace"],
+            )
+        except Quiz.DoesNotExist:
+            raise NotFound(detail="Quiz not found")
+
+        return Response(
+            {
+                "message": "Questions imported successfully.",
+                "created": created,
+                "replaced": replaced,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
 class QuizCreateAPIView(APIView):
 
     def post(self, request):
@@ -393,12 +578,24 @@ class QuizCreateAPIView(APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+class QuizPagination(KeysetPagination):
+    ordering = ("id",)
+    results_key = "quizzes"
+
+
 class QuizListAPIView(APIView):
 
     def get(self, request):
+        pagination = QuizPagination()
+        fields = get_requested_fields(request, QuizDetailSerializer)
         quizzes = Quiz.objects.all()
-        serializer = QuizDetailSerializer(quizzes, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if fields:
+            quizzes = quizzes.only(
+                *QuizDetailSerializer.get_only_fields(fields, extra=["id"])
+            )
+        page = pagination.paginate_queryset(quizzes, request)
+        serializer = QuizDetailSerializer(page, many=True, fields=fields)
+        return pagination.get_paginated_response(serializer.data)
 
 
 class EnrolledCourseQuizView(APIView):
@@ -408,17 +605,11 @@ class EnrolledCourseQuizView(APIView):
     def get(self, request, enrollment_id, module_id):
         """Get quizzes for a course in which the user is enrolled."""
         try:
-            # Fetch quizzes for the specific module using the service layer
-            quizzes = QuizService.get_quizzes_for_enrolled_course_module(
+            # Shared quiz bodies with the student's results, already encoded
+            body = QuizService.get_enrolled_module_quizzes(
                 enrollment_id, module_id, request.user
             )
-            # Serialize the quizzes
-            serializer = QuizDetailSerializer(
-                quizzes, many=True, context={"user": request.user}
-            )
-
-            quizzes = serializer.data
-            return Response({"quizzes": quizzes}, status=status.HTTP_200_OK)
+            return HttpResponse(body, content_type="application/json")
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
@@ -428,6 +619,51 @@ class EnrolledCourseQuizView(APIView):
             )
 
 
+class QuizAttemptStartView(APIView):
+    """
+    Start (or resume) a timed attempt at a quiz: the attempt token, its
+    deadline and saved answers, with the cached quiz body.
+    """
+
+    renderer_classes = [UserRenderer]
+    permission_classes = [IsAuthenticated, IsStudent]
+
+    def post(self, request, enrollment_id, module_id, quiz_id):
+        try:
+            body = QuizService.start_attempt(
+                enrollment_id, module_id, quiz_id, request.user
+            )
+            return HttpResponse(body, content_type="application/json", status=201)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except DjangoValidationError as e:
+            return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class QuizAttemptAnswersView(APIView):
+    """Autosave partial answers of an open attempt (buffered, written in batches)."""
+
+    renderer_classes = [UserRenderer]
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request, attempt_id):
+        serializer = QuizAttemptAnswersSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            time_remaining = QuizAttemptService.autosave(
+                request.user, attempt_id, serializer.validated_data["answers"]
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except DjangoValidationError as e:
+            return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {"saved": True, "time_remaining": time_remaining},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
 class QuizUpdateAPIView(APIView):
 
     def put(self, request, quiz_id):
@@ -479,10 +715,11 @@ class SubmitQuiz(APIView):
         # Extract validated data
         quiz_id = serializer.validated_data["quiz_id"]
         selected_options = serializer.validated_data["selected_options"]
+        attempt_id = serializer.validated_data.get("attempt")
 
         try:
             # Call the service layer to handle quiz submission
-            result = QuizService.submit_quiz(user, quiz_id, selected_options)
+            result = QuizService.submit_quiz(user, quiz_id, selected_options, attempt_id)
             # Return the response
             return Response(
                 {
@@ -490,11 +727,15 @@ class SubmitQuiz(APIView):
                     "message": "Quiz submitted successfully",
                     "quiz_result_id": result["quiz_result_id"],
                     "submitted": result["submitted"],
+                    "late": result["late"],
                 },
                 status=status.HTTP_200_OK,
             )
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except DjangoValidationError as e:
+            # Raised by the service layer (already submitted, attempt checks)
+            return Response({"error": e.message}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response(
                 {"error": str(e)},
@@ -514,9 +755,9 @@ class QuizResultDetailView(APIView):
         The `enrollment_id` and `module_id` are required to validate permissions.
         """
         try:
+            # Questions and options are served from the answer-key cache
             quiz_result = (
                 QuizResult.objects.select_related("quiz")
-                .prefetch_related("quiz__questions__options")
                 .get(
                     id=quiz_result_id,
                     student=request.user,
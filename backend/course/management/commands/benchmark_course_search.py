@@ -0,0 +1,66 @@
+"""
+Django command to benchmark the in-process course search index.
+"""
+import random
+import time
+
+from core.search import InvertedIndex
+from course.services.course_search_service import CourseSearchService
+from django.core.management.base import BaseCommand
+
+TOPICS = [
+    "python", "django", "design", "figma", "marketing", "data", "science",
+    "machine", "learning", "react", "java", "cloud", "security", "finance",
+]
+
+
+def documents(count, seed=1):
+    """Synthetic course documents: two topic words per title, 60-word descriptions."""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 10)))
+        for _ in range(30000)
+    ]
+    for i in range(count):
+        yield i, {
+            "title": f"{' '.join(rng.sample(TOPICS, 2))} course {i}",
+            "batch": f"Batch {i % 20}",
+            "description": " ".join(rng.choices(vocabulary, k=60)),
+            "instructors": " ".join(rng.sample(vocabulary, 2)).title(),
+        }
+
+
+class Command(BaseCommand):
+    """Time building the index and cold/memoized queries on a synthetic catalog."""
+
+    help = "Benchmark course search on a 50,000-course synthetic catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--courses", type=int, default=50000)
+        parser.add_argument(
+            "--queries", nargs="+",
+            default=["python", "pyth", "python django", "dat sci", "course 123", "batch 7 react"],
+        )
+        parser.add_argument("--limit", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        index = InvertedIndex(CourseSearchService.WEIGHTS)
+        start = time.perf_counter()
+        index.add_many(documents(options["courses"]))
+        self.stdout.write(
+            f"Indexed {len(index)} courses ({len(index.terms)} terms) "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+        for query in options["queries"]:
+            index._results.clear()
+            start = time.perf_counter()
+            hits = index.search(query, options["limit"])
+            cold_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            index.search(query, options["limit"])
+            warm_ms = (time.perf_counter() - start) * 1000
+            self.stdout.write(
+                f"{query!r:<18} hits={len(hits):<5} cold={cold_ms:.2f}ms memoized={warm_ms:.2f}ms"
+            )
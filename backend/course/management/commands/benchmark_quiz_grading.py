@@ -0,0 +1,118 @@
+"""
+Django command to benchmark quiz grading (query count and latency).
+"""
+import time
+
+from course.models import Course, CourseCategory, MCQQuestion, Module, Option, Quiz
+from course.repositories.quiz_repository import QuizRepository
+from course.services.quiz_grading_service import QuizGradingService
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+
+class Rollback(Exception):
+    """Raised to discard the benchmark data."""
+
+
+def grade_per_question(quiz, selected_options):
+    """The previous grading loop: one options query per question."""
+    obtained_marks = 0
+    questions = QuizRepository.get_questions_with_options(quiz)
+    total_marks = questions.count()
+    for question in questions:
+        selected_option_order = selected_options.get(str(question.id))
+        if selected_option_order is None:
+            continue
+        if question.options.filter(order=selected_option_order, is_correct=True).first():
+            obtained_marks += 1
+    return obtained_marks, total_marks
+
+
+def grade_answer_key(quiz, selected_options):
+    """The set-based engine: cached answer key (one query when cold), scoring in memory."""
+    answer_key = QuizGradingService.get_answer_key(quiz)
+    obtained_marks, total_marks, _ = QuizGradingService.grade(
+        answer_key, selected_options
+    )
+    return obtained_marks, total_marks
+
+
+class Command(BaseCommand):
+    """Compare the per-question grading loop with the answer-key engine."""
+
+    help = "Benchmark quiz grading for 10/50/200-question quizzes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", nargs="+", type=int, default=[10, 50, 200],
+            help="Question counts to benchmark.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Gradings per measurement."
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        try:
+            with transaction.atomic():
+                for size in options["sizes"]:
+                    quiz, selected_options = self.create_quiz(size)
+                    for label, grader in (
+                        ("per-question", grade_per_question),
+                        ("answer-key", grade_answer_key),
+                    ):
+                        self.report(label, size, grader, quiz, selected_options, options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def report(self, label, size, grader, quiz, selected_options, repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            grader(quiz, selected_options)
+        queries = len(ctx.captured_queries)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            grader(quiz, selected_options)
+        latency_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        self.stdout.write(
+            f"{size:>4} questions  {label:<13} queries={queries:<4} latency={latency_ms:.2f}ms"
+        )
+
+    def create_quiz(self, size):
+        """Create a quiz with `size` questions and a half-correct submission."""
+        category, _ = CourseCategory.objects.get_or_create(name="Benchmark")
+        course = Course.objects.create(
+            category=category,
+            title=f"Benchmark course {size}",
+            slug=f"benchmark-course-{size}",
+            description="",
+            duration=60,
+            batch="bench",
+            demo_url="",
+        )
+        module = Module.objects.create(course=course, title="Module", description="", order=1)
+        quiz = Quiz.objects.create(
+            module=module, title="Quiz", total_questions=size, passing_score=size // 2
+        )
+        questions = MCQQuestion.objects.bulk_create(
+            [
+                MCQQuestion(quiz=quiz, question_text=f"Question {i}", correct_option_index=1)
+                for i in range(size)
+            ]
+        )
+        if questions and questions[0].pk is None:
+            questions = list(MCQQuestion.objects.filter(quiz=quiz).order_by("id"))
+        Option.objects.bulk_create(
+            [
+                Option(question=question, option_text=f"Option {order}", order=order, is_correct=order == 1)
+                for question in questions
+                for order in range(1, 5)
+            ]
+        )
+        selected_options = {
+            str(question.id): 1 if i % 2 else 2 for i, question in enumerate(questions)
+        }
+        return quiz, selected_options
@@ -0,0 +1,48 @@
+"""
+Django command to write autosaved quiz answers from the cache to the database.
+"""
+import time
+
+from course.services.quiz_attempt_service import QuizAttemptService
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+
+class Command(BaseCommand):
+    """Background worker flushing the quiz attempt autosave buffer in batches."""
+
+    help = "Write buffered quiz attempt answers to the database in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true", help="Flush the dirty attempts and exit."
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.QUIZ_ATTEMPT_FLUSH_INTERVAL,
+            help="Seconds between flushes.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        # The buffer lives in the web processes' cache: a per-process one
+        # would leave this worker nothing to flush
+        if isinstance(caches["default"], (LocMemCache, DummyCache)):
+            raise CommandError(
+                "flush_quiz_attempts needs a cache shared with the web processes; "
+                "set CACHE_BACKEND and CACHE_LOCATION (e.g. to Redis)."
+            )
+        while True:
+            close_old_connections()
+            flushed = QuizAttemptService.flush(options["batch_size"])
+            if flushed:
+                self.stdout.write(f"Flushed {flushed} quiz attempt(s).")
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,26 @@
+"""
+Django command to rebuild the course search documents and indexes.
+"""
+import time
+
+from course.services.course_search_service import CourseSearchService
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Rewrites the search document of every course, e.g. after courses were
+    imported with bulk writes that skip the signals, and makes every process
+    rebuild its in-process index on its next search.
+    """
+
+    help = "Rebuild the course search documents and indexes."
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        start = time.perf_counter()
+        count = CourseSearchService.rebuild()
+        self.stdout.write(
+            f"Rebuilt the search documents of {count} course(s) "
+            f"in {time.perf_counter() - start:.2f}s."
+        )
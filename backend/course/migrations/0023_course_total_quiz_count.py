@@ -0,0 +1,33 @@
+# Generated by Django 5.1.5 on 2026-10-18 20:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_quizzes(apps, schema_editor):
+    Course = apps.get_model("course", "Course")
+    Quiz = apps.get_model("course", "Quiz")
+    quiz_count = (
+        Quiz.objects.filter(module__course=OuterRef("pk"))
+        .values("module__course")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Course.objects.update(total_quiz_count=Coalesce(Subquery(quiz_count), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0022_bannerdata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='total_quiz_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_quizzes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.1.5 on 2026-10-18 20:37
+
+import logging
+
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_options(apps, schema_editor):
+    """
+    Make existing rows satisfy the constraints below: options of a question
+    are renumbered 1..n in their current order. A question with exactly one
+    correct option keeps it and gets its correct_option_index fixed to match;
+    otherwise the option whose order is correct_option_index becomes its only
+    correct option. Questions that cannot be fixed this way abort the migration.
+    """
+    MCQQuestion = apps.get_model("course", "MCQQuestion")
+    Option = apps.get_model("course", "Option")
+    invalid = []
+    changed_questions = []
+    changed_options = []
+    questions = MCQQuestion.objects.prefetch_related("options").order_by("id")
+    for question in questions.iterator(chunk_size=1000):
+        options = sorted(question.options.all(), key=lambda option: (option.order, option.id))
+        if not options:
+            continue
+        flagged = [order for order, option in enumerate(options, start=1) if option.is_correct]
+        if len(flagged) == 1 and len(options) <= 4:
+            if question.correct_option_index != flagged[0]:
+                question.correct_option_index = flagged[0]
+                changed_questions.append(question)
+        elif not 1 <= question.correct_option_index <= len(options) <= 4:
+            invalid.append(question.id)
+            continue
+        for order, option in enumerate(options, start=1):
+            is_correct = order == question.correct_option_index
+            if (option.order, option.is_correct) != (order, is_correct):
+                option.order = order
+                option.is_correct = is_correct
+                changed_options.append(option)
+    if invalid:
+        raise RuntimeError(
+            "Cannot add the option constraints: these questions have more than 4 "
+            "options or a correct_option_index without a matching option. Fix them "
+            f"and run the migration again. MCQQuestion ids: {invalid}"
+        )
+    MCQQuestion.objects.bulk_update(changed_questions, ["correct_option_index"], batch_size=1000)
+    Option.objects.bulk_update(changed_options, ["order", "is_correct"], batch_size=1000)
+    logger.info(
+        "Normalized %d options and the correct_option_index of %d questions.",
+        len(changed_options),
+        len(changed_questions),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0023_course_total_quiz_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_options, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='mcqquestion',
+            constraint=models.CheckConstraint(condition=models.Q(('correct_option_index__gte', 1), ('correct_option_index__lte', 4)), name='mcqquestion_correct_option_index_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='option',
+            constraint=models.CheckConstraint(condition=models.Q(('order__gte', 1), ('order__lte', 4)), name='option_order_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='option',
+            constraint=models.UniqueConstraint(fields=('question', 'order'), name='option_unique_order'),
+        ),
+        migrations.AddConstraint(
+            model_name='option',
+            constraint=models.UniqueConstraint(models.Case(models.When(is_correct=True, then=models.F('question'))), name='option_single_correct', violation_error_message='A question can have only one correct option.'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-18 20:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0024_option_constraints'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quizresult',
+            index=models.Index(fields=['student', 'quiz', 'submitted'], name='quizresult_student_quiz_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprogress',
+            index=models.Index(fields=['student', 'completed', 'quiz'], name='studentprogress_completed_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.1.5 on 2026-10-18 20:58
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_documents(apps, schema_editor):
+    Course = apps.get_model("course", "Course")
+    CourseSearchDocument = apps.get_model("course", "CourseSearchDocument")
+    names = defaultdict(list)
+    for course_id, full_name in Course.instructors.through.objects.values_list(
+        "course_id", "instructor__user__full_name"
+    ):
+        names[course_id].append(full_name)
+    CourseSearchDocument.objects.bulk_create(
+        (
+            CourseSearchDocument(
+                course_id=course_id,
+                title=title,
+                batch=batch,
+                description=description,
+                instructors=" ".join(names[course_id]),
+            )
+            for course_id, title, batch, description in Course.objects.values_list(
+                "id", "title", "batch", "description"
+            ).iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+def add_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(
+            "CREATE FULLTEXT INDEX course_search_fulltext ON course_coursesearchdocument "
+            "(title, batch, description, instructors)"
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(
+            "DROP INDEX course_search_fulltext ON course_coursesearchdocument"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0025_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseSearchDocument',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='course.course')),
+                ('title', models.CharField(max_length=255)),
+                ('batch', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('instructors', models.TextField(blank=True)),
+            ],
+        ),
+        migrations.RunPython(build_documents, migrations.RunPython.noop),
+        migrations.RunPython(add_fulltext_index, drop_fulltext_index),
+    ]
@@ -1,9 +1,7 @@
+import uuid
 from email.policy import default
 from django.conf import settings
 from django.db import models
-from django.db.models.signals import pre_save
-from django.dispatch import receiver
-from django.forms import ValidationError
 from django.utils import timezone
 from django.utils.text import slugify
 from useraccount.models import Instructor, User
@@ -39,6 +37,8 @@ class Course(models.Model):
     end_date = models.DateField(null=True, blank=True)
     slug = models.SlugField(unique=True, blank=True, max_length=255)
     demo_url = models.TextField()  # demo url
+    # Number of quizzes across the course's modules, kept by course.signals
+    total_quiz_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -64,6 +64,22 @@ class Course(models.Model):
         return self.title
 
 
+# Searchable text of a course, kept by course.signals. On MySQL its columns
+# carry a FULLTEXT index (migration 0026); elsewhere it feeds the in-process
+# index of course.services.course_search_service
+class CourseSearchDocument(models.Model):
+    course = models.OneToOneField(
+        Course, on_delete=models.CASCADE, primary_key=True, related_name="search_document"
+    )
+    title = models.CharField(max_length=255)
+    batch = models.CharField(max_length=255)
+    description = models.TextField()
+    instructors = models.TextField(blank=True)  # instructor names, space separated
+
+    def __str__(self):
+        return self.title
+
+
 # course module
 class Module(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="modules")
@@ -117,26 +133,13 @@ class MCQQuestion(models.Model):
     def get_options(self):
         return self.options.all()
 
-    def clean(self):
-        """Ensure each question has exactly 4 options and one correct option."""
-        if (
-            not self.pk
-        ):  # Only validate if the question has been saved (has a primary key)
-            return
-
-        if self.options.count() != 4:
-            raise ValidationError("Each question must have exactly 4 options.")
-
-        correct_options = self.options.filter(is_correct=True)
-        if correct_options.count() != 1:
-            raise ValidationError("Each question must have exactly 1 correct option.")
-
-    def save(self, *args, **kwargs):
-        """Save the question only if it does not exceed 4 options."""
-        super().save(*args, **kwargs)  # Save the instance first
-
-        if self.options.count() > 4:
-            raise ValidationError("Each question can have at most 4 options.")
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(correct_option_index__gte=1, correct_option_index__lte=4),
+                name="mcqquestion_correct_option_index_range",
+            ),
+        ]
 
 
 class Option(models.Model):
@@ -152,18 +155,22 @@ class Option(models.Model):
 
     class Meta:
         ordering = ["order"]  # Ensures options are retrieved in the correct order
-
-    def clean(self):
-        """Ensure that a question cannot have more than 4 options."""
-        if self.question.options.count() >= 4 and self.pk is None:
-            raise ValidationError("Each question can have at most 4 options.")
-
-
-# Signal to validate that there are no more than 4 options for each question
-@receiver(pre_save, sender=Option)
-def validate_option_count(sender, instance, **kwargs):
-    if instance.question.options.count() >= 4 and instance.pk is None:
-        raise ValidationError("Each question can have at most 4 options.")
+        # Orders 1-4, each used once, cap a question at four options; the
+        # expression index allows a single is_correct row per question
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(order__gte=1, order__lte=4),
+                name="option_order_range",
+            ),
+            models.UniqueConstraint(
+                fields=["question", "order"], name="option_unique_order"
+            ),
+            models.UniqueConstraint(
+                models.Case(models.When(is_correct=True, then=models.F("question"))),
+                name="option_single_correct",
+                violation_error_message="A question can have only one correct option.",
+            ),
+        ]
 
 
 class StudentProgress(models.Model):
@@ -174,6 +181,13 @@ class StudentProgress(models.Model):
 
     class Meta:
         unique_together = ("student", "quiz")
+        indexes = [
+            # Completed quizzes of a student, read from the index alone
+            models.Index(
+                fields=["student", "completed", "quiz"],
+                name="studentprogress_completed_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.student.full_name} - {self.quiz} - {'Completed' if self.completed else 'In Progress'}"
@@ -191,6 +205,15 @@ class QuizResult(models.Model):
     submitted = models.BooleanField(default=False)
     submission_time = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # A student's (submitted) result for a quiz
+            models.Index(
+                fields=["student", "quiz", "submitted"],
+                name="quizresult_student_quiz_idx",
+            ),
+        ]
+
     def save(self, *args, **kwargs):
         """
         Override the save method to automatically set the submission_time
@@ -204,6 +227,35 @@ class QuizResult(models.Model):
     def __str__(self):
         return f"{self.student.full_name} - {self.quiz.title} - {self.obtained_marks}/{self.total_marks}"
     
+# A student's timed run at a quiz; its id is the attempt token. Autosaved
+# answers are buffered in the cache and written here in batches by
+# course.services.quiz_attempt_service
+class QuizAttempt(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    student = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="quiz_attempts"
+    )
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="attempts")
+    answers = models.JSONField(default=dict)  # {question_id: selected option order}
+    started_at = models.DateTimeField(auto_now_add=True)
+    deadline = models.DateTimeField()
+    submitted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "quiz"], name="quizattempt_unique_student_quiz"
+            ),
+        ]
+        indexes = [
+            # Open attempts swept by the autosave flush
+            models.Index(fields=["submitted_at", "deadline"], name="quizattempt_open_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.student.full_name} - {self.quiz.title} - {self.started_at}"
+
+
 class CourseClass(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='classes')
     title = models.CharField(max_length=255)
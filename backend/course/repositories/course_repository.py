@@ -1,4 +1,18 @@
-from course.models import Course, CourseCategory
+from functools import reduce
+from operator import and_
+
+from course.models import Course, CourseCategory, Lesson, Module, Quiz
+from django.db.models import (
+    Count,
+    F,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    prefetch_related_objects,
+)
+from django.db.models.functions import Coalesce
+from useraccount.models import Instructor
 
 
 class CourseRepository:
@@ -17,11 +31,44 @@ class CourseRepository:
         """Retrieve a course by its slug."""
         return Course.objects.get(slug=slug)
 
+    @staticmethod
+    def get_course_id(slug):
+        """Resolve a course slug to its id. Raises Course.DoesNotExist."""
+        return Course.objects.values_list("id", flat=True).get(slug=slug)
+
+    @staticmethod
+    def get_course_detail(slug):
+        """
+        Retrieve a course with everything CourseDetailSerializer reads, in
+        three queries: course and category, instructors and users, modules.
+        """
+        return (
+            Course.objects.select_related("category")
+            .prefetch_related(
+                Prefetch("instructors", queryset=Instructor.objects.select_related("user")),
+                "modules",
+            )
+            .get(slug=slug)
+        )
+
+    @staticmethod
+    def get_course_ids_by_instructor(instructor_id):
+        """Ids of the courses an instructor teaches."""
+        return list(
+            Course.instructors.through.objects.filter(instructor_id=instructor_id)
+            .values_list("course_id", flat=True)
+        )
+
     @staticmethod
     def get_courses_by_id(course_id):
         """Retrieve a course by its slug."""
         return Course.objects.get(id=course_id)
 
+    @staticmethod
+    def get_courses_in_bulk(course_ids):
+        """Retrieve {id: course} for the given course ids."""
+        return Course.objects.in_bulk(course_ids)
+
     @staticmethod
     def get_courses_by_category_name(category_name):
         category = CourseCategory.objects.filter(name__iexact=category_name).first()
@@ -29,9 +76,143 @@ class CourseRepository:
             return Course.objects.filter(category=category)
         return Course.objects.none()
 
+    @staticmethod
+    def get_facet_conditions(filters):
+        """
+        {facet: Q} for the catalog filters that are set: category and batch
+        (lists of values), price_min/price_max (max exclusive),
+        start_after/start_before (inclusive dates) and available.
+        """
+        conditions = {}
+        if filters.get("category"):
+            conditions["category"] = Q(category__name__in=filters["category"])
+        if filters.get("batch"):
+            conditions["batch"] = Q(batch__in=filters["batch"])
+        price = Q()
+        if filters.get("price_min") is not None:
+            price &= Q(price__gte=filters["price_min"])
+        if filters.get("price_max") is not None:
+            price &= Q(price__lt=filters["price_max"])
+        if price:
+            conditions["price"] = price
+        start_date = Q()
+        if filters.get("start_after") is not None:
+            start_date &= Q(start_date__gte=filters["start_after"])
+        if filters.get("start_before") is not None:
+            start_date &= Q(start_date__lte=filters["start_before"])
+        if start_date:
+            conditions["start_date"] = start_date
+        if filters.get("available") is not None:
+            seats = Q(remaining_seat__gt=0)
+            conditions["available"] = seats if filters["available"] else ~seats
+        return conditions
+
+    @staticmethod
+    def filter_courses(filters):
+        """Retrieve the courses matching every catalog filter."""
+        conditions = CourseRepository.get_facet_conditions(filters)
+        return Course.objects.filter(*conditions.values())
+
+    @staticmethod
+    def get_facet_counts(filters, buckets):
+        """
+        Count the matching courses, and the courses per facet value with the
+        filters of every other facet applied (so a facet still shows its
+        alternatives). `buckets` maps bucketed facets (price, start_date,
+        available) to {label: the filters selecting that bucket}. Three
+        queries: one conditional aggregate for the bucketed facets, one
+        GROUP BY each for category and batch.
+        """
+        conditions = CourseRepository.get_facet_conditions(filters)
+
+        def others(facet):
+            return reduce(
+                and_, (q for name, q in conditions.items() if name != facet), Q()
+            )
+
+        def count(condition):
+            return Count("id", filter=condition) if condition else Count("id")
+
+        aggregates = {"count": count(others(None))}
+        for facet, labels in buckets.items():
+            for position, bucket in enumerate(labels.values()):
+                condition = CourseRepository.get_facet_conditions(bucket)[facet]
+                aggregates[f"{facet}_{position}"] = count(others(facet) & condition)
+        totals = Course.objects.aggregate(**aggregates)
+
+        counts = {
+            facet: {
+                label: totals[f"{facet}_{position}"]
+                for position, label in enumerate(labels)
+            }
+            for facet, labels in buckets.items()
+        }
+        for facet, field in (("category", "category__name"), ("batch", "batch")):
+            counts[facet] = dict(
+                Course.objects.filter(others(facet))
+                .values_list(field)
+                .annotate(count=Count("id"))
+                .order_by(field)
+            )
+        return totals["count"], counts
+
+    @staticmethod
+    def modules_with_lessons_prefetch():
+        """Prefetch for modules with their quiz and lessons ordered by position."""
+        return Prefetch(
+            "modules",
+            queryset=Module.objects.select_related("quiz").prefetch_related(
+                Prefetch("lessons", queryset=Lesson.objects.order_by("order"))
+            ),
+        )
+
     @staticmethod
     def get_course_with_modules_and_lessons(course_id):
-        return Course.objects.prefetch_related("modules__lessons").get(id=course_id)
+        return Course.objects.prefetch_related(
+            CourseRepository.modules_with_lessons_prefetch()
+        ).get(id=course_id)
+
+    @staticmethod
+    def prefetch_modules_and_lessons(course):
+        """Load modules, quizzes and ordered lessons onto an already fetched course."""
+        prefetch_related_objects(
+            [course], CourseRepository.modules_with_lessons_prefetch()
+        )
+        return course
+
+    @staticmethod
+    def adjust_total_quiz_count(module_id, delta):
+        """Add `delta` to the quiz count of the course owning a module, in one UPDATE."""
+        courses = Course.objects.filter(
+            id=Subquery(Module.objects.filter(id=module_id).values("course_id")[:1])
+        )
+        if delta < 0:
+            courses = courses.filter(total_quiz_count__gte=-delta)
+        return courses.update(total_quiz_count=F("total_quiz_count") + delta)
+
+    @staticmethod
+    def reconcile_total_quiz_counts():
+        """
+        Recount every course's quizzes and fix the counters that drifted.
+        Returns the ids of the corrected courses.
+        """
+        quiz_count = Coalesce(
+            Subquery(
+                Quiz.objects.filter(module__course=OuterRef("pk"))
+                .values("module__course")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+        drifted = list(
+            Course.objects.annotate(actual=quiz_count)
+            .exclude(total_quiz_count=F("actual"))
+            .values_list("id", flat=True)
+        )
+        if drifted:
+            Course.objects.filter(id__in=drifted).update(total_quiz_count=quiz_count)
+        return drifted
 
     @staticmethod
     def create(**data):
@@ -0,0 +1,97 @@
+from collections import defaultdict
+
+from core.search import tokenize
+from course.models import Course, CourseSearchDocument
+from django.db import connection
+
+
+class CourseSearchRepository:
+    """Database side of course search: the search documents and FULLTEXT queries."""
+
+    @staticmethod
+    def get_instructor_names(course_ids):
+        """{course_id: [instructor full names]} for the given courses."""
+        names = defaultdict(list)
+        for course_id, full_name in Course.instructors.through.objects.filter(
+            course_id__in=course_ids
+        ).values_list("course_id", "instructor__user__full_name"):
+            names[course_id].append(full_name)
+        return names
+
+    @staticmethod
+    def save_documents(courses, names):
+        """Upsert the search documents of course instances in one query."""
+        documents = [
+            CourseSearchDocument(
+                course_id=course.id,
+                title=course.title,
+                batch=course.batch,
+                description=course.description,
+                instructors=" ".join(names.get(course.id, ())),
+            )
+            for course in courses
+        ]
+        if documents:
+            CourseSearchDocument.objects.bulk_create(
+                documents,
+                update_conflicts=True,
+                # MySQL upserts on any unique key and takes no conflict target
+                unique_fields=(
+                    ["course"]
+                    if connection.features.supports_update_conflicts_with_target
+                    else None
+                ),
+                update_fields=["title", "batch", "description", "instructors"],
+            )
+        return documents
+
+    @staticmethod
+    def sync_documents(course_ids):
+        """
+        Rewrite the search documents of the given courses from the database
+        (three queries). Documents of deleted courses go with them (ON DELETE
+        CASCADE).
+        """
+        course_ids = list(course_ids)
+        courses = Course.objects.filter(id__in=course_ids).only(
+            "id", "title", "batch", "description"
+        )
+        return CourseSearchRepository.save_documents(
+            courses, CourseSearchRepository.get_instructor_names(course_ids)
+        )
+
+    @staticmethod
+    def get_documents(course_ids=None):
+        """Yield (course_id, {field: text}) for all documents, or the given courses."""
+        documents = CourseSearchDocument.objects.all()
+        if course_ids is not None:
+            documents = documents.filter(course_id__in=course_ids)
+        for course_id, title, batch, description, instructors in documents.values_list(
+            "course_id", "title", "batch", "description", "instructors"
+        ).iterator(chunk_size=2000):
+            yield course_id, {
+                "title": title,
+                "batch": batch,
+                "description": description,
+                "instructors": instructors,
+            }
+
+    @staticmethod
+    def fulltext_search(query, limit):
+        """
+        Return [(score, course_id)] from the MySQL FULLTEXT index: every term
+        required, each matched as a prefix, best first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        against = " ".join(f"+{term}*" for term in terms)
+        table = CourseSearchDocument._meta.db_table
+        match = "MATCH (title, batch, description, instructors) AGAINST (%s IN BOOLEAN MODE)"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {match} AS score, course_id FROM {table} "
+                f"WHERE {match} ORDER BY score DESC, course_id LIMIT %s",
+                [against, against, limit],
+            )
+            return cursor.fetchall()
@@ -0,0 +1,100 @@
+import time
+
+from course.repositories.quiz_repository import QuizRepository
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class QuizAnswerKeyRepository:
+    """
+    Per-quiz cache of questions, options and the answer key.
+    Entries are keyed by quiz id plus a version number; bumping the version
+    (on any Quiz, MCQQuestion or Option write, and again once it commits)
+    makes every old entry unreachable. Entries also expire after
+    QUIZ_CACHE_TTL, bounding how long a missed invalidation can last.
+    """
+
+    @staticmethod
+    def _version_key(quiz_id):
+        return f"course:quiz:{quiz_id}:version"
+
+    @staticmethod
+    def _entry_key(quiz_id, version):
+        return f"course:quiz:{quiz_id}:answer_key:v{version}"
+
+    @staticmethod
+    def get_version(quiz_id):
+        """Return the current version of a quiz's answer key."""
+        key = QuizAnswerKeyRepository._version_key(quiz_id)
+        version = cache.get(key)
+        if version is None:
+            # Start from a fresh value so an evicted counter never resurrects old entries
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
+        return version
+
+    @staticmethod
+    def get_versions(quiz_ids):
+        """Return {quiz_id: version} for several quizzes with one cache round trip."""
+        keys = {QuizAnswerKeyRepository._version_key(quiz_id): quiz_id for quiz_id in quiz_ids}
+        versions = {keys[key]: version for key, version in cache.get_many(keys).items()}
+        for quiz_id in set(keys.values()) - set(versions):
+            versions[quiz_id] = QuizAnswerKeyRepository.get_version(quiz_id)
+        return versions
+
+    @staticmethod
+    def get(quiz_id):
+        """
+        Return {"questions": [...], "answer_key": {question_id: (correct_option_index, correct_order)}}
+        for a quiz, loading it from the database on first use.
+        """
+        key = QuizAnswerKeyRepository._entry_key(
+            quiz_id, QuizAnswerKeyRepository.get_version(quiz_id)
+        )
+        entry = cache.get(key)
+        if entry is None:
+            entry = QuizAnswerKeyRepository.build(quiz_id)
+            cache.set(key, entry, timeout=settings.QUIZ_CACHE_TTL)
+        return entry
+
+    @staticmethod
+    def build(quiz_id):
+        """Build the cache entry for a quiz (one query)."""
+        questions = QuizRepository.get_questions_payload(quiz_id)
+        answer_key = {}
+        for question in questions:
+            correct_orders = [
+                option["order"] for option in question["options"] if option["is_correct"]
+            ]
+            answer_key[question["id"]] = (
+                question["correct_option_index"],
+                min(correct_orders) if correct_orders else None,
+            )
+        return {"questions": questions, "answer_key": answer_key}
+
+    @staticmethod
+    def get_questions(quiz_id):
+        """Return the serialized questions (with options) of a quiz."""
+        return QuizAnswerKeyRepository.get(quiz_id)["questions"]
+
+    @staticmethod
+    def get_answer_key(quiz_id):
+        """Return {question_id: (correct_option_index, correct_order)} for a quiz."""
+        return QuizAnswerKeyRepository.get(quiz_id)["answer_key"]
+
+    @staticmethod
+    def invalidate(quiz_id):
+        """Bump the quiz's version so the next read reloads it, now and after commit."""
+        key = QuizAnswerKeyRepository._version_key(quiz_id)
+
+        def bump():
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), timeout=None)
+
+        bump()
+        # Again after commit, in case a concurrent read cached the old rows
+        # under the new version
+        transaction.on_commit(bump)
@@ -0,0 +1,60 @@
+from course.models import QuizAttempt
+
+
+class QuizAttemptRepository:
+    """Handles database operations for QuizAttempt"""
+
+    @staticmethod
+    def get_or_create(student, quiz, deadline):
+        """Return (attempt, created); a student has one attempt per quiz."""
+        return QuizAttempt.objects.get_or_create(
+            student=student, quiz=quiz, defaults={"deadline": deadline}
+        )
+
+    @staticmethod
+    def get_by_id(attempt_id):
+        return QuizAttempt.objects.filter(id=attempt_id).first()
+
+    @staticmethod
+    def get_for_student(student, quiz, attempt_id=None):
+        """The student's attempt at a quiz (the given one, if an id is passed)."""
+        attempts = QuizAttempt.objects.filter(student=student, quiz=quiz)
+        if attempt_id is not None:
+            attempts = attempts.filter(id=attempt_id)
+        return attempts.first()
+
+    @staticmethod
+    def get_open_attempts(deadline_after):
+        """(id, quiz_id) of unsubmitted attempts whose deadline is after the given time."""
+        return list(
+            QuizAttempt.objects.filter(
+                submitted_at__isnull=True, deadline__gte=deadline_after
+            ).values_list("id", "quiz_id")
+        )
+
+    @staticmethod
+    def merge_answers(answers_by_id):
+        """
+        Merge {attempt_id: {question_id: order}} into the stored answers of
+        unsubmitted attempts (an order of None removes the answer): one
+        SELECT and one bulk UPDATE.
+        """
+        attempts = list(
+            QuizAttempt.objects.filter(
+                id__in=answers_by_id, submitted_at__isnull=True
+            ).only("id", "answers")
+        )
+        for attempt in attempts:
+            answers = {**attempt.answers, **answers_by_id[attempt.id]}
+            attempt.answers = {
+                question_id: order for question_id, order in answers.items() if order is not None
+            }
+        QuizAttempt.objects.bulk_update(attempts, ["answers"])
+        return len(attempts)
+
+    @staticmethod
+    def mark_submitted(attempt, answers, submitted_at):
+        attempt.answers = answers
+        attempt.submitted_at = submitted_at
+        attempt.save(update_fields=["answers", "submitted_at"])
+        return attempt
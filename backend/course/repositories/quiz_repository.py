@@ -19,6 +19,128 @@ class QuizRepository:
         """Fetch all questions and their options for a given quiz."""
         return MCQQuestion.objects.filter(quiz=quiz).prefetch_related("options")
     
+    @staticmethod
+    def get_questions_payload(quiz_id):
+        """
+        Fetch every question of a quiz with its options in a single query.
+        Returns the rows in the shape produced by MCQQuestionSerializer.
+        """
+        rows = (
+            MCQQuestion.objects.filter(quiz_id=quiz_id)
+            .order_by("id", "options__order")
+            .values_list(
+                "id",
+                "question_text",
+                "correct_option_index",
+                "options__id",
+                "options__option_text",
+                "options__order",
+                "options__is_correct",
+            )
+        )
+        questions = {}
+        for (
+            question_id,
+            question_text,
+            correct_option_index,
+            option_id,
+            option_text,
+            order,
+            is_correct,
+        ) in rows:
+            question = questions.setdefault(
+                question_id,
+                {
+                    "id": question_id,
+                    "question_text": question_text,
+                    "correct_option_index": correct_option_index,
+                    "options": [],
+                },
+            )
+            if option_id is not None:
+                question["options"].append(
+                    {
+                        "id": option_id,
+                        "option_text": option_text,
+                        "order": order,
+                        "is_correct": is_correct,
+                    }
+                )
+        return list(questions.values())
+
+    @staticmethod
+    def get_quiz_bodies(quiz_ids):
+        """
+        Fetch quizzes with their questions and options, without the answer
+        key, in a single query. Returns {quiz_id: quiz} in the shape read by
+        QuizBodySerializer.
+        """
+        rows = (
+            Quiz.objects.filter(id__in=quiz_ids)
+            .order_by("id", "questions__id", "questions__options__order")
+            .values_list(
+                "id",
+                "title",
+                "total_questions",
+                "passing_score",
+                "time_limit",
+                "questions__id",
+                "questions__question_text",
+                "questions__options__id",
+                "questions__options__option_text",
+                "questions__options__order",
+            )
+        )
+        quizzes = {}
+        questions = {}
+        for (
+            quiz_id,
+            title,
+            total_questions,
+            passing_score,
+            time_limit,
+            question_id,
+            question_text,
+            option_id,
+            option_text,
+            order,
+        ) in rows:
+            quiz = quizzes.setdefault(
+                quiz_id,
+                {
+                    "id": quiz_id,
+                    "title": title,
+                    "total_questions": total_questions,
+                    "passing_score": passing_score,
+                    "time_limit": time_limit,
+                    "questions": [],
+                },
+            )
+            if question_id is None:
+                continue
+            question = questions.get(question_id)
+            if question is None:
+                question = questions[question_id] = {
+                    "id": question_id,
+                    "question_text": question_text,
+                    "options": [],
+                }
+                quiz["questions"].append(question)
+            if option_id is not None:
+                question["options"].append(
+                    {"id": option_id, "option_text": option_text, "order": order}
+                )
+        return quizzes
+
+    @staticmethod
+    def get_submitted_result_ids(student, quiz_ids):
+        """{quiz_id: id of the student's latest submitted result} for the given quizzes."""
+        return dict(
+            QuizResult.objects.filter(student=student, quiz_id__in=quiz_ids, submitted=True)
+            .order_by("id")
+            .values_list("quiz_id", "id")
+        )
+
     @staticmethod
     def get_quiz_with_details(quiz_id):
         """Fetch a quiz with all its questions and options."""
@@ -33,6 +155,16 @@ class QuizRepository:
         """Fetch all quizzes for a course."""
         return Quiz.objects.filter(module__course=course).select_related("module").prefetch_related("questions__options")
 
+    @staticmethod
+    def get_results_for_course(student, course):
+        """Fetch a student's quiz results for a course keyed by quiz ID."""
+        results = {}
+        for result in QuizResult.objects.filter(
+            student=student, quiz__module__course=course
+        ).order_by("id"):
+            results.setdefault(result.quiz_id, result)
+        return results
+
     @staticmethod
     def create_mcq_question(quiz, question_text, correct_option_index):
         return MCQQuestion.objects.create(
@@ -66,6 +198,59 @@ class QuizRepository:
     def delete_Option(Option):
         Option.delete()
 
+    @staticmethod
+    def lock_quiz(quiz_id):
+        """Fetch a quiz and lock its row until the transaction ends."""
+        return Quiz.objects.select_for_update().get(id=quiz_id)
+
+    @staticmethod
+    def delete_questions(quiz):
+        """Delete every question (and option) of a quiz. Returns the question count."""
+        # Load options with their question so the delete signals need no lookups
+        Option.objects.filter(question__quiz=quiz).select_related("question").delete()
+        deleted, _ = MCQQuestion.objects.filter(quiz=quiz).delete()
+        return deleted
+
+    @staticmethod
+    def bulk_create_questions(quiz, questions):
+        """
+        Insert validated questions and their options with two bulk INSERTs.
+        No per-row signals are sent, so the caller validates the set and
+        invalidates the quiz's caches. Call it with the quiz row locked.
+        """
+        instances = MCQQuestion.objects.bulk_create(
+            [
+                MCQQuestion(
+                    quiz=quiz,
+                    question_text=question["question_text"],
+                    correct_option_index=question["correct_option_index"],
+                )
+                for question in questions
+            ]
+        )
+        if instances and instances[0].pk is None:
+            # MySQL does not return the new keys; with the quiz locked, the
+            # newest questions of the quiz are the ones just inserted
+            ids = MCQQuestion.objects.filter(quiz=quiz).order_by("-id").values_list(
+                "id", flat=True
+            )[: len(instances)]
+            for instance, pk in zip(instances, reversed(list(ids))):
+                instance.pk = pk
+
+        Option.objects.bulk_create(
+            [
+                Option(
+                    question=instance,
+                    option_text=option_text,
+                    order=order,
+                    is_correct=order == question["correct_option_index"],
+                )
+                for instance, question in zip(instances, questions)
+                for order, option_text in enumerate(question["options"], start=1)
+            ]
+        )
+        return instances
+
     @staticmethod
     def save_quiz_result(student, quiz, selected_options, obtained_marks, total_marks,submitted):
         """Save the quiz result in the database."""
@@ -1,10 +1,11 @@
 from datetime import datetime, timedelta
 import pytz 
+from core.pagination import FieldProjectionMixin
+from django.conf import settings
 from django.forms import ValidationError
 from django.utils.text import slugify
 from rest_framework import serializers
 from useraccount.serializers import InstructorSerializer
-from useraccount.models import User
 
 from .models import (
     Bannerdata,
@@ -20,6 +21,8 @@ from .models import (
     Quiz,
     QuizResult,
 )
+from .repositories.quiz_answer_key_repository import QuizAnswerKeyRepository
+from .repositories.quiz_repository import QuizRepository
 from .services import course_category_service, lesson_service, module_service
 
 
@@ -82,11 +85,8 @@ class ModuleSerializer(serializers.ModelSerializer):
         ]
 
     def get_lessons(self, obj):
-        """Return only related lessons for this module"""
-        lessons = obj.lessons.all().order_by(
-            "order"
-        )  # This will return only related lessons
-        return LessonSerializer(lessons, many=True).data
+        """Return only related lessons for this module (prefetched in order)"""
+        return LessonSerializer(obj.lessons.all(), many=True).data
 
     def create(self, validated_data):
         return module_service().create_module(**validated_data)
@@ -95,18 +95,12 @@ class ModuleSerializer(serializers.ModelSerializer):
         return module_service().update_module(instance.id, **validated_data)
 
     def get_quiz_result(self, module):
-        user_email = self.context.get("user_email")
-        if not user_email:
-            return None  # Return None if no user email is present
-
-        # Fetch the user object from the database using the email
-        try:
-            user = User.objects.get(email=user_email)
-        except User.DoesNotExist:
-            return None  # Return None if the user does not exist
+        # Results are bulk-loaded by the parent serializer, keyed by quiz ID
+        quiz_results = self.context.get("quiz_results")
+        if not quiz_results or not hasattr(module, "quiz"):
+            return None
 
-        # Fetch the quiz result for the current user and module's quiz
-        quiz_result = QuizResult.objects.filter(student=user, quiz=module.quiz).first()
+        quiz_result = quiz_results.get(module.quiz.id)
 
         # Serialize the quiz result if it exists, otherwise return None
         return QuizResultForEnrollment(quiz_result).data if quiz_result else None
@@ -158,7 +152,6 @@ class CourseDetailSerializer(serializers.ModelSerializer):
             return None
 
         enrollment = obj.enrollments.filter(student=request.user).first()
-        print(enrollment)
         return enrollment.payment_status if enrollment else None
 
 
@@ -229,7 +222,12 @@ class CourseCreateUpdateSerializer(serializers.ModelSerializer):
         return instance
 
 
-class CourseListSerializer(serializers.ModelSerializer):
+class CourseListSerializer(FieldProjectionMixin, serializers.ModelSerializer):
+    projection_sources = {
+        "time_remaining": ["start_date"],
+        "course_image_url": ["course_picture"],
+    }
+
     class Meta:
         model = Course
         fields = fields = [
@@ -245,6 +243,18 @@ class CourseListSerializer(serializers.ModelSerializer):
         ]
 
 
+class CourseFilterSerializer(serializers.Serializer):
+    """Query parameters of the faceted catalog filter (repeat category/batch for several)."""
+
+    category = serializers.ListField(child=serializers.CharField(), required=False)
+    batch = serializers.ListField(child=serializers.CharField(), required=False)
+    price_min = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    price_max = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    start_after = serializers.DateField(required=False)
+    start_before = serializers.DateField(required=False)
+    available = serializers.BooleanField(required=False, allow_null=True)
+
+
 class CourseEnrollmentSerializer(serializers.ModelSerializer):
     modules = serializers.SerializerMethodField()
     certificate_issued = serializers.SerializerMethodField()
@@ -263,23 +273,32 @@ class CourseEnrollmentSerializer(serializers.ModelSerializer):
 
     def get_modules(self, course):
         user = self.context.get("user")
-        modules = course.modules.prefetch_related("lessons").all()
-        context = {"user_email": user.email} if user and user.is_authenticated else {}
+        modules = course.modules.all()
+        context = {}
+        if user and user.is_authenticated:
+            context["quiz_results"] = QuizRepository.get_results_for_course(
+                user, course
+            )
         serialized_data = ModuleSerializer(modules, many=True, context=context).data
         return serialized_data
 
+    def _get_enrollment(self, course):
+        """The student's enrollment, taken from context or looked up once."""
+        if "enrollment" not in self.context:
+            user = self.context.get("user")
+            self.context["enrollment"] = (
+                course.enrollments.filter(student=user).first()
+                if user and user.is_authenticated
+                else None
+            )
+        return self.context["enrollment"]
+
     def get_certificate_issued(self, course):
-        user = self.context.get("user")
-        if not user or not user.is_authenticated:
-            return False
-        enrollment = course.enrollments.filter(student=user).first()
+        enrollment = self._get_enrollment(course)
         return enrollment.certificate_issued if enrollment else False
 
     def get_enrollment_id(self, course):
-        user = self.context.get("user")
-        if not user or not user.is_authenticated:
-            return None
-        enrollment = course.enrollments.filter(student=user).first()
+        enrollment = self._get_enrollment(course)
         return str(enrollment.id) if enrollment else None
 
 
@@ -324,10 +343,51 @@ class MCQQuestionSerializer(serializers.ModelSerializer):
         fields = ["id", "question_text", "correct_option_index", "options"]
 
 
-class QuizDetailSerializer(serializers.ModelSerializer):
+class QuizImportQuestionSerializer(serializers.Serializer):
+    """One question of a bulk import: four option texts and the correct one (1-4)."""
+
+    question_text = serializers.CharField(max_length=512)
+    options = serializers.ListField(
+        child=serializers.CharField(max_length=255), min_length=4, max_length=4
+    )
+    correct_option_index = serializers.IntegerField(min_value=1, max_value=4)
+
+    def validate_options(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Options of a question must be distinct.")
+        return value
+
+
+class QuizImportSerializer(serializers.Serializer):
+    """
+    A whole quiz worth of questions, validated in memory before anything
+    is written. `replace` swaps out the quiz's current questions.
+    """
+
+    questions = QuizImportQuestionSerializer(many=True, allow_empty=False)
+    replace = serializers.BooleanField(default=False)
+
+    def validate_questions(self, value):
+        if len(value) > settings.QUIZ_IMPORT_MAX_QUESTIONS:
+            raise serializers.ValidationError(
+                f"A quiz import is limited to {settings.QUIZ_IMPORT_MAX_QUESTIONS} questions."
+            )
+        seen = set()
+        for number, question in enumerate(value, start=1):
+            if question["question_text"] in seen:
+                raise serializers.ValidationError(
+                    f"Question {number} is a duplicate: {question['question_text']!r}."
+                )
+            seen.add(question["question_text"])
+        return value
+
+
+class QuizDetailSerializer(FieldProjectionMixin, serializers.ModelSerializer):
     questions = serializers.SerializerMethodField()
     result = serializers.SerializerMethodField()
 
+    projection_sources = {"questions": [], "result": []}
+
     class Meta:
         model = Quiz
         fields = [
@@ -341,9 +401,8 @@ class QuizDetailSerializer(serializers.ModelSerializer):
         ]
 
     def get_questions(self, quiz):
-        """Return all questions with their options."""
-        questions = quiz.questions.prefetch_related("options").all()
-        return MCQQuestionSerializer(questions, many=True).data
+        """Return all questions with their options from the answer-key cache."""
+        return QuizAnswerKeyRepository.get_questions(quiz.id)
 
     def get_result(self, quiz):
         """
@@ -366,11 +425,39 @@ class QuizDetailSerializer(serializers.ModelSerializer):
             return None
 
 
+class QuizBodyOptionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    option_text = serializers.CharField()
+    order = serializers.IntegerField()
+
+
+class QuizBodyQuestionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    question_text = serializers.CharField()
+    options = QuizBodyOptionSerializer(many=True)
+
+
+class QuizBodySerializer(serializers.Serializer):
+    """
+    Quiz as shown to a student taking it: no answer key and nothing
+    per-student, so one rendering is shared by every student. Reads the
+    rows of QuizRepository.get_quiz_bodies.
+    """
+
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    total_questions = serializers.IntegerField()
+    passing_score = serializers.IntegerField()
+    time_limit = serializers.IntegerField()
+    questions = QuizBodyQuestionSerializer(many=True)
+
+
 class QuizResultSerializer(serializers.Serializer):
     quiz_id = serializers.IntegerField(required=True)
     selected_options = serializers.DictField(
         child=serializers.IntegerField(), required=True
     )
+    attempt = serializers.UUIDField(required=False)  # token from the attempt start
     id = serializers.IntegerField(read_only=True)
 
     def validate_quiz_id(self, value):
@@ -385,18 +472,35 @@ class QuizResultSerializer(serializers.Serializer):
             raise serializers.ValidationError("Selected options must be a dictionary.")
 
         # Ensure all question IDs exist in the quiz
-        quiz_id = self.initial_data.get("quiz_id")
-        quiz_questions = MCQQuestion.objects.filter(quiz_id=quiz_id).values_list(
-            "id", flat=True
-        )
+        try:
+            quiz_id = int(self.initial_data.get("quiz_id"))
+        except (TypeError, ValueError):
+            return value  # reported by validate_quiz_id
+        quiz_questions = QuizAnswerKeyRepository.get_answer_key(quiz_id)
 
         for question_id in value.keys():
-            if int(question_id) not in quiz_questions:
+            try:
+                valid = int(question_id) in quiz_questions
+            except ValueError:
+                valid = False
+            if not valid:
                 raise serializers.ValidationError(f"Invalid question ID: {question_id}")
 
         return value
 
 
+class QuizAttemptAnswersSerializer(serializers.Serializer):
+    """
+    Partial answers autosaved during an attempt: {question_id: option order},
+    with null clearing a deselected answer.
+    """
+
+    answers = serializers.DictField(
+        child=serializers.IntegerField(min_value=1, max_value=4, allow_null=True),
+        allow_empty=False,
+    )
+
+
 class QuizResultShowSerializer(serializers.ModelSerializer):
     quiz = QuizDetailSerializer(read_only=True)
 
@@ -0,0 +1,372 @@
+import hashlib
+import json
+import time
+from datetime import timedelta
+
+from core.renderers import dumps
+from course.renderers import CourseRenderer
+from course.repositories.course_category_repository import CourseCategoryRepository
+from course.repositories.course_repository import CourseRepository
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+ALL_COURSES = "all"
+CATALOG_VERSION_KEY = "course:catalog:version"
+FACETS_VERSION_KEY = "course:catalog:facets:version"
+
+
+class CatalogService:
+    """
+    Precomputed, ready-to-send JSON of the public course catalog.
+
+    The course list is cached in pieces: the ids of each category (and of
+    all courses) under a catalog-wide version, bumped by course and
+    category writes, and one JSON row per course under that course's own
+    version, bumped by any write to the course including seat changes. A
+    page is assembled from its rows with one `get_many`, so a checkout only
+    makes its own course's row unreachable. Rows are keyed by day because
+    `time_remaining` depends on the current date.
+
+    Course detail snapshots are keyed by slug and stamped with the same
+    per-course version; any write touching the page bumps the version
+    instead of hunting down the slug the page was cached under. Facet
+    counts are cached per filter under a catalog-wide version bumped by
+    course and category writes, and by seat changes that sell a course out
+    or make it available again.
+
+    Every version is bumped before the write and again after it commits,
+    and every entry expires, bounding how long a missed invalidation lasts.
+    """
+
+    @staticmethod
+    def _make_snapshot(payload, **extra):
+        """Render a whole payload into a cached snapshot."""
+        body = CourseRenderer().render(payload)
+        snapshot = {
+            "body": body,
+            "etag": hashlib.md5(body).hexdigest(),
+            "last_modified": timezone.now(),
+            "built_on": timezone.localdate(),
+        }
+        snapshot.update(extra)
+        return snapshot
+
+    @staticmethod
+    def _is_fresh(snapshot):
+        return snapshot is not None and snapshot["built_on"] == timezone.localdate()
+
+    @staticmethod
+    def _categories_key(version):
+        return f"course:catalog:categories:v{version}"
+
+    @staticmethod
+    def _course_ids_key(version, category_id):
+        return f"course:catalog:ids:v{version}:{category_id}"
+
+    @staticmethod
+    def _course_row_key(course_id, version, day):
+        return f"course:catalog:row:{course_id}:v{version}:{day}"
+
+    @staticmethod
+    def build_category_snapshot(version):
+        """Serialize the category list and its name index, and cache both."""
+        from course.serializers import CourseCategorySerializer
+
+        categories = list(CourseCategoryRepository.get_all_categories().order_by("id"))
+        snapshot = CatalogService._make_snapshot(
+            {"category": CourseCategorySerializer(categories, many=True).data},
+            is_empty=not categories,
+            # Lower-cased names so ?category= keeps its case-insensitive match
+            index={category.name.lower(): category.id for category in categories},
+        )
+        cache.set(
+            CatalogService._categories_key(version),
+            snapshot,
+            timeout=settings.COURSE_CATALOG_CACHE_TTL,
+        )
+        return snapshot
+
+    @staticmethod
+    def get_category_snapshot(version=None):
+        if version is None:
+            # Read before the rows, so a concurrent write bumps it past this build
+            version = CatalogService._get_version(CATALOG_VERSION_KEY)
+        snapshot = cache.get(CatalogService._categories_key(version))
+        if snapshot is None:
+            snapshot = CatalogService.build_category_snapshot(version)
+        return snapshot
+
+    @staticmethod
+    def get_course_ids(category_name=None):
+        """
+        Return {"ids": sorted course ids, "last_modified": datetime} for a
+        category name, or for all courses when no name is given. Unknown
+        names get no ids.
+        """
+        version = CatalogService._get_version(CATALOG_VERSION_KEY)
+        categories = CatalogService.get_category_snapshot(version)
+        if category_name:
+            category_id = categories["index"].get(category_name.lower())
+            if category_id is None:
+                return {"ids": [], "last_modified": categories["last_modified"]}
+        else:
+            category_id = ALL_COURSES
+
+        key = CatalogService._course_ids_key(version, category_id)
+        course_ids = cache.get(key)
+        if course_ids is None:
+            if category_id == ALL_COURSES:
+                courses = CourseRepository.get_all_courses()
+            else:
+                courses = CourseRepository.get_courses_by_category_id(category_id)
+            course_ids = {
+                "ids": sorted(courses.values_list("id", flat=True)),
+                "last_modified": timezone.now(),
+            }
+            cache.set(key, course_ids, timeout=settings.COURSE_CATALOG_CACHE_TTL)
+        return course_ids
+
+    @staticmethod
+    def get_course_rows(course_ids):
+        """
+        Return {course_id: {"body": JSON row, "last_modified": datetime}},
+        read with one `get_many` under each course's version; missing rows
+        are built together with one query. Deleted courses are left out.
+        """
+        from course.serializers import CourseListSerializer
+
+        day = timezone.localdate()
+        versions = CatalogService._get_versions(
+            {CatalogService._course_version_key(course_id): course_id for course_id in course_ids}
+        )
+        keys = {
+            CatalogService._course_row_key(course_id, versions[course_id], day): course_id
+            for course_id in course_ids
+        }
+        rows = {keys[key]: row for key, row in cache.get_many(keys).items()}
+        missing = [course_id for course_id in course_ids if course_id not in rows]
+        if missing:
+            built = {
+                course.id: {
+                    "body": CourseRenderer().render(CourseListSerializer(course).data),
+                    "last_modified": timezone.now(),
+                }
+                for course in CourseRepository.get_courses_in_bulk(missing).values()
+            }
+            cache.set_many(
+                {
+                    CatalogService._course_row_key(course_id, versions[course_id], day): row
+                    for course_id, row in built.items()
+                },
+                timeout=settings.COURSE_CATALOG_CACHE_TTL,
+            )
+            rows.update(built)
+        return rows
+
+    @staticmethod
+    def get_course_page(course_ids, ids, next_link):
+        """Assemble one page of a course list from its cached per-course rows."""
+        rows = CatalogService.get_course_rows(ids)
+        body = (
+            b'{"courses":['
+            + b",".join(rows[course_id]["body"] for course_id in ids if course_id in rows)
+            + b'],"next":'
+            + dumps(next_link)
+            + b"}"
+        )
+        return {
+            "body": body,
+            "etag": hashlib.md5(body).hexdigest(),
+            "last_modified": max(
+                [course_ids["last_modified"], *(row["last_modified"] for row in rows.values())]
+            ),
+        }
+
+    @staticmethod
+    def _detail_key(slug):
+        return f"course:catalog:detail:{slug}"
+
+    @staticmethod
+    def _course_version_key(course_id):
+        return f"course:catalog:course-version:{course_id}"
+
+    @staticmethod
+    def _get_version(key):
+        version = cache.get(key)
+        if version is None:
+            # Start from a fresh value so an evicted counter never resurrects old entries
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
+        return version
+
+    @staticmethod
+    def _get_versions(keys):
+        """Return {keys[key]: version} for several version keys with one round trip."""
+        versions = {keys[key]: version for key, version in cache.get_many(keys).items()}
+        for key, name in keys.items():
+            if name not in versions:
+                versions[name] = CatalogService._get_version(key)
+        return versions
+
+    @staticmethod
+    def _bump_versions(keys):
+        """Bump version counters now, and again after commit."""
+
+        def bump():
+            for key in keys:
+                try:
+                    cache.incr(key)
+                except ValueError:
+                    cache.set(key, time.time_ns(), timeout=None)
+
+        bump()
+        # Again after commit, in case a concurrent read cached the old state
+        transaction.on_commit(bump)
+
+    @staticmethod
+    def get_course_detail_version(course_id):
+        return CatalogService._get_version(CatalogService._course_version_key(course_id))
+
+    @staticmethod
+    def build_course_detail_snapshot(slug):
+        """
+        Serialize a course detail page as an anonymous visitor sees it
+        (enrollment_status None) and cache it. Raises Course.DoesNotExist.
+        """
+        from course.serializers import CourseDetailSerializer
+
+        # Read the version before the course, so a write committed while
+        # serializing leaves this snapshot outdated instead of current
+        version = CatalogService.get_course_detail_version(
+            CourseRepository.get_course_id(slug)
+        )
+        course = CourseRepository.get_course_detail(slug)
+        data = CourseDetailSerializer(course).data
+        snapshot = CatalogService._make_snapshot({"course": data}, course=data, version=version)
+        cache.set(
+            CatalogService._detail_key(slug), snapshot, timeout=settings.COURSE_DETAIL_CACHE_TTL
+        )
+        return snapshot
+
+    @staticmethod
+    def get_course_detail_snapshot(slug):
+        """Return the cached detail snapshot of a course, rebuilding it when outdated."""
+        snapshot = cache.get(CatalogService._detail_key(slug))
+        if CatalogService._is_fresh(snapshot) and snapshot["version"] == cache.get(
+            CatalogService._course_version_key(snapshot["course"]["id"])
+        ):
+            return snapshot
+        return CatalogService.build_course_detail_snapshot(slug)
+
+    @staticmethod
+    def invalidate_course_detail(*course_ids):
+        """Bump the version of courses, so their list rows and detail pages are rebuilt."""
+        CatalogService._bump_versions(
+            [CatalogService._course_version_key(course_id) for course_id in course_ids]
+        )
+
+    @staticmethod
+    def get_facet_buckets(today):
+        """
+        {facet: {label: filters}} for the bucketed facets: price ranges
+        between COURSE_PRICE_FACETS edges, start date windows from today,
+        and seat availability. The filters are the query parameters that
+        select the bucket.
+        """
+        edges = settings.COURSE_PRICE_FACETS
+        price = {}
+        for low, high in zip(edges, [*edges[1:], None]):
+            if high is None:
+                price[f"{low}+"] = {"price_min": low}
+            else:
+                price[f"{low}-{high}"] = {"price_min": low, "price_max": high}
+        day = timedelta(days=1)
+        return {
+            "price": price,
+            "start_date": {
+                "started": {"start_before": today},
+                "next_30_days": {"start_after": today + day, "start_before": today + 30 * day},
+                "next_90_days": {"start_after": today + 31 * day, "start_before": today + 90 * day},
+                "later": {"start_after": today + 91 * day},
+            },
+            "available": {"true": {"available": True}, "false": {"available": False}},
+        }
+
+    @staticmethod
+    def get_facets(filters):
+        """
+        Return {"count": matching courses, "facets": {facet: [{"value", "count"}]}}
+        for a catalog filter; bucketed facet values also carry their "params".
+        Cached per catalog version and day (the date windows move daily).
+        """
+        today = timezone.localdate()
+        normalized = json.dumps(
+            {name: sorted(value) if isinstance(value, list) else value for name, value in filters.items()},
+            sort_keys=True,
+            default=str,
+        )
+        key = "course:catalog:facets:{}:{}:{}".format(
+            CatalogService._get_version(FACETS_VERSION_KEY),
+            today,
+            hashlib.md5(normalized.encode("utf-8")).hexdigest(),
+        )
+        facets = cache.get(key)
+        if facets is None:
+            buckets = CatalogService.get_facet_buckets(today)
+            count, counts = CourseRepository.get_facet_counts(filters, buckets)
+            facets = {
+                "count": count,
+                "facets": {
+                    facet: [
+                        {"value": value, "count": total, "params": buckets[facet][value]}
+                        if facet in buckets
+                        else {"value": value, "count": total}
+                        for value, total in values.items()
+                    ]
+                    for facet, values in counts.items()
+                },
+            }
+            cache.set(key, facets, timeout=settings.COURSE_FACET_CACHE_TTL)
+        return facets
+
+    @staticmethod
+    def invalidate_facets():
+        """Bump the catalog version the cached facet counts are keyed by."""
+        CatalogService._bump_versions([FACETS_VERSION_KEY])
+
+    @staticmethod
+    def refresh_course(course, deleted=False):
+        """
+        A course was saved or deleted: its row and detail page, the course
+        ids of every category (it may have moved) and the facet counts are
+        rebuilt on their next read.
+        """
+        CatalogService.invalidate_course_detail(course.id)
+        CatalogService.invalidate_facets()
+        CatalogService._bump_versions([CATALOG_VERSION_KEY])
+
+    @staticmethod
+    def course_seats_changed(course_id):
+        """
+        Seats of a course were taken or given back: only its own row and
+        detail page change. Facet counts only depend on whether seats are
+        left; the caller invalidates them when that flips.
+        """
+        CatalogService.invalidate_course_detail(course_id)
+
+    @staticmethod
+    def refresh_category(category, deleted=False):
+        """
+        Rebuild the category list (and name index) after a category changes;
+        the detail pages of its courses show its name.
+        """
+        CatalogService._bump_versions([CATALOG_VERSION_KEY])
+        CatalogService.invalidate_facets()
+        if not deleted:
+            CatalogService.invalidate_course_detail(
+                *CourseRepository.get_courses_by_category_id(category.id).values_list(
+                    "id", flat=True
+                )
+            )
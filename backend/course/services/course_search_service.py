@@ -0,0 +1,140 @@
+import threading
+import time
+
+from core.search import InvertedIndex, tokenize
+from course.repositories.course_search_repository import CourseSearchRepository
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+
+class CourseSearchService:
+    """
+    Ranked course search over title, batch, description and instructor
+    names, read from the course search documents.
+
+    On MySQL (or with COURSE_SEARCH_BACKEND=fulltext) it queries their
+    FULLTEXT index. Otherwise every process keeps an InvertedIndex built
+    from them on first use. Writes publish the changed course ids to a
+    change log in the shared cache, so each process re-indexes only those
+    courses on its next search and rebuilds when it fell too far behind.
+    """
+
+    WEIGHTS = {"title": 3.0, "instructors": 2.0, "batch": 1.5, "description": 1.0}
+    VERSION_KEY = "course:search:version"
+    CHANGE_LOG_TTL = 24 * 60 * 60
+    MAX_REPLAY = 500  # changes replayed one by one before a full rebuild
+
+    _index = None
+    _version = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _change_key(version):
+        return f"course:search:change:{version}"
+
+    @staticmethod
+    def uses_fulltext():
+        backend = settings.COURSE_SEARCH_BACKEND
+        return backend == "fulltext" or (backend == "auto" and connection.vendor == "mysql")
+
+    @staticmethod
+    def search(query):
+        """Return [(score, course_id)] matching every term of the query, best first."""
+        if not tokenize(query):
+            return []
+        limit = settings.COURSE_SEARCH_MAX_RESULTS
+        if CourseSearchService.uses_fulltext():
+            return CourseSearchRepository.fulltext_search(query, limit)
+        return CourseSearchService.get_index().search(query, limit)
+
+    @classmethod
+    def get_index(cls):
+        """The process's index, caught up with the shared change log."""
+        version = cache.get(cls.VERSION_KEY)
+        if version is None:
+            cls._start_version()
+            version = cache.get(cls.VERSION_KEY)
+        if cls._index is not None and version == cls._version:
+            return cls._index
+
+        with cls._lock:
+            if cls._index is None:
+                cls._rebuild(version)
+            elif version != cls._version:
+                if not 0 < version - cls._version <= cls.MAX_REPLAY:
+                    cls._rebuild(version)
+                else:
+                    keys = [cls._change_key(v) for v in range(cls._version + 1, version + 1)]
+                    changes = cache.get_many(keys)
+                    if len(changes) < len(keys):  # expired or evicted entries
+                        cls._rebuild(version)
+                    else:
+                        cls._reindex({i for ids in changes.values() for i in ids})
+                        cls._version = version
+            return cls._index
+
+    @classmethod
+    def _rebuild(cls, version):
+        index = InvertedIndex(cls.WEIGHTS)
+        for course_id, fields in CourseSearchRepository.get_documents():
+            index.add(course_id, fields)
+        cls._index, cls._version = index, version
+
+    @classmethod
+    def _reindex(cls, course_ids):
+        documents = dict(CourseSearchRepository.get_documents(course_ids))
+        for course_id in course_ids:
+            if course_id in documents:
+                cls._index.add(course_id, documents[course_id])
+            else:
+                cls._index.remove(course_id)
+
+    @classmethod
+    def reindex_course(cls, course, created=False):
+        """Rewrite a saved course's search document from the instance itself."""
+        names = {} if created else CourseSearchRepository.get_instructor_names([course.id])
+        CourseSearchRepository.save_documents([course], names)
+        cls.courses_changed([course.id])
+
+    @classmethod
+    def reindex_courses(cls, course_ids):
+        """
+        Rewrite the search documents of saved courses, and publish the change
+        once the transaction commits.
+        """
+        course_ids = set(course_ids)
+        if course_ids:
+            CourseSearchRepository.sync_documents(course_ids)
+            cls.courses_changed(course_ids)
+
+    @classmethod
+    def courses_changed(cls, course_ids):
+        """Publish changed (or deleted) course ids to every process after commit."""
+        course_ids = sorted(set(course_ids))
+        if course_ids and not cls.uses_fulltext():
+            transaction.on_commit(lambda: cls._publish(course_ids))
+
+    @classmethod
+    def _start_version(cls):
+        # A fresh value, so a process never mistakes a restarted log for its own
+        cache.add(cls.VERSION_KEY, time.time_ns(), timeout=None)
+
+    @classmethod
+    def _publish(cls, course_ids):
+        cls._start_version()
+        version = cache.incr(cls.VERSION_KEY)
+        cache.set(cls._change_key(version), course_ids, timeout=cls.CHANGE_LOG_TTL)
+
+    @classmethod
+    def rebuild(cls):
+        """Rewrite every search document and have every process rebuild its index."""
+        from course.repositories.course_repository import CourseRepository
+
+        course_ids = list(CourseRepository.get_all_courses().values_list("id", flat=True))
+        for start in range(0, len(course_ids), 1000):
+            CourseSearchRepository.sync_documents(course_ids[start : start + 1000])
+        # Jump past the replay window: every process rebuilds on its next search
+        cls._start_version()
+        cache.incr(cls.VERSION_KEY, cls.MAX_REPLAY + 1)
+        return len(course_ids)
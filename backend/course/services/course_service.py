@@ -22,6 +22,16 @@ class CourseService:
         """Get a course by its ID."""
         return CourseRepository.get_courses_by_slug(slug)
 
+    @staticmethod
+    def get_courses_by_ids(course_ids):
+        """Get {id: course} for the given course ids."""
+        return CourseRepository.get_courses_in_bulk(course_ids)
+
+    @staticmethod
+    def filter_courses(filters):
+        """Get the courses matching the catalog filters."""
+        return CourseRepository.filter_courses(filters)
+
     @staticmethod
     def create_course(**data):
         """Create a new course."""
@@ -0,0 +1,223 @@
+from datetime import timedelta
+
+from course.repositories.quiz_answer_key_repository import QuizAnswerKeyRepository
+from course.repositories.quiz_attempt_repository import QuizAttemptRepository
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.forms import ValidationError
+from django.utils import timezone
+
+
+class QuizAttemptService:
+    """
+    Timed quiz attempts with write-behind autosave.
+
+    Starting a quiz records an attempt whose deadline is `Quiz.time_limit`
+    seconds away. Autosaved answers only go to the cache, one entry per
+    question so concurrent saves never overwrite each other, and flag the
+    attempt as dirty. The `flush_quiz_attempts` worker merges the answers
+    of dirty attempts into the database in bulk, so an exam costs a few
+    UPDATEs per flush however many students keep answering. Submission
+    reads the buffer directly and never waits for a flush.
+    """
+
+    @staticmethod
+    def _meta_key(attempt_id):
+        return f"course:quiz-attempt:{attempt_id}"
+
+    @staticmethod
+    def _answer_key(attempt_id, question_id):
+        return f"course:quiz-attempt:{attempt_id}:answer:{question_id}"
+
+    @staticmethod
+    def _dirty_key(attempt_id):
+        return f"course:quiz-attempt:{attempt_id}:dirty"
+
+    @staticmethod
+    def closes_at(deadline):
+        """When answers stop being accepted: the deadline plus the grace period."""
+        return deadline + timedelta(seconds=settings.QUIZ_ATTEMPT_GRACE_PERIOD)
+
+    @staticmethod
+    def _buffer_timeout(deadline):
+        """Seconds buffered answers are kept: past closing, long enough to be flushed."""
+        closes_at = QuizAttemptService.closes_at(deadline)
+        remaining = (closes_at - timezone.now()).total_seconds()
+        return max(int(remaining), 0) + settings.QUIZ_ATTEMPT_BUFFER_TTL
+
+    @staticmethod
+    def _cache_meta(attempt):
+        meta = {
+            "student_id": attempt.student_id,
+            "quiz_id": attempt.quiz_id,
+            "deadline": attempt.deadline,
+            "submitted": attempt.submitted_at is not None,
+        }
+        cache.set(
+            QuizAttemptService._meta_key(attempt.id),
+            meta,
+            timeout=QuizAttemptService._buffer_timeout(attempt.deadline),
+        )
+        return meta
+
+    @staticmethod
+    def _get_meta(attempt_id):
+        """What autosave checks about an attempt, from the cache when possible."""
+        meta = cache.get(QuizAttemptService._meta_key(attempt_id))
+        if meta is None:
+            attempt = QuizAttemptRepository.get_by_id(attempt_id)
+            if attempt is None:
+                return None
+            meta = QuizAttemptService._cache_meta(attempt)
+        return meta
+
+    @staticmethod
+    def start(user, quiz):
+        """
+        Start (or resume) the student's attempt at a quiz. Returns the
+        attempt and the answers saved so far.
+        """
+        attempt, _ = QuizAttemptRepository.get_or_create(
+            user, quiz, timezone.now() + timedelta(seconds=quiz.time_limit)
+        )
+        if attempt.submitted_at is not None:
+            raise ValidationError("You have already submitted this quiz")
+        QuizAttemptService._cache_meta(attempt)
+        return attempt, QuizAttemptService.get_answers(attempt)
+
+    @staticmethod
+    def time_remaining(deadline):
+        """Whole seconds left before the deadline (0 once it has passed)."""
+        return max(int((deadline - timezone.now()).total_seconds()), 0)
+
+    @staticmethod
+    def autosave(user, attempt_id, answers):
+        """
+        Buffer partial answers ({question_id: option order, or None to clear
+        the answer}) of an open attempt. Returns the seconds left. No database
+        access on a warm cache.
+        """
+        meta = QuizAttemptService._get_meta(attempt_id)
+        if meta is None or meta["student_id"] != user.id:
+            raise ValueError("Quiz attempt not found.")
+        if meta["submitted"]:
+            raise ValidationError("This quiz attempt has already been submitted.")
+        if timezone.now() > QuizAttemptService.closes_at(meta["deadline"]):
+            raise ValidationError("The time limit for this quiz has passed.")
+
+        answer_key = QuizAnswerKeyRepository.get_answer_key(meta["quiz_id"])
+        for question_id in answers:
+            try:
+                valid = int(question_id) in answer_key
+            except ValueError:
+                valid = False
+            if not valid:
+                raise ValidationError(f"Invalid question ID: {question_id}")
+
+        timeout = QuizAttemptService._buffer_timeout(meta["deadline"])
+        # A cleared answer is buffered as None rather than deleted, so it also
+        # hides an answer flushed before it
+        cache.set_many(
+            {
+                QuizAttemptService._answer_key(attempt_id, int(question_id)): order
+                for question_id, order in answers.items()
+            },
+            timeout=timeout,
+        )
+        # Flagged after the answers, so a flush never clears a flag before seeing them
+        cache.set(QuizAttemptService._dirty_key(attempt_id), True, timeout=timeout)
+        return QuizAttemptService.time_remaining(meta["deadline"])
+
+    @staticmethod
+    def _get_buffered(attempts):
+        """
+        {attempt_id: {question_id (str): order or None if cleared}} buffered
+        for [(attempt_id, quiz_id)].
+        """
+        keys = {}
+        for attempt_id, quiz_id in attempts:
+            for question_id in QuizAnswerKeyRepository.get_answer_key(quiz_id):
+                keys[QuizAttemptService._answer_key(attempt_id, question_id)] = (
+                    attempt_id,
+                    str(question_id),
+                )
+        buffered = {attempt_id: {} for attempt_id, _ in attempts}
+        for key, order in cache.get_many(keys).items():
+            attempt_id, question_id = keys[key]
+            buffered[attempt_id][question_id] = order
+        return buffered
+
+    @staticmethod
+    def get_answers(attempt):
+        """The attempt's answers: flushed ones overlaid with the buffer."""
+        buffered = QuizAttemptService._get_buffered([(attempt.id, attempt.quiz_id)])
+        answers = {**attempt.answers, **buffered[attempt.id]}
+        return {question_id: order for question_id, order in answers.items() if order is not None}
+
+    @staticmethod
+    def get_attempt_for_submission(user, quiz, attempt_id=None):
+        """
+        The attempt a submission belongs to, or None for an untimed quiz the
+        student never started. A timed quiz must be submitted through its
+        attempt, so its deadline applies.
+        """
+        attempt = QuizAttemptRepository.get_for_student(user, quiz, attempt_id)
+        if attempt is None:
+            if attempt_id is not None:
+                raise ValidationError("Invalid quiz attempt.")
+            if quiz.time_limit:
+                raise ValidationError("Start the quiz before submitting it.")
+        elif attempt.submitted_at is not None:
+            raise ValidationError("You have already submitted this quiz")
+        return attempt
+
+    @staticmethod
+    def finish(attempt, answers):
+        """
+        Close a submitted attempt. Once the transaction commits, autosave
+        sees it submitted and its buffer is dropped.
+        """
+        QuizAttemptRepository.mark_submitted(attempt, answers, timezone.now())
+        keys = [QuizAttemptService._dirty_key(attempt.id)] + [
+            QuizAttemptService._answer_key(attempt.id, question_id)
+            for question_id in QuizAnswerKeyRepository.get_answer_key(attempt.quiz_id)
+        ]
+
+        def close():
+            QuizAttemptService._cache_meta(attempt)
+            cache.delete_many(keys)
+
+        transaction.on_commit(close)
+
+    @staticmethod
+    def flush(batch_size=None):
+        """
+        Write the buffered answers of dirty attempts to the database, in
+        batches of one SELECT and one bulk UPDATE. Returns the number of
+        attempts written.
+        """
+        batch_size = batch_size or settings.QUIZ_ATTEMPT_FLUSH_BATCH_SIZE
+        # Buffers outlive the closing time by QUIZ_ATTEMPT_BUFFER_TTL
+        deadline_after = timezone.now() - timedelta(
+            seconds=settings.QUIZ_ATTEMPT_GRACE_PERIOD + settings.QUIZ_ATTEMPT_BUFFER_TTL
+        )
+        attempts = QuizAttemptRepository.get_open_attempts(deadline_after)
+        dirty_keys = {
+            QuizAttemptService._dirty_key(attempt_id): (attempt_id, quiz_id)
+            for attempt_id, quiz_id in attempts
+        }
+        dirty = [dirty_keys[key] for key in cache.get_many(dirty_keys)]
+
+        flushed = 0
+        for start in range(0, len(dirty), batch_size):
+            batch = dirty[start : start + batch_size]
+            # Clear the flags before reading, so answers saved meanwhile flag again
+            cache.delete_many(
+                [QuizAttemptService._dirty_key(attempt_id) for attempt_id, _ in batch]
+            )
+            buffered = QuizAttemptService._get_buffered(batch)
+            flushed += QuizAttemptRepository.merge_answers(
+                {attempt_id: answers for attempt_id, answers in buffered.items() if answers}
+            )
+        return flushed
@@ -0,0 +1,36 @@
+from course.repositories.quiz_answer_key_repository import QuizAnswerKeyRepository
+
+
+class QuizGradingService:
+    """Scores quiz submissions in memory against a preloaded answer key."""
+
+    @staticmethod
+    def get_answer_key(quiz):
+        """Load the answer key for a quiz from the answer-key cache."""
+        return QuizAnswerKeyRepository.get_answer_key(quiz.id)
+
+    @staticmethod
+    def grade(answer_key, selected_options):
+        """
+        Grade the selected options against the answer key.
+        `selected_options` maps question id (as str) to the selected option order.
+        Returns (obtained_marks, total_marks, result_data).
+        """
+        obtained_marks = 0
+        result_data = {}
+
+        for question_id, (correct_option_index, correct_order) in answer_key.items():
+            selected_option_order = selected_options.get(str(question_id))
+            is_correct = (
+                selected_option_order is not None
+                and correct_order is not None
+                and int(selected_option_order) == correct_order
+            )
+            if is_correct:
+                obtained_marks += 1
+            result_data[question_id] = {
+                "is_correct": is_correct,
+                "correct_option": correct_option_index,
+            }
+
+        return obtained_marks, len(answer_key), result_data
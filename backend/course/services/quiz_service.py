@@ -1,5 +1,11 @@
+from core.renderers import dumps
 from course.models import Module, Quiz, QuizResult, StudentProgress
+from course.repositories.quiz_answer_key_repository import QuizAnswerKeyRepository
 from course.repositories.quiz_repository import QuizRepository
+from course.services.quiz_attempt_service import QuizAttemptService
+from course.services.quiz_grading_service import QuizGradingService
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.forms import ValidationError
 from django.utils import timezone
@@ -48,6 +54,97 @@ class QuizService:
         except Exception as e:
             raise e
 
+    @staticmethod
+    def _quiz_body_key(quiz_id, version):
+        return f"course:quiz:{quiz_id}:body:v{version}"
+
+    @staticmethod
+    def get_quiz_bodies(quiz_ids):
+        """
+        Return {quiz_id: JSON body rendered by QuizBodySerializer}. Bodies are
+        the same for every student and cached under the quiz's answer-key
+        version, so any quiz, question or option write replaces them. Misses
+        are built together with one query.
+        """
+        from course.serializers import QuizBodySerializer
+
+        versions = QuizAnswerKeyRepository.get_versions(quiz_ids)
+        keys = {
+            QuizService._quiz_body_key(quiz_id, version): quiz_id
+            for quiz_id, version in versions.items()
+        }
+        bodies = {keys[key]: body for key, body in cache.get_many(keys).items()}
+        missing = [quiz_id for quiz_id in quiz_ids if quiz_id not in bodies]
+        if missing:
+            built = {
+                quiz_id: dumps(QuizBodySerializer(quiz).data)
+                for quiz_id, quiz in QuizRepository.get_quiz_bodies(missing).items()
+            }
+            cache.set_many(
+                {
+                    QuizService._quiz_body_key(quiz_id, versions[quiz_id]): body
+                    for quiz_id, body in built.items()
+                },
+                timeout=settings.QUIZ_CACHE_TTL,
+            )
+            bodies.update(built)
+        return bodies
+
+    @staticmethod
+    def get_enrolled_module_quizzes(enrollment_id, module_id, user):
+        """
+        Return the JSON of {"quizzes": [...]} for a module of the user's
+        enrollment: the shared quiz bodies, each closed with the student's
+        submitted result, looked up for every quiz at once.
+        """
+        quiz_ids = list(
+            QuizService.get_quizzes_for_enrolled_course_module(enrollment_id, module_id, user)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        bodies = QuizService.get_quiz_bodies(quiz_ids)
+        result_ids = QuizRepository.get_submitted_result_ids(user, quiz_ids)
+
+        quizzes = []
+        for quiz_id in quiz_ids:
+            if quiz_id not in bodies:  # deleted meanwhile
+                continue
+            result_id = result_ids.get(quiz_id)
+            result = {"quiz_result_id": result_id, "submitted": True} if result_id else None
+            # Splice the per-student field in before the body's closing brace
+            quizzes.append(bodies[quiz_id][:-1] + b',"result":' + dumps(result) + b"}")
+        return b'{"quizzes":[' + b",".join(quizzes) + b"]}"
+
+    @staticmethod
+    def start_attempt(enrollment_id, module_id, quiz_id, user):
+        """
+        Start (or resume) a timed attempt at a quiz of the user's enrollment.
+        Returns the JSON of the attempt token, deadline, seconds left and
+        answers saved so far, with the shared quiz body under "quiz".
+        """
+        quiz = (
+            QuizService.get_quizzes_for_enrolled_course_module(enrollment_id, module_id, user)
+            .filter(id=quiz_id)
+            .first()
+        )
+        if quiz is None:
+            raise ValueError("The specified quiz does not exist in this module.")
+        if QuizRepository.get_submitted_result_ids(user, [quiz.id]):
+            raise ValidationError("You have already submitted this quiz")
+
+        attempt, answers = QuizAttemptService.start(user, quiz)
+        body = QuizService.get_quiz_bodies([quiz.id])[quiz.id]
+        meta = dumps(
+            {
+                "attempt": attempt.id,
+                "started_at": attempt.started_at,
+                "deadline": attempt.deadline,
+                "time_remaining": QuizAttemptService.time_remaining(attempt.deadline),
+                "answers": answers,
+            }
+        )
+        return meta[:-1] + b',"quiz":' + body + b"}"
+
     @staticmethod
     def create_quiz(**data):
         """Create a new quiz."""
@@ -93,6 +190,41 @@ class QuizService:
 
         return question
 
+    @staticmethod
+    def questions_from_csv(rows):
+        """
+        Map CSV rows (question_text, option_1..option_4, correct_option_index)
+        onto the shape QuizImportSerializer validates.
+        """
+        return [
+            {
+                "question_text": row.get("question_text"),
+                "options": [
+                    row[f"option_{order}"]
+                    for order in range(1, 5)
+                    if row.get(f"option_{order}") is not None
+                ],
+                "correct_option_index": row.get("correct_option_index"),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def import_questions(quiz_id, questions, replace=False):
+        """
+        Write a validated set of questions in one transaction with bulk
+        INSERTs. Returns (created, replaced) question counts.
+        """
+        with transaction.atomic():
+            quiz = QuizRepository.lock_quiz(quiz_id)
+            replaced = QuizRepository.delete_questions(quiz) if replace else 0
+            created = QuizRepository.bulk_create_questions(quiz, questions)
+            # bulk_create sends no signals: drop the cached answer key here,
+            # and again once readers can see the new rows
+            QuizAnswerKeyRepository.invalidate(quiz.id)
+            transaction.on_commit(lambda: QuizAnswerKeyRepository.invalidate(quiz.id))
+        return len(created), replaced
+
     @staticmethod
     def delete_question(question):
         QuizRepository.delete_mcq_question(question)
@@ -102,44 +234,31 @@ class QuizService:
         QuizRepository.delete_Option(Option)
 
     @staticmethod
-    def submit_quiz(user, quiz_id, selected_options):
+    def submit_quiz(user, quiz_id, selected_options, attempt_id=None):
         quiz = QuizRepository.get_quiz_by_id(quiz_id)
         if not quiz:
             raise ValidationError("Quiz not found.")
 
-        questions = QuizRepository.get_questions_with_options(quiz)
         existing_attempt = QuizResult.objects.filter(
             student=user, quiz=quiz, submitted=True
         ).exists()
         if existing_attempt:
             raise ValidationError("You have already submitted this quiz")
-        obtained_marks = 0
-        total_marks = questions.count()
-        result_data = {}
-
-        for question in questions:
-            selected_option_order = selected_options.get(str(question.id))
-            if selected_option_order is None:
-                result_data[question.id] = {
-                    "is_correct": False,
-                    "correct_option": question.correct_option_index,
-                }
-                continue
 
-            correct_option = question.options.filter(
-                order=selected_option_order, is_correct=True
-            ).first()
-            if correct_option:
-                obtained_marks += 1
-                result_data[question.id] = {
-                    "is_correct": True,
-                    "correct_option": question.correct_option_index,
-                }
-            else:
-                result_data[question.id] = {
-                    "is_correct": False,
-                    "correct_option": question.correct_option_index,
-                }
+        attempt = QuizAttemptService.get_attempt_for_submission(user, quiz, attempt_id)
+        late = attempt is not None and timezone.now() > QuizAttemptService.closes_at(
+            attempt.deadline
+        )
+        if late:
+            # Answers posted after the time limit do not count: grade the
+            # ones autosaved before it instead
+            selected_options = QuizAttemptService.get_answers(attempt)
+
+        # Score the whole submission in memory against the quiz's answer key
+        answer_key = QuizGradingService.get_answer_key(quiz)
+        obtained_marks, total_marks, result_data = QuizGradingService.grade(
+            answer_key, selected_options
+        )
 
         with transaction.atomic():
             quiz_result = QuizRepository.save_quiz_result(
@@ -156,12 +275,18 @@ class QuizService:
                 quiz=quiz,
                 defaults={"completed": True, "completed_at": timezone.now()},
             )
+            newly_completed = created or not student_progress.completed
             if not created:
                 student_progress.completed = True
                 student_progress.completed_at = timezone.now()
                 student_progress.save()
 
-            EnrollmentService.complete_quiz(user, quiz)
+            # The enrollment keeps a running count, so only count a quiz once
+            if newly_completed:
+                EnrollmentService.complete_quiz(user, quiz)
+
+            if attempt is not None:
+                QuizAttemptService.finish(attempt, selected_options)
 
         return {
             "obtained_marks": obtained_marks,
@@ -169,4 +294,5 @@ class QuizService:
             "result_data": result_data,
             "quiz_result_id": quiz_result.id,
             "submitted": quiz_result.submitted,
+            "late": late,
         }
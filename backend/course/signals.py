@@ -0,0 +1,139 @@
+from course.models import Course, CourseCategory, MCQQuestion, Module, Option, Quiz
+from course.repositories.course_repository import CourseRepository
+from course.repositories.quiz_answer_key_repository import QuizAnswerKeyRepository
+from course.services.catalog_service import CatalogService
+from course.services.course_search_service import CourseSearchService
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from payment.services.enrollment_service import EnrollmentService
+from useraccount.models import Instructor, RoleChoices, User
+
+
+# Invalidate the cached answer key whenever a quiz, question or option changes
+@receiver([post_save, post_delete], sender=Quiz)
+def invalidate_quiz_answer_key(sender, instance, **kwargs):
+    QuizAnswerKeyRepository.invalidate(instance.id)
+
+
+@receiver([post_save, post_delete], sender=MCQQuestion)
+def invalidate_question_answer_key(sender, instance, **kwargs):
+    QuizAnswerKeyRepository.invalidate(instance.quiz_id)
+
+
+@receiver([post_save, post_delete], sender=Option)
+def invalidate_option_answer_key(sender, instance, **kwargs):
+    if Option.question.is_cached(instance):
+        quiz_id = instance.question.quiz_id
+    else:
+        quiz_id = (
+            MCQQuestion.objects.filter(id=instance.question_id)
+            .values_list("quiz_id", flat=True)
+            .first()
+        )
+    if quiz_id is not None:  # question already gone when the whole quiz is deleted
+        QuizAnswerKeyRepository.invalidate(quiz_id)
+
+
+# Keep each course's quiz count in step as quizzes are added and removed,
+# and recount its enrollments' progress against the new total on commit
+def reconcile_quiz_course(module_id):
+    course_id = (
+        Module.objects.filter(id=module_id).values_list("course_id", flat=True).first()
+    )
+    if course_id is not None:
+        transaction.on_commit(lambda: EnrollmentService.reconcile_course_progress(course_id))
+
+
+@receiver(post_save, sender=Quiz)
+def count_created_quiz(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        CourseRepository.adjust_total_quiz_count(instance.module_id, 1)
+        reconcile_quiz_course(instance.module_id)
+
+
+@receiver(post_delete, sender=Quiz)
+def count_deleted_quiz(sender, instance, **kwargs):
+    CourseRepository.adjust_total_quiz_count(instance.module_id, -1)
+    reconcile_quiz_course(instance.module_id)
+
+
+# Keep the precomputed catalog snapshots in step with course and category writes
+@receiver(post_save, sender=Course)
+def refresh_catalog_course(sender, instance, **kwargs):
+    CatalogService.refresh_course(instance)
+
+
+@receiver(post_delete, sender=Course)
+def remove_catalog_course(sender, instance, **kwargs):
+    CatalogService.refresh_course(instance, deleted=True)
+
+
+@receiver(post_save, sender=CourseCategory)
+def refresh_catalog_category(sender, instance, **kwargs):
+    CatalogService.refresh_category(instance)
+
+
+@receiver(post_delete, sender=CourseCategory)
+def remove_catalog_category(sender, instance, **kwargs):
+    CatalogService.refresh_category(instance, deleted=True)
+
+
+# Keep the course search documents in step with course writes
+@receiver(post_save, sender=Course)
+def reindex_course_search(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        # A new course has no instructors yet; they arrive through m2m_changed
+        CourseSearchService.reindex_course(instance, created)
+
+
+@receiver(post_delete, sender=Course)
+def remove_course_search(sender, instance, **kwargs):
+    CourseSearchService.courses_changed([instance.id])
+
+
+# Course detail pages also show modules and instructors, and course search
+# matches instructor names
+@receiver([post_save, post_delete], sender=Module)
+def invalidate_module_course_detail(sender, instance, **kwargs):
+    CatalogService.invalidate_course_detail(instance.course_id)
+
+
+@receiver(m2m_changed, sender=Course.instructors.through)
+def refresh_instructors_courses(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        course_ids = [instance.id]
+    elif action == "pre_clear":
+        # The instructor's courses are unknown once cleared
+        instance._cleared_course_ids = CourseRepository.get_course_ids_by_instructor(instance.id)
+        return
+    elif action == "post_clear":
+        course_ids = instance.__dict__.pop("_cleared_course_ids", [])
+    else:
+        course_ids = pk_set or []
+    if action.startswith("post_"):
+        CatalogService.invalidate_course_detail(*course_ids)
+        CourseSearchService.reindex_courses(course_ids)
+
+
+@receiver(post_save, sender=Instructor)
+def invalidate_instructor_course_detail(sender, instance, **kwargs):
+    CatalogService.invalidate_course_detail(
+        *CourseRepository.get_course_ids_by_instructor(instance.id)
+    )
+
+
+@receiver(post_save, sender=User)
+def refresh_instructor_user_courses(sender, instance, update_fields=None, **kwargs):
+    shown = {"full_name", "email", "contact_number", "profile_picture"}
+    if instance.role != RoleChoices.INSTRUCTOR or (
+        update_fields is not None and not shown.intersection(update_fields)
+    ):
+        return
+    instructor_id = (
+        Instructor.objects.filter(user_id=instance.id).values_list("id", flat=True).first()
+    )
+    if instructor_id is not None:
+        course_ids = CourseRepository.get_course_ids_by_instructor(instructor_id)
+        CatalogService.invalidate_course_detail(*course_ids)
+        CourseSearchService.reindex_courses(course_ids)
@@ -0,0 +1,104 @@
+from course.models import Course, CourseCategory
+from course.services.catalog_service import CatalogService
+from django.core.cache import cache
+from django.urls import reverse
+from payment.repositories.enrollment_repository import EnrollmentRepository
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class CatalogSnapshotTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.programming = CourseCategory.objects.create(name="Programming")
+        self.design = CourseCategory.objects.create(name="Design")
+        self.course = self.create_course("Python Basics", self.programming)
+        self.create_course("Figma 101", self.design)
+
+    def create_course(self, title, category):
+        return Course.objects.create(
+            category=category,
+            title=title,
+            description="",
+            duration=120,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+
+    def get_titles(self, **params):
+        response = self.client.get(reverse("course-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [course["title"] for course in response.json()["courses"]]
+
+    def test_course_list_is_served_without_queries_once_built(self):
+        self.assertEqual(self.get_titles(), ["Python Basics", "Figma 101"])
+        self.assertEqual(self.get_titles(category="Programming"), ["Python Basics"])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_titles(category="programming"), ["Python Basics"])
+            self.assertEqual(self.get_titles(), ["Python Basics", "Figma 101"])
+            self.assertEqual(self.get_titles(category="unknown"), [])
+
+    def test_conditional_request_returns_304(self):
+        response = self.client.get(reverse("course-list"))
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get(
+            reverse("course-list"), HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_saving_a_course_updates_its_snapshots(self):
+        self.get_titles()
+        self.get_titles(category="Programming")
+        self.get_titles(category="Design")
+
+        self.course.title = "Advanced Python"
+        self.course.category = self.design
+        self.course.save()
+
+        self.assertEqual(self.get_titles(), ["Advanced Python", "Figma 101"])
+        self.assertEqual(self.get_titles(category="Programming"), [])
+        self.assertEqual(
+            self.get_titles(category="Design"), ["Advanced Python", "Figma 101"]
+        )
+
+    def get_seats(self):
+        response = self.client.get(reverse("course-list"))
+        return {course["title"]: course["remaining_seat"] for course in response.json()["courses"]}
+
+    def test_seat_change_rebuilds_only_its_own_row(self):
+        seats = self.get_seats()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EnrollmentRepository.reserve_seat(self.course.id)
+            EnrollmentRepository._seats_changed(self.course.id)
+
+        # The course ids and the other rows are still cached
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.get_seats(),
+                {**seats, "Python Basics": seats["Python Basics"] - 1},
+            )
+
+    def test_course_version_is_bumped_again_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.title = "Advanced Python"
+            self.course.save()
+            # A concurrent read before commit caches its row under this version
+            version = CatalogService.get_course_detail_version(self.course.id)
+
+        self.assertNotEqual(CatalogService.get_course_detail_version(self.course.id), version)
+
+    def test_category_list(self):
+        response = self.client.get(reverse("course-category"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [category["name"] for category in response.json()["category"]],
+            ["Programming", "Design"],
+        )
+
+        CourseCategory.objects.create(name="Marketing")
+        response = self.client.get(reverse("course-category"))
+        self.assertEqual(len(response.json()["category"]), 3)
@@ -0,0 +1,116 @@
+from unittest.mock import patch
+
+from course.models import Course, CourseCategory, Module
+from course.repositories.course_repository import CourseRepository
+from django.core.cache import cache
+from django.urls import reverse
+from payment.models import Enrollment
+from payment.repositories.enrollment_repository import EnrollmentRepository
+from rest_framework import status
+from rest_framework.test import APITestCase
+from useraccount.models import Instructor, RoleChoices, User
+
+
+class CourseDetailTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.category = CourseCategory.objects.create(name="Programming")
+        self.course = Course.objects.create(
+            category=self.category,
+            title="Python Basics",
+            description="",
+            duration=120,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+        for order in (1, 2):
+            Module.objects.create(course=self.course, title=f"Module {order}", description="", order=order)
+        for i in range(2):
+            user = User.objects.create(
+                email=f"instructor{i}@example.com",
+                full_name=f"Instructor {i}",
+                contact_number=f"100000000{i}",
+                role=RoleChoices.INSTRUCTOR,
+            )
+            self.course.instructors.add(Instructor.objects.create(user=user))
+        self.student = User.objects.create(
+            email="student@example.com", full_name="Student", contact_number="2000000000"
+        )
+
+    def get_course(self):
+        response = self.client.get(reverse("course-detail", args=[self.course.slug]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()["course"]
+
+    def test_detail_is_loaded_in_a_fixed_number_of_queries(self):
+        # course id, then course + category, instructors + users, modules
+        with self.assertNumQueries(4):
+            course = self.get_course()
+        self.assertEqual(course["category"], "Programming")
+        self.assertEqual(len(course["instructors"]), 2)
+        self.assertEqual(len(course["modules"]), 2)
+        self.assertIsNone(course["enrollment_status"])
+
+    def test_anonymous_visitors_are_served_from_the_cache(self):
+        self.get_course()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_course()["title"], "Python Basics")
+
+    def test_signed_in_user_gets_their_enrollment_status(self):
+        Enrollment.objects.create(student=self.student, course=self.course, payment_status="success")
+        self.get_course()
+        self.client.force_authenticate(user=self.student)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_course()["enrollment_status"], "success")
+
+        self.client.force_authenticate(user=None)
+        self.assertIsNone(self.get_course()["enrollment_status"])
+
+    def test_unknown_slug_is_not_found(self):
+        response = self.client.get(reverse("course-detail", args=["no-such-course"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_writes_invalidate_the_cached_detail(self):
+        self.get_course()
+
+        self.course.title = "Advanced Python"
+        self.course.save()
+        self.assertEqual(self.get_course()["title"], "Advanced Python")
+
+        Module.objects.create(course=self.course, title="Module 3", description="", order=3)
+        self.assertEqual(len(self.get_course()["modules"]), 3)
+
+        self.course.instructors.remove(Instructor.objects.first())
+        self.assertEqual(len(self.get_course()["instructors"]), 1)
+
+        instructor = self.course.instructors.get().user
+        instructor.full_name = "Jane Doe"
+        instructor.save()
+        self.assertEqual(self.get_course()["instructors"][0]["full_name"], "Jane Doe")
+
+        self.category.name = "Software"
+        self.category.save()
+        self.assertEqual(self.get_course()["category"], "Software")
+
+    def test_seat_changes_invalidate_the_cached_detail(self):
+        self.get_course()
+        with self.captureOnCommitCallbacks(execute=True):
+            EnrollmentRepository.create_enrollment(self.student, self.course)
+        self.assertEqual(self.get_course()["remaining_seat"], 99)
+
+    def test_save_during_a_build_leaves_the_snapshot_outdated(self):
+        get_course_detail = CourseRepository.get_course_detail
+
+        def load_then_save(slug):
+            course = get_course_detail(slug)
+            renamed = Course.objects.get(id=course.id)
+            renamed.title = "Advanced Python"
+            renamed.save()  # committed while the old row is being serialized
+            return course
+
+        with patch.object(CourseRepository, "get_course_detail", side_effect=load_then_save):
+            self.assertEqual(self.get_course()["title"], "Python Basics")
+
+        self.assertEqual(self.get_course()["title"], "Advanced Python")
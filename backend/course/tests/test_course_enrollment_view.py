@@ -0,0 +1,81 @@
+from course.models import Course, CourseCategory, Lesson, Module, Quiz, QuizResult
+from django.urls import reverse
+from payment.models import Enrollment
+from rest_framework import status
+from rest_framework.test import APITestCase
+from useraccount.models import User
+
+
+class CourseEnrollmentViewQueryTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="student@example.com",
+            password="TestPassword123",
+            full_name="Test Student",
+            contact_number="1234567890",
+        )
+        category = CourseCategory.objects.create(name="Programming")
+        self.course = Course.objects.create(
+            category=category,
+            title="Python Basics",
+            description="Learn Python",
+            duration=120,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+        self.enrollment = Enrollment.objects.create(
+            student=self.user,
+            course=self.course,
+            payment_status="success",
+            status="active",
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def create_modules(self, count):
+        for i in range(count):
+            module = Module.objects.create(
+                course=self.course, title=f"Module {i}", description="", order=i + 1
+            )
+            for order in (2, 1):
+                Lesson.objects.create(
+                    module=module,
+                    title=f"Lesson {order}",
+                    content="https://example.com/video",
+                    duration=10,
+                    order=order,
+                )
+            if i % 3 == 0:
+                continue  # some modules have no quiz
+            quiz = Quiz.objects.create(
+                module=module, title=f"Quiz {i}", total_questions=1, passing_score=1
+            )
+            if i % 2 == 0:
+                QuizResult.objects.create(
+                    student=self.user,
+                    quiz=quiz,
+                    selected_options={},
+                    obtained_marks=1,
+                    total_marks=1,
+                    submitted=True,
+                )
+
+    def test_query_count_is_constant_for_30_modules(self):
+        self.create_modules(30)
+        url = reverse("enrollment-detail", kwargs={"enrollment_id": self.enrollment.id})
+
+        # permission check, enrollment + course, modules + quizzes, lessons, quiz results
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["course_enroll"]
+        self.assertEqual(len(data["modules"]), 30)
+        self.assertEqual(data["enrollment_id"], str(self.enrollment.id))
+        self.assertFalse(data["certificate_issued"])
+
+        module = data["modules"][2]
+        self.assertEqual([lesson["order"] for lesson in module["lessons"]], [1, 2])
+        self.assertEqual(module["quiz_result"]["obtained_marks"], 1)
+        self.assertIsNone(data["modules"][0]["quiz"])
+        self.assertIsNone(data["modules"][1]["quiz_result"])
@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+from course.models import Course, CourseCategory
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from payment.repositories.enrollment_repository import EnrollmentRepository
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+@override_settings(API_PAGE_SIZE=2, COURSE_PRICE_FACETS=[0, 1000, 5000])
+class CourseFilterTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        today = timezone.localdate()
+        self.programming = CourseCategory.objects.create(name="Programming")
+        self.design = CourseCategory.objects.create(name="Design")
+        self.python = self.create_course(
+            "Python", self.programming, "Batch 1", 500, today + timedelta(days=10)
+        )
+        self.django = self.create_course(
+            "Django", self.programming, "Batch 2", 2500, today + timedelta(days=60)
+        )
+        self.flask = self.create_course(
+            "Flask", self.programming, "Batch 1", 6000, today - timedelta(days=5), seats=0
+        )
+        self.figma = self.create_course(
+            "Figma", self.design, "Batch 1", 800, today + timedelta(days=200)
+        )
+
+    def create_course(self, title, category, batch, price, start_date, seats=100):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Course.objects.create(
+                category=category,
+                title=title,
+                description=f"{title} course",
+                duration=60,
+                batch=batch,
+                price=price,
+                start_date=start_date,
+                remaining_seat=seats,
+                demo_url="https://example.com/demo",
+            )
+
+    def get(self, params):
+        response = self.client.get(reverse("course-filter"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def facet(self, data, name):
+        return {value["value"]: value["count"] for value in data["facets"][name]}
+
+    def titles(self, params):
+        """Follow `next` links and return every title found."""
+        titles = []
+        response = self.client.get(reverse("course-filter"), params)
+        while True:
+            data = response.json()
+            titles.extend(course["title"] for course in data["courses"])
+            if not data["next"]:
+                return titles
+            response = self.client.get(data["next"])
+
+    def test_filters_combine_across_facets_and_pages(self):
+        self.assertEqual(self.titles({}), ["Python", "Django", "Flask", "Figma"])
+        self.assertEqual(
+            self.titles({"category": ["Programming", "Design"], "batch": "Batch 1"}),
+            ["Python", "Flask", "Figma"],
+        )
+        self.assertEqual(
+            self.titles({"price_min": 1000, "available": "true"}), ["Django"]
+        )
+        self.assertEqual(
+            self.titles({"start_after": timezone.localdate().isoformat()}),
+            ["Python", "Django", "Figma"],
+        )
+
+    def test_facet_counts_ignore_their_own_filter(self):
+        data = self.get({"category": "Programming", "available": "true"})
+
+        self.assertEqual(data["count"], 2)
+        # Other categories are still counted, under the availability filter
+        self.assertEqual(self.facet(data, "category"), {"Design": 1, "Programming": 2})
+        self.assertEqual(self.facet(data, "available"), {"true": 2, "false": 1})
+        self.assertEqual(self.facet(data, "batch"), {"Batch 1": 1, "Batch 2": 1})
+        self.assertEqual(
+            self.facet(data, "price"), {"0-1000": 1, "1000-5000": 1, "5000+": 0}
+        )
+        self.assertEqual(
+            self.facet(data, "start_date"),
+            {"started": 0, "next_30_days": 1, "next_90_days": 1, "later": 0},
+        )
+
+    def test_bucket_params_select_the_bucket(self):
+        data = self.get({})
+        for facet in ("price", "start_date", "available"):
+            for bucket in data["facets"][facet]:
+                self.assertEqual(self.get(bucket["params"])["count"], bucket["count"])
+
+    def test_facets_are_cached_until_a_course_changes(self):
+        self.get({"category": "Programming"})
+        with self.assertNumQueries(1):  # the page of courses
+            self.get({"category": "Programming"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.figma.category = self.programming
+            self.figma.save()
+
+        self.assertEqual(self.get({"category": "Programming"})["count"], 4)
+
+    def test_seat_changes_refresh_availability(self):
+        self.assertEqual(self.facet(self.get({}), "available")["false"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EnrollmentRepository.release_seats(self.flask.id)
+
+        self.assertEqual(self.facet(self.get({}), "available")["false"], 0)
+
+    def test_seat_changes_keep_facets_until_availability_flips(self):
+        self.get({})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(EnrollmentRepository.reserve_seat(self.python.id))
+            EnrollmentRepository.release_seats(self.django.id)
+        with self.assertNumQueries(1):  # the page of courses
+            self.get({})
+
+        self.python.refresh_from_db()
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(self.python.remaining_seat):
+                self.assertTrue(EnrollmentRepository.reserve_seat(self.python.id))
+        self.assertFalse(EnrollmentRepository.reserve_seat(self.python.id))
+        self.assertEqual(self.facet(self.get({}), "available")["false"], 2)
+
+    def test_invalid_parameters_are_rejected(self):
+        response = self.client.get(reverse("course-filter"), {"price_min": "cheap"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("price_min", response.json()["errors"])
@@ -0,0 +1,180 @@
+from io import StringIO
+from unittest import skipUnless
+
+from course.models import Course, CourseCategory, CourseSearchDocument
+from course.services.course_search_service import CourseSearchService
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from useraccount.models import Instructor, RoleChoices, User
+
+
+@override_settings(API_PAGE_SIZE=2, COURSE_SEARCH_BACKEND="memory")
+class CourseSearchTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.category = CourseCategory.objects.create(name="Programming")
+        self.python = self.create_course("Python Basics", "Learn Python from scratch")
+        self.django = self.create_course("Django REST", "Build APIs with Python")
+        self.flask = self.create_course("Flask Web Apps", "Small Python services")
+        self.figma = self.create_course("Figma 101", "Design for beginners")
+
+        user = User.objects.create(
+            email="jane@example.com",
+            full_name="Jane Doe",
+            contact_number="1000000000",
+            role=RoleChoices.INSTRUCTOR,
+        )
+        self.instructor = Instructor.objects.create(user=user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.figma.instructors.add(self.instructor)
+
+    def create_course(self, title, description):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Course.objects.create(
+                category=self.category,
+                title=title,
+                description=description,
+                duration=60,
+                batch="Batch 1",
+                demo_url="https://example.com/demo",
+            )
+
+    def search(self, query):
+        response = self.client.get(reverse("course-search"), {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def titles(self, query):
+        """Follow `next` links and return every title found."""
+        titles = []
+        response = self.client.get(reverse("course-search"), {"q": query})
+        while True:
+            data = response.json()
+            titles.extend(course["title"] for course in data["courses"])
+            if not data["next"]:
+                return titles
+            response = self.client.get(data["next"])
+
+    def test_ranked_prefix_search_with_pagination(self):
+        page = self.search("pyth")
+        self.assertEqual(page["courses"][0]["title"], "Python Basics")
+        self.assertEqual(len(page["courses"]), 2)
+        self.assertIsNotNone(page["next"])
+        self.assertEqual(
+            self.titles("pyth"), ["Python Basics", "Django REST", "Flask Web Apps"]
+        )
+
+    def test_matches_instructor_names_and_batch(self):
+        self.assertEqual(self.titles("jane"), ["Figma 101"])
+        self.assertEqual(len(self.titles("batch")), 4)
+
+    def test_search_reads_one_query_once_indexed(self):
+        self.search("python")
+        with self.assertNumQueries(1):
+            self.search("django api")
+
+    def test_saves_and_deletes_update_the_index(self):
+        self.search("python")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.figma.title = "Python for Designers"
+            self.figma.save()
+        self.assertIn("Python for Designers", self.titles("python"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python.delete()
+        self.assertNotIn("Python Basics", self.titles("python"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.instructor.user.full_name = "Janet Smith"
+            self.instructor.user.save()
+        self.assertEqual(self.titles("smith"), ["Python for Designers"])
+        self.assertEqual(
+            CourseSearchDocument.objects.get(course=self.figma).instructors, "Janet Smith"
+        )
+
+    def test_other_processes_catch_up_from_the_change_log(self):
+        self.search("python")
+        # Another process saved a course: only its published change reaches us
+        Course.objects.filter(id=self.figma.id).update(title="Python Design")
+        CourseSearchService.reindex_courses([self.figma.id])
+        self.assertNotIn("Python Design", self.titles("python"))
+        CourseSearchService._publish([self.figma.id])
+        self.assertIn("Python Design", self.titles("python"))
+
+    def test_rebuild_command(self):
+        Course.objects.filter(id=self.flask.id).update(title="Flask Microservices")
+        call_command("rebuild_course_search", stdout=StringIO())
+        self.assertEqual(self.titles("microservices"), ["Flask Microservices"])
+
+    def test_missing_query_is_rejected(self):
+        response = self.client.get(reverse("course-search"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# InnoDB applies FULLTEXT index changes at commit: the rows must be committed
+@skipUnless(connection.vendor == "mysql", "FULLTEXT search runs on MySQL only")
+@override_settings(API_PAGE_SIZE=2, COURSE_SEARCH_BACKEND="auto")
+class CourseFulltextSearchTestCase(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.category = CourseCategory.objects.create(name="Programming")
+        for title, description in [
+            ("Python Basics", "Learn Python from scratch"),
+            ("Django REST", "Build APIs with Python"),
+            ("Flask Web Apps", "Small Python services"),
+            ("Figma 101", "Design for beginners"),
+        ]:
+            course = Course.objects.create(
+                category=self.category,
+                title=title,
+                description=description,
+                duration=60,
+                batch="Batch 1",
+                demo_url="https://example.com/demo",
+            )
+        self.figma = course
+        user = User.objects.create(
+            email="jane@example.com",
+            full_name="Jane Doe",
+            contact_number="1000000000",
+            role=RoleChoices.INSTRUCTOR,
+        )
+        self.figma.instructors.add(Instructor.objects.create(user=user))
+
+    def titles(self, query):
+        """Follow `next` links and return every title found, page by page."""
+        pages = []
+        response = self.client.get(reverse("course-search"), {"q": query})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+            pages.append([course["title"] for course in data["courses"]])
+            if not data["next"]:
+                return pages
+            response = self.client.get(data["next"])
+
+    def test_auto_uses_the_fulltext_index(self):
+        self.assertTrue(CourseSearchService.uses_fulltext())
+
+    def test_ranked_prefix_search_with_pagination(self):
+        # Two mentions outrank one; ties keep course id order across pages
+        self.assertEqual(
+            self.titles("pyth"), [["Python Basics", "Django REST"], ["Flask Web Apps"]]
+        )
+
+    def test_every_term_must_match_as_a_prefix(self):
+        self.assertEqual(self.titles("python api"), [["Django REST"]])
+        self.assertEqual(self.titles("jan"), [["Figma 101"]])
+        self.assertEqual(self.titles("python figma"), [[]])
+
+    def test_saves_update_the_index(self):
+        self.figma.title = "Python for Designers"
+        self.figma.save()
+        self.assertIn("Python for Designers", sum(self.titles("python"), []))
@@ -0,0 +1,119 @@
+from course.models import Course, CourseCategory, MCQQuestion, Module, Option, Quiz, QuizResult
+from django.core.cache import cache
+from django.urls import reverse
+from payment.models import Enrollment
+from rest_framework import status
+from rest_framework.test import APITestCase
+from useraccount.models import User
+
+
+class EnrolledCourseQuizViewTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="student@example.com",
+            password="TestPassword123",
+            full_name="Test Student",
+            contact_number="1234567890",
+        )
+        category = CourseCategory.objects.create(name="Programming")
+        course = Course.objects.create(
+            category=category,
+            title="Python Basics",
+            description="Learn Python",
+            duration=120,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+        self.module = Module.objects.create(
+            course=course, title="Intro", description="Intro module", order=1
+        )
+        self.quiz = Quiz.objects.create(
+            module=self.module, title="Intro Quiz", total_questions=2, passing_score=1
+        )
+        self.questions = []
+        for i in range(2):
+            question = MCQQuestion.objects.create(
+                quiz=self.quiz, question_text=f"Question {i}", correct_option_index=2
+            )
+            for order in (3, 1, 4, 2):
+                Option.objects.create(
+                    question=question,
+                    option_text=f"Option {order}",
+                    order=order,
+                    is_correct=order == 2,
+                )
+            self.questions.append(question)
+        self.enrollment = Enrollment.objects.create(
+            student=self.user, course=course, payment_status="success", status="active"
+        )
+        self.url = reverse(
+            "enrolled-course-module-quizzes", args=[self.enrollment.id, self.module.id]
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def get_quizzes(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()["quizzes"]
+
+    def test_quiz_body_without_answer_key(self):
+        [quiz] = self.get_quizzes()
+
+        self.assertEqual(quiz["id"], self.quiz.id)
+        self.assertEqual(quiz["time_limit"], self.quiz.time_limit)
+        self.assertIsNone(quiz["result"])
+        question = quiz["questions"][0]
+        self.assertEqual(question["question_text"], "Question 0")
+        self.assertNotIn("correct_option_index", question)
+        self.assertEqual([option["order"] for option in question["options"]], [1, 2, 3, 4])
+        self.assertEqual(
+            set(question["options"][0]), {"id", "option_text", "order"}
+        )
+
+    def test_body_is_cached_and_results_are_per_student(self):
+        self.get_quizzes()
+        # permission check, enrollment, module, quiz ids, submitted results
+        with self.assertNumQueries(5):
+            self.get_quizzes()
+
+        result = QuizResult.objects.create(
+            student=self.user,
+            quiz=self.quiz,
+            selected_options={},
+            obtained_marks=1,
+            total_marks=2,
+            submitted=True,
+        )
+        [quiz] = self.get_quizzes()
+        self.assertEqual(quiz["result"], {"quiz_result_id": result.id, "submitted": True})
+
+    def test_question_changes_replace_the_cached_body(self):
+        self.get_quizzes()
+
+        question = self.questions[1]
+        question.question_text = "Reworded"
+        question.save()
+
+        [quiz] = self.get_quizzes()
+        self.assertEqual(quiz["questions"][1]["question_text"], "Reworded")
+
+    def test_module_outside_the_enrollment_is_not_found(self):
+        other = Module.objects.create(
+            course=Course.objects.create(
+                category=self.module.course.category,
+                title="Other",
+                description="Other course",
+                duration=60,
+                batch="Batch 1",
+                demo_url="https://example.com/demo",
+            ),
+            title="Other",
+            description="",
+            order=1,
+        )
+        response = self.client.get(
+            reverse("enrolled-course-module-quizzes", args=[self.enrollment.id, other.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
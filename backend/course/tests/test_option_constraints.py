@@ -0,0 +1,185 @@
+from importlib import import_module
+
+from course.models import Course, CourseCategory, MCQQuestion, Module, Option, Quiz
+from course.repositories.quiz_answer_key_repository import QuizAnswerKeyRepository
+from course.validators import validate_question_options
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from useraccount.models import User
+
+
+class ValidateQuestionOptionsTestCase(SimpleTestCase):
+
+    def test_accepts_a_complete_set(self):
+        validate_question_options([(2, False), (1, False), (4, True), (3, False)], 4)
+
+    def test_rejects_bad_sets(self):
+        bad_sets = [
+            ([(1, True), (2, False), (3, False)], None),  # three options
+            ([(1, True), (2, False), (2, False), (4, False)], None),  # duplicate order
+            ([(1, True), (2, True), (3, False), (4, False)], None),  # two correct
+            ([(1, False), (2, False), (3, False), (4, False)], None),  # none correct
+            ([(1, True), (2, False), (3, False), (4, False)], 2),  # index mismatch
+        ]
+        for options, correct_option_index in bad_sets:
+            with self.subTest(options=options), self.assertRaises(ValidationError):
+                validate_question_options(options, correct_option_index)
+
+
+class OptionConstraintsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        category = CourseCategory.objects.create(name="Programming")
+        course = Course.objects.create(
+            category=category,
+            title="Python Basics",
+            description="Learn Python",
+            duration=120,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+        module = Module.objects.create(course=course, title="Intro", description="", order=1)
+        self.quiz = Quiz.objects.create(
+            module=module, title="Intro Quiz", total_questions=1, passing_score=1
+        )
+        self.question = MCQQuestion.objects.create(
+            quiz=self.quiz, question_text="2 + 2?", correct_option_index=4
+        )
+        for order in range(1, 5):
+            Option.objects.create(
+                question=self.question,
+                option_text=str(order),
+                order=order,
+                is_correct=order == 4,
+            )
+
+    def assertRejected(self, **fields):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Option.objects.create(question=self.question, option_text="x", **fields)
+
+    def test_database_rejects_invalid_options(self):
+        self.assertRejected(order=5)  # a fifth option
+        self.assertRejected(order=2)  # a second option in slot 2
+        other = MCQQuestion.objects.create(
+            quiz=self.quiz, question_text="3 + 3?", correct_option_index=1
+        )
+        Option.objects.create(question=other, option_text="6", order=1, is_correct=True)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Option.objects.create(question=other, option_text="7", order=2, is_correct=True)
+
+    def test_option_writes_do_not_count(self):
+        self.question.options.all().delete()
+        with self.assertNumQueries(1):
+            Option.objects.create(
+                question=self.question, option_text="1", order=1, is_correct=True
+            )
+
+    def test_api_moves_the_correct_option(self):
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_user(
+                email="admin@example.com",
+                password="TestPassword@123",
+                full_name="Admin",
+                contact_number="1000000000",
+                role="admin",
+            )
+        )
+        url = reverse("mcq-question-update-delete", args=[self.question.id])
+        payload = {
+            "question_text": "2 + 2?",
+            "correct_option_index": 2,
+            "Options": [["3", False], ["4", True], ["5", False], ["6", False]],
+        }
+        QuizAnswerKeyRepository.get_answer_key(self.quiz.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.put(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            QuizAnswerKeyRepository.get_answer_key(self.quiz.id)[self.question.id], (2, 2)
+        )
+        self.assertEqual(
+            list(self.question.options.values_list("option_text", "is_correct")),
+            [("3", False), ("4", True), ("5", False), ("6", False)],
+        )
+
+        payload["Options"][0][1] = True
+        response = client.put(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_rejects_an_invalid_option_set(self):
+        admin_user = User.objects.create_superuser(
+            email="root@example.com", password="TestPassword@123", contact_number="1000000001"
+        )
+        self.client.force_login(admin_user)
+        options = self.question.options.order_by("order")
+        data = {
+            "quiz": self.quiz.id,
+            "question_text": "2 + 2?",
+            "correct_option_index": 1,
+            "options-TOTAL_FORMS": 4,
+            "options-INITIAL_FORMS": 4,
+            "options-MIN_NUM_FORMS": 0,
+            "options-MAX_NUM_FORMS": 4,
+        }
+        for i, option in enumerate(options):
+            data.update(
+                {
+                    f"options-{i}-id": option.id,
+                    f"options-{i}-question": self.question.id,
+                    f"options-{i}-option_text": option.option_text,
+                    f"options-{i}-order": option.order,
+                }
+            )
+        url = reverse("admin:course_mcqquestion_change", args=[self.question.id])
+
+        data["options-0-is_correct"] = "on"
+        data["options-3-is_correct"] = "on"
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 200)  # form redisplayed with errors
+        self.assertContains(response, "exactly 1 correct option")
+
+        del data["options-3-is_correct"]
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.question.options.get(is_correct=True).order, 1)
+
+    def test_migration_normalizes_the_correct_option(self):
+        normalize_options = import_module(
+            "course.migrations.0024_option_constraints"
+        ).normalize_options
+        self.question.options.update(is_correct=False)
+        self.question.correct_option_index = 3
+        self.question.save()
+
+        normalize_options(apps, None)
+        self.assertEqual(self.question.options.get(is_correct=True).order, 3)
+
+        # A single flagged option wins over the index
+        self.question.options.filter(order=3).update(is_correct=False)
+        self.question.options.filter(order=1).update(is_correct=True)
+        with self.assertLogs("course.migrations.0024_option_constraints") as logs:
+            normalize_options(apps, None)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.correct_option_index, 1)
+        self.assertEqual(self.question.options.get(is_correct=True).order, 1)
+        self.assertEqual(
+            logs.output,
+            [
+                "INFO:course.migrations.0024_option_constraints:Normalized 0 options "
+                "and the correct_option_index of 1 questions."
+            ],
+        )
+
+        self.question.options.filter(order__gt=2).delete()
+        self.question.options.update(is_correct=False)
+        MCQQuestion.objects.filter(id=self.question.id).update(correct_option_index=3)
+        with self.assertRaisesMessage(RuntimeError, f"MCQQuestion ids: [{self.question.id}]"):
+            normalize_options(apps, None)
@@ -0,0 +1,218 @@
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from course.models import Course, CourseCategory, MCQQuestion, Module, Option, Quiz, QuizAttempt
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from payment.models import Enrollment
+from rest_framework import status
+from rest_framework.test import APITestCase
+from useraccount.models import User
+
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(tempfile.gettempdir(), "slms-test-cache"),
+    }
+}
+LOCAL_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+@override_settings(QUIZ_ATTEMPT_GRACE_PERIOD=30)
+class QuizAttemptTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="student@example.com",
+            password="TestPassword123",
+            full_name="Test Student",
+            contact_number="1234567890",
+        )
+        category = CourseCategory.objects.create(name="Programming")
+        course = Course.objects.create(
+            category=category,
+            title="Python Basics",
+            description="Learn Python",
+            duration=120,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+        self.module = Module.objects.create(
+            course=course, title="Intro", description="Intro module", order=1
+        )
+        self.quiz = Quiz.objects.create(
+            module=self.module, title="Intro Quiz", total_questions=2, passing_score=1,
+            time_limit=600,
+        )
+        self.questions = []
+        for i in range(2):
+            question = MCQQuestion.objects.create(
+                quiz=self.quiz, question_text=f"Question {i}", correct_option_index=2
+            )
+            for order in range(1, 5):
+                Option.objects.create(
+                    question=question,
+                    option_text=f"Option {order}",
+                    order=order,
+                    is_correct=order == 2,
+                )
+            self.questions.append(question)
+        # A second quiz, so submitting the first does not complete the course
+        Quiz.objects.create(
+            module=Module.objects.create(
+                course=course, title="Final", description="Final module", order=2
+            ),
+            title="Final Quiz",
+            total_questions=1,
+            passing_score=1,
+        )
+        self.enrollment = Enrollment.objects.create(
+            student=self.user, course=course, payment_status="success", status="active"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def start(self):
+        response = self.client.post(
+            reverse(
+                "quiz-attempt-start", args=[self.enrollment.id, self.module.id, self.quiz.id]
+            )
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.json()
+
+    def autosave(self, attempt_id, answers):
+        return self.client.patch(
+            reverse("quiz-attempt-answers", args=[attempt_id]),
+            {"answers": answers},
+            format="json",
+        )
+
+    def submit(self, answers, attempt_id=None):
+        payload = {"quiz_id": self.quiz.id, "selected_options": answers}
+        if attempt_id:
+            payload["attempt"] = attempt_id
+        return self.client.post(reverse("submit_quiz"), payload, format="json")
+
+    def expire(self, attempt_id):
+        QuizAttempt.objects.filter(id=attempt_id).update(
+            deadline=timezone.now() - timedelta(minutes=5)
+        )
+        cache.delete(f"course:quiz-attempt:{attempt_id}")
+
+    def test_start_returns_token_deadline_and_quiz(self):
+        data = self.start()
+
+        self.assertEqual(data["quiz"]["id"], self.quiz.id)
+        self.assertNotIn("correct_option_index", data["quiz"]["questions"][0])
+        self.assertGreater(data["time_remaining"], 590)
+        self.assertEqual(data["answers"], {})
+        # Starting again resumes the same attempt
+        self.assertEqual(self.start()["attempt"], data["attempt"])
+
+    # The flusher refuses a per-process cache: share one through files
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_autosave_is_buffered_then_flushed_in_bulk(self):
+        cache.clear()
+        attempt_id = self.start()["attempt"]
+        first, second = (str(question.id) for question in self.questions)
+
+        with self.assertNumQueries(0):
+            response = self.autosave(attempt_id, {first: 1})
+            self.autosave(attempt_id, {second: 3})
+            self.autosave(attempt_id, {first: 2})
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(QuizAttempt.objects.get(id=attempt_id).answers, {})
+
+        # Resuming reads the buffer before any flush
+        self.assertEqual(self.start()["answers"], {first: 2, second: 3})
+
+        out = StringIO()
+        call_command("flush_quiz_attempts", "--once", stdout=out)
+        self.assertIn("Flushed 1 quiz attempt(s).", out.getvalue())
+        self.assertEqual(QuizAttempt.objects.get(id=attempt_id).answers, {first: 2, second: 3})
+        # Nothing left to write until the next autosave
+        with self.assertNumQueries(1):  # the open attempts
+            call_command("flush_quiz_attempts", "--once", stdout=StringIO())
+
+    @override_settings(CACHES=SHARED_CACHES)
+    def test_autosaving_null_clears_an_answer(self):
+        cache.clear()
+        attempt_id = self.start()["attempt"]
+        first, second = (str(question.id) for question in self.questions)
+        self.autosave(attempt_id, {first: 1, second: 3})
+        call_command("flush_quiz_attempts", "--once", stdout=StringIO())
+
+        # Cleared after it was flushed
+        response = self.autosave(attempt_id, {first: None})
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(self.start()["answers"], {second: 3})
+
+        call_command("flush_quiz_attempts", "--once", stdout=StringIO())
+        self.assertEqual(QuizAttempt.objects.get(id=attempt_id).answers, {second: 3})
+
+    @override_settings(CACHES=LOCAL_CACHES)
+    def test_flush_refuses_a_per_process_cache(self):
+        with self.assertRaisesMessage(CommandError, "needs a cache shared"):
+            call_command("flush_quiz_attempts", "--once", stdout=StringIO())
+
+    def test_autosave_rejects_unknown_questions_and_other_students(self):
+        attempt_id = self.start()["attempt"]
+
+        response = self.autosave(attempt_id, {"999999": 1})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="TestPassword123",
+            full_name="Other Student",
+            contact_number="1234567891",
+        )
+        self.client.force_authenticate(user=other)
+        response = self.autosave(attempt_id, {str(self.questions[0].id): 1})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_submit_in_time_grades_the_posted_answers(self):
+        attempt_id = self.start()["attempt"]
+        answers = {str(question.id): 2 for question in self.questions}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.submit(answers, attempt_id)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.json()["late"])
+        attempt = QuizAttempt.objects.get(id=attempt_id)
+        self.assertIsNotNone(attempt.submitted_at)
+        self.assertEqual(attempt.answers, answers)
+        self.assertEqual(
+            self.autosave(attempt_id, answers).status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_late_submission_grades_the_answers_saved_in_time(self):
+        attempt_id = self.start()["attempt"]
+        first, second = (str(question.id) for question in self.questions)
+        self.autosave(attempt_id, {first: 2})
+        self.expire(attempt_id)
+
+        response = self.autosave(attempt_id, {second: 2})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.submit({first: 2, second: 2}, attempt_id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()["late"])
+        self.assertEqual(self.quiz.results.get().obtained_marks, 1)
+
+    def test_submission_checks_the_attempt(self):
+        response = self.submit({}, "00000000-0000-0000-0000-000000000000")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.submit({})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["error"], "Start the quiz before submitting it.")
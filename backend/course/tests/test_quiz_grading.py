@@ -0,0 +1,91 @@
+from course.models import Course, CourseCategory, MCQQuestion, Module, Option, Quiz
+from course.repositories.quiz_answer_key_repository import QuizAnswerKeyRepository
+from course.services.quiz_grading_service import QuizGradingService
+from django.core.cache import cache
+from django.test import TestCase
+
+
+class QuizGradingServiceTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        category = CourseCategory.objects.create(name="Programming")
+        course = Course.objects.create(
+            category=category,
+            title="Python Basics",
+            description="Learn Python",
+            duration=120,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+        module = Module.objects.create(
+            course=course, title="Intro", description="Intro module", order=1
+        )
+        self.quiz = Quiz.objects.create(
+            module=module, title="Intro Quiz", total_questions=3, passing_score=2
+        )
+        self.questions = []
+        for i, correct_order in enumerate([1, 2, 3]):
+            question = MCQQuestion.objects.create(
+                quiz=self.quiz,
+                question_text=f"Question {i}",
+                correct_option_index=correct_order,
+            )
+            for order in range(1, 5):
+                Option.objects.create(
+                    question=question,
+                    option_text=f"Option {order}",
+                    order=order,
+                    is_correct=order == correct_order,
+                )
+            self.questions.append(question)
+
+    def test_answer_key_loads_in_one_query_then_from_cache(self):
+        with self.assertNumQueries(1):
+            answer_key = QuizGradingService.get_answer_key(self.quiz)
+        with self.assertNumQueries(0):
+            QuizGradingService.get_answer_key(self.quiz)
+
+        self.assertEqual(len(answer_key), 3)
+        self.assertEqual(answer_key[self.questions[1].id], (2, 2))
+
+    def test_answer_key_invalidated_on_option_change(self):
+        QuizGradingService.get_answer_key(self.quiz)
+
+        question = self.questions[0]
+        question.options.filter(order=1).update(is_correct=False)
+        option = question.options.get(order=4)
+        option.is_correct = True
+        option.save()
+
+        answer_key = QuizGradingService.get_answer_key(self.quiz)
+        self.assertEqual(answer_key[question.id], (1, 4))
+
+    def test_answer_key_version_bumped_again_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.questions[0].save()
+            # A concurrent read before commit caches under this version
+            version = QuizAnswerKeyRepository.get_version(self.quiz.id)
+            QuizGradingService.get_answer_key(self.quiz)
+
+        self.assertNotEqual(QuizAnswerKeyRepository.get_version(self.quiz.id), version)
+        with self.assertNumQueries(1):
+            QuizGradingService.get_answer_key(self.quiz)
+
+    def test_grade(self):
+        answer_key = QuizGradingService.get_answer_key(self.quiz)
+        selected_options = {
+            str(self.questions[0].id): 1,  # correct
+            str(self.questions[1].id): 4,  # wrong
+        }  # third question unanswered
+
+        with self.assertNumQueries(0):
+            obtained, total, result_data = QuizGradingService.grade(
+                answer_key, selected_options
+            )
+
+        self.assertEqual((obtained, total), (1, 3))
+        self.assertTrue(result_data[self.questions[0].id]["is_correct"])
+        self.assertFalse(result_data[self.questions[1].id]["is_correct"])
+        self.assertFalse(result_data[self.questions[2].id]["is_correct"])
+        self.assertEqual(result_data[self.questions[2].id]["correct_option"], 3)
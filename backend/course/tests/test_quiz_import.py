@@ -0,0 +1,109 @@
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from course.models import Course, CourseCategory, MCQQuestion, Module, Option, Quiz
+from course.services.quiz_grading_service import QuizGradingService
+from rest_framework import status
+from rest_framework.test import APITestCase
+from useraccount.models import RoleChoices, User
+
+
+def make_questions(count):
+    return [
+        {
+            "question_text": f"Question {i}",
+            "options": [f"Answer {i}.{order}" for order in range(1, 5)],
+            "correct_option_index": i % 4 + 1,
+        }
+        for i in range(count)
+    ]
+
+
+class QuizImportTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        category = CourseCategory.objects.create(name="Programming")
+        course = Course.objects.create(
+            category=category,
+            title="Python Basics",
+            description="Learn Python",
+            duration=120,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+        module = Module.objects.create(
+            course=course, title="Intro", description="", order=1
+        )
+        self.quiz = Quiz.objects.create(
+            module=module, title="Intro Quiz", total_questions=40, passing_score=20
+        )
+        self.url = reverse("quiz-import", args=[self.quiz.id])
+        self.admin = User.objects.create_user(
+            email="admin@example.com",
+            password="TestPassword@123",
+            full_name="Admin User",
+            contact_number="1000000000",
+            role=RoleChoices.ADMIN,
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_json_import_writes_in_bulk(self):
+        QuizGradingService.get_answer_key(self.quiz)  # warm the cache
+
+        # Savepoint, quiz lock, one INSERT for questions, one for options, release
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                self.url, {"questions": make_questions(40)}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 40)
+
+        self.assertEqual(MCQQuestion.objects.filter(quiz=self.quiz).count(), 40)
+        self.assertEqual(Option.objects.filter(question__quiz=self.quiz).count(), 160)
+        answer_key = QuizGradingService.get_answer_key(self.quiz)
+        question = MCQQuestion.objects.get(quiz=self.quiz, question_text="Question 5")
+        self.assertEqual(answer_key[question.id], (2, 2))
+
+    def test_csv_import_with_replace(self):
+        self.client.post(self.url, {"questions": make_questions(3)}, format="json")
+
+        rows = ["question_text,option_1,option_2,option_3,option_4,correct_option_index"]
+        rows += ["What is 2+2?,1,2,3,4,4", "Pick a list,(),[],{},'',2"]
+        upload = SimpleUploadedFile(
+            "quiz.csv", "\n".join(rows).encode(), content_type="text/csv"
+        )
+        response = self.client.post(
+            f"{self.url}?replace=true", {"file": upload}, format="multipart"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data["created"], response.data["replaced"]), (2, 3))
+
+        question = MCQQuestion.objects.get(quiz=self.quiz, question_text="Pick a list")
+        self.assertEqual(question.correct_option_index, 2)
+        self.assertEqual(
+            list(question.options.values_list("option_text", "is_correct")),
+            [("()", False), ("[]", True), ("{}", False), ("''", False)],
+        )
+
+    def test_invalid_set_writes_nothing(self):
+        questions = make_questions(5)
+        questions[3]["options"] = questions[3]["options"][:3]
+        questions[4]["question_text"] = "Question 0"
+
+        response = self.client.post(self.url, {"questions": questions}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(MCQQuestion.objects.filter(quiz=self.quiz).exists())
+
+    def test_students_cannot_import(self):
+        student = User.objects.create_user(
+            email="student@example.com",
+            password="TestPassword@123",
+            full_name="Student",
+            contact_number="1000000001",
+        )
+        self.client.force_authenticate(user=student)
+        response = self.client.post(
+            self.url, {"questions": make_questions(1)}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
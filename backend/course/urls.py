@@ -1,17 +1,22 @@
-from payment.controllers.views import CertificateDownloadView
+from payment.controllers.views import CertificateDownloadView, CourseCertificateExportView
 from course.controllers.views import (
     BannerdataListAPIView,
     CourseCategoryListView,
     CourseCreateUpdateAPIView,
     CourseDetailView,
     CourseEnrollmentModuleLessonView,
+    CourseFilterView,
     CourseListView,
+    CourseSearchView,
     EnrolledCourseQuizView,
     EnrollmentClassContentView,
     EnrollmentCourseLessonView,
     MCQQuestionAPIView,
+    QuizAttemptAnswersView,
+    QuizAttemptStartView,
     QuizCreateAPIView,
     QuizDeleteAPIView,
+    QuizImportAPIView,
     QuizListAPIView,
     QuizResultDetailView,
     QuizUpdateAPIView,
@@ -22,10 +27,13 @@ from django.urls import path
 urlpatterns = [
     # for courses
     path("", CourseListView.as_view(), name="course-list"),
+    path("search/", CourseSearchView.as_view(), name="course-search"),
+    path("filter/", CourseFilterView.as_view(), name="course-filter"),
     path("banner/", BannerdataListAPIView.as_view(), name="course-banner"),
     path("category/", CourseCategoryListView.as_view(), name="course-category"),
     path("create/", CourseCreateUpdateAPIView.as_view(), name="course-create"),
     path("certificate/download/<uuid:enrollment_id>/", CertificateDownloadView.as_view(), name="download-certificate"),
+    path("certificate/export/<slug:slug>/", CourseCertificateExportView.as_view(), name="export-certificates"),
      path('enrollments/<uuid:enrollment_id>/classes/', EnrollmentClassContentView.as_view(), name='enrollment-classes'),
     path(
         "update/<int:course_id>/",
@@ -37,7 +45,6 @@ urlpatterns = [
         CourseCreateUpdateAPIView.as_view(),
         name="delete-course",
     ),
-    path("<slug:slug>/", CourseDetailView.as_view(), name="course-detail"),
     # for enrollments
     path(
         "enrollments/<uuid:enrollment_id>/",
@@ -68,6 +75,16 @@ urlpatterns = [
         "enrollments/<uuid:enrollment_id>/modules/<str:module_id>/quizzes/",
         EnrolledCourseQuizView.as_view(),
         name="enrolled-course-module-quizzes",
+    ),
+    path(
+        "enrollments/<uuid:enrollment_id>/modules/<str:module_id>/quizzes/<int:quiz_id>/attempt/",
+        QuizAttemptStartView.as_view(),
+        name="quiz-attempt-start",
+    ),
+    path(
+        "quiz-attempts/<uuid:attempt_id>/answers/",
+        QuizAttemptAnswersView.as_view(),
+        name="quiz-attempt-answers",
     ),
      path(
         "enrollments/<uuid:enrollment_id>/modules/<str:module_id>/quiz-results/<str:quiz_result_id>/",
@@ -80,5 +97,10 @@ urlpatterns = [
     path(
         "quizzes/<int:quiz_id>/delete/", QuizDeleteAPIView.as_view(), name="quiz-delete"
     ),
+    path(
+        "quizzes/<int:quiz_id>/import/", QuizImportAPIView.as_view(), name="quiz-import"
+    ),
     path("quiz/submit/", SubmitQuiz.as_view(), name="submit_quiz"),
+    # catch-all slug route last, so it does not shadow "quizzes/"
+    path("<slug:slug>/", CourseDetailView.as_view(), name="course-detail"),
 ]
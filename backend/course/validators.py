@@ -0,0 +1,30 @@
+"""
+In-memory checks for quiz content, run on whole payloads before writing.
+The database constraints on Option and MCQQuestion back them up.
+"""
+from django.core.exceptions import ValidationError
+
+OPTIONS_PER_QUESTION = 4
+
+
+def validate_question_options(options, correct_option_index=None):
+    """
+    Check the full option set of one question: exactly four options ordered
+    1-4, exactly one of them correct and, when given, matching
+    `correct_option_index`. `options` is a sequence of (order, is_correct).
+    """
+    orders = sorted(order for order, _ in options)
+    if orders != list(range(1, OPTIONS_PER_QUESTION + 1)):
+        raise ValidationError(
+            f"Each question must have exactly {OPTIONS_PER_QUESTION} options, "
+            f"ordered 1 to {OPTIONS_PER_QUESTION}."
+        )
+
+    correct = [order for order, is_correct in options if is_correct]
+    if len(correct) != 1:
+        raise ValidationError("Each question must have exactly 1 correct option.")
+
+    if correct_option_index is not None and correct[0] != int(correct_option_index):
+        raise ValidationError(
+            "The correct option index does not match the correct option."
+        )
@@ -1,6 +1,8 @@
+from core.pagination import KeysetPagination, get_requested_fields
+from course.models import Course
 from course.services.course_service import CourseService
-from django.http import FileResponse, Http404
-from django.utils import timezone
+from django.forms import ValidationError
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from payment.models import Enrollment
 from payment.serializers import (
     CheckoutCourseSerilizers,
@@ -11,7 +13,8 @@ from payment.serializers import (
 )
 from payment.services.enrollment_service import EnrollmentService
 from payment.services.payment_service import PaymentService
-from payment.utils.certificate_generator import generate_certificate_pdf
+from payment.utils.certificate_export import iter_certificate_zip
+from payment.utils.certificate_store import get_or_render_certificate
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
@@ -52,6 +55,11 @@ class CheckoutView(APIView):
 
             # Create enrollment with 'pending' status
             enrollment = EnrollmentService.enroll_student(user, course)
+            if enrollment is None:
+                return Response(
+                    {"error": "No seats left for this course."},
+                    status=status.HTTP_409_CONFLICT,
+                )
 
             # Create payment record
             payment = PaymentService.process_payment(
@@ -108,9 +116,12 @@ class VerifyPaymentView(APIView):
                 {"error": "Payment record not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        updated_payment = PaymentService.update_payment_status(
-            transaction_id, status_value
-        )
+        try:
+            updated_payment = PaymentService.update_payment_status(
+                transaction_id, status_value
+            )
+        except ValidationError as e:
+            return Response({"error": e.message}, status=status.HTTP_409_CONFLICT)
 
         if updated_payment:
             # If payment status updated successfully and enrollment activated
@@ -125,9 +136,14 @@ class VerifyPaymentView(APIView):
         )
 
 
+class EnrollmentPagination(KeysetPagination):
+    ordering = ("-enrollment_date", "-id")
+    results_key = "enrollments"
+
+
 class EnrollmentListView(APIView):
     """
-    Retrieves all enrollments for the logged-in student.
+    Retrieves the logged-in student's enrollments, newest first, page by page.
     """
 
     permission_classes = [IsAuthenticated]
@@ -135,10 +151,21 @@ class EnrollmentListView(APIView):
 
     def get(self, request):
         student = request.user
-        enrollments = EnrollmentService.get_active_student_enrollments(student)
-        if enrollments:
-            serializer = EnrollmentListSerializer(enrollments, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+        pagination = EnrollmentPagination()
+        fields = get_requested_fields(request, EnrollmentListSerializer)
+        enrollments = EnrollmentService.get_active_student_enrollments(
+            student
+        ).select_related("course")
+        if fields:
+            enrollments = enrollments.only(
+                *EnrollmentListSerializer.get_only_fields(
+                    fields, extra=["id", "enrollment_date"]
+                )
+            )
+        page = pagination.paginate_queryset(enrollments, request)
+        if page or request.query_params.get(pagination.cursor_query_param):
+            serializer = EnrollmentListSerializer(page, many=True, fields=fields)
+            return pagination.get_paginated_response(serializer.data)
         return Response(
             {"message": "No active enrollment found"}, status=status.HTTP_404_NOT_FOUND
         )
@@ -149,7 +176,9 @@ class CertificateDownloadView(APIView):
 
     def get(self, request, enrollment_id):
         try:
-            enrollment = Enrollment.objects.get(id=enrollment_id, student=request.user)
+            enrollment = Enrollment.objects.select_related("student", "course").get(
+                id=enrollment_id, student=request.user
+            )
         except Enrollment.DoesNotExist:
             raise Http404("Enrollment not found")
 
@@ -160,15 +189,35 @@ class CertificateDownloadView(APIView):
             )
 
         # Update download tracking
-        enrollment.certificate_download_count += 1
-        if not enrollment.certificate_issue_date:
-            enrollment.certificate_issue_date = timezone.now()
-        enrollment.save()
+        EnrollmentService.record_certificate_download(enrollment)
 
-        # Generate PDF and return as inline
-        buffer = generate_certificate_pdf(enrollment)
+        # Stream the stored PDF (rendered on demand if it is not there yet)
+        path = get_or_render_certificate(enrollment)
         filename = f"certificate_{enrollment.course.slug}.pdf"
 
-        response = FileResponse(buffer, content_type="application/pdf")
+        response = FileResponse(open(path, "rb"), content_type="application/pdf")
         response["Content-Disposition"] = f'inline; filename="{filename}"'
         return response
+
+
+class CourseCertificateExportView(APIView):
+    """
+    Streams a ZIP of every issued certificate of a course (one batch).
+    The archive is written to the response as it is produced.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdminOrStaff]
+
+    def get(self, request, slug):
+        try:
+            course = CourseService.get_course_by_slug(slug)
+        except Course.DoesNotExist:
+            raise Http404("Course not found")
+
+        response = StreamingHttpResponse(
+            iter_certificate_zip(course), content_type="application/zip"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="certificates_{course.slug}.zip"'
+        )
+        return response
@@ -0,0 +1,101 @@
+"""
+Django command to benchmark certificate rendering (throughput and peak RSS).
+"""
+import multiprocessing
+import os
+import resource
+import time
+from io import BytesIO
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.timezone import localtime
+from payment.utils.certificate_generator import generate_certificate_pdf
+from PIL import Image
+from reportlab.lib.colors import HexColor, white
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+
+def generate_per_call(enrollment):
+    """The previous generator: opens and re-encodes the background every call."""
+    buffer = BytesIO()
+    background_path = os.path.join(
+        settings.BASE_DIR, "static", "certificate", "certificate.png"
+    )
+    with Image.open(background_path) as img:
+        width_pt, height_pt = img.size
+
+    p = canvas.Canvas(buffer, pagesize=(width_pt, height_pt))
+    p.drawImage(ImageReader(background_path), 0, 0, width=width_pt, height=height_pt)
+    center_x = width_pt / 2
+    p.setFont("Courier-Bold", 50)
+    p.setFillColor(HexColor("#2D3748"))
+    p.drawCentredString(center_x, 660, f"{enrollment.student.full_name}")
+    p.setFont("Helvetica", 35)
+    p.setFillColor(HexColor("#4A5568"))
+    p.drawCentredString(center_x, 610, "for successfully completing the course")
+    p.setFont("Helvetica-Bold", 50)
+    p.setFillColor(HexColor("#1A202C"))
+    p.drawCentredString(center_x, 560, f"{enrollment.course.title}")
+    formatted_date = localtime(enrollment.certificate_issue_date).strftime(
+        "On %B %d, %Y, %I:%M %p"
+    )
+    p.setFont("Helvetica", 30)
+    p.setFillColor(HexColor("#2D3748"))
+    p.drawCentredString(center_x, 490, f"{formatted_date} | ID: {enrollment.id}")
+    p.setFont("Helvetica-Oblique", 20)
+    p.setFillColor(white)
+    p.drawCentredString(center_x, 20, "This certificate is generated by Shiko LMS")
+    p.showPage()
+    p.save()
+    buffer.seek(0)
+    return buffer
+
+
+GENERATORS = {
+    "per-call": generate_per_call,
+    "shared-template": generate_certificate_pdf,
+}
+
+
+def run(label, count):
+    """Render `count` certificates in this (fresh) process; return rate and peak RSS."""
+    generator = GENERATORS[label]
+    enrollments = [
+        SimpleNamespace(
+            id=f"00000000-0000-0000-0000-{i:012d}",
+            student=SimpleNamespace(full_name=f"Student {i}"),
+            course=SimpleNamespace(title="Benchmark Course"),
+            certificate_issue_date=timezone.now(),
+        )
+        for i in range(count)
+    ]
+    start = time.perf_counter()
+    for enrollment in enrollments:
+        generator(enrollment)
+    elapsed = time.perf_counter() - start
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return count / elapsed, peak_rss_kb
+
+
+class Command(BaseCommand):
+    """Compare the per-call generator with the shared certificate template."""
+
+    help = "Benchmark certificates per second and peak RSS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=50)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        # Each variant runs in its own process so peak RSS is not shared
+        context = multiprocessing.get_context("fork")
+        for label in GENERATORS:
+            with context.Pool(1) as pool:
+                rate, peak_rss_kb = pool.apply(run, (label, options["count"]))
+            self.stdout.write(
+                f"{label:<16} {rate:8.1f} certificates/s  peak RSS={peak_rss_kb / 1024:.1f}MB"
+            )
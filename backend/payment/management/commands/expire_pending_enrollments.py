@@ -0,0 +1,80 @@
+"""
+Django command to cancel expired pending enrollments and release their seats.
+"""
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+from payment.repositories.enrollment_repository import EnrollmentRepository
+
+
+class Command(BaseCommand):
+    """
+    Reaper for enrollments left pending past PENDING_ENROLLMENT_TTL. Expired
+    rows are read in index-ordered batches; each course of a batch is then
+    handled in its own short transaction (one UPDATE for the enrollments,
+    one for the seats). Run it from cron, or with --interval as a worker.
+    """
+
+    help = "Cancel pending enrollments whose payment window has expired."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--interval", type=float, default=None,
+            help="Keep running, sweeping every N seconds.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        while True:
+            close_old_connections()
+            self.sweep(options["batch_size"])
+            if options["interval"] is None:
+                break
+            time.sleep(options["interval"])
+
+    def sweep(self, batch_size):
+        cutoff = timezone.now() - settings.PENDING_ENROLLMENT_TTL
+        start = time.perf_counter()
+        scanned = released = batches = 0
+        courses = set()
+        longest_transaction_ms = 0.0
+        after = None
+
+        while True:
+            batch = EnrollmentRepository.get_expired_pending(
+                batch_size, after=after, cutoff=cutoff
+            )
+            if not batch:
+                break
+            batches += 1
+            scanned += len(batch)
+            after = batch[-1][:2]
+
+            by_course = defaultdict(list)
+            for _, enrollment_id, course_id in batch:
+                by_course[course_id].append(enrollment_id)
+
+            for course_id, enrollment_ids in by_course.items():
+                tx_start = time.perf_counter()
+                count = EnrollmentRepository.release_expired_pending(
+                    course_id, enrollment_ids, cutoff=cutoff
+                )
+                longest_transaction_ms = max(
+                    longest_transaction_ms, (time.perf_counter() - tx_start) * 1000
+                )
+                if count:
+                    released += count
+                    courses.add(course_id)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"Scanned {scanned} expired enrollment(s) in {batches} batch(es), "
+            f"cancelled {released} and released their seats in {len(courses)} course(s) "
+            f"in {elapsed:.2f}s ({scanned / elapsed if elapsed else 0:.0f} rows/s, "
+            f"longest transaction {longest_transaction_ms:.1f}ms)."
+        )
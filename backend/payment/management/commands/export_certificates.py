@@ -0,0 +1,47 @@
+"""
+Django command to export a course's issued certificates as a ZIP archive.
+"""
+import sys
+
+from course.models import Course
+from django.core.management.base import BaseCommand, CommandError
+from payment.utils.certificate_export import iter_certificate_zip
+
+
+class Command(BaseCommand):
+    """Write the certificate ZIP of a course to a file (or stdout)."""
+
+    help = "Export every issued certificate of a course as a ZIP archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument("slug", help="Slug of the course (batch) to export.")
+        parser.add_argument(
+            "--output", "-o", default=None,
+            help="Archive path; defaults to certificates_<slug>.zip, '-' for stdout.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=None,
+            help="Rendering processes (defaults to CERTIFICATE_EXPORT_WORKERS).",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        try:
+            course = Course.objects.get(slug=options["slug"])
+        except Course.DoesNotExist:
+            raise CommandError(f"Course '{options['slug']}' does not exist.")
+
+        output = options["output"] or f"certificates_{course.slug}.zip"
+        chunks = iter_certificate_zip(course, workers=options["workers"])
+        if output == "-":
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+
+        size = 0
+        with open(output, "wb") as archive:
+            for chunk in chunks:
+                archive.write(chunk)
+                size += len(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {output} ({size} bytes)."))
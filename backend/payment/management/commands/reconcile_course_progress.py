@@ -0,0 +1,39 @@
+"""
+Django command to repair drifted quiz counters and enrollment progress.
+"""
+import time
+
+from course.models import Course
+from course.repositories.course_repository import CourseRepository
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from payment.repositories.enrollment_repository import EnrollmentRepository
+
+
+class Command(BaseCommand):
+    """
+    Progress is kept incrementally (Course.total_quiz_count and
+    Enrollment.completed_quiz_count), so edits that bypass the quiz flow,
+    such as a quiz moved to another course or progress rows changed by
+    hand, can leave the counters behind. This recounts them in bulk, one
+    UPDATE per course, and issues the certificates that became due.
+    """
+
+    help = "Recount course quiz totals and enrollment progress, fixing any drift."
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        start = time.perf_counter()
+        courses_fixed = len(CourseRepository.reconcile_total_quiz_counts())
+
+        enrollments_fixed = certificates = 0
+        for course in Course.objects.only("id", "total_quiz_count").iterator():
+            with transaction.atomic():
+                enrollments_fixed += EnrollmentRepository.reconcile_progress(course)
+                certificates += EnrollmentRepository.issue_completed_certificates(course)
+
+        self.stdout.write(
+            f"Fixed the quiz count of {courses_fixed} course(s) and the progress of "
+            f"{enrollments_fixed} enrollment(s), issued {certificates} certificate(s) "
+            f"in {time.perf_counter() - start:.2f}s."
+        )
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.5 on 2026-10-18 20:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0022_bannerdata'),
+        ('payment', '0004_enrollment_certificate_download_count_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['status', 'payment_status', 'enrollment_date'], name='enrollment_pending_idx'),
+        ),
+    ]
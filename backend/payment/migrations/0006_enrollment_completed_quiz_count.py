@@ -0,0 +1,40 @@
+# Generated by Django 5.1.5 on 2026-10-18 20:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_completed_quizzes(apps, schema_editor):
+    Enrollment = apps.get_model("payment", "Enrollment")
+    StudentProgress = apps.get_model("course", "StudentProgress")
+    completed_count = (
+        StudentProgress.objects.filter(
+            student=OuterRef("student_id"),
+            quiz__module__course=OuterRef("course_id"),
+            completed=True,
+        )
+        .values("student")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Enrollment.objects.update(
+        completed_quiz_count=Coalesce(Subquery(completed_count), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0023_course_total_quiz_count'),
+        ('payment', '0005_enrollment_pending_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_quiz_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_completed_quizzes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.5 on 2026-10-18 20:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0025_hot_query_indexes'),
+        ('payment', '0006_enrollment_completed_quiz_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', 'course', 'status'], name='enrollment_student_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', 'payment_status', 'status'], name='enrollment_student_paid_idx'),
+        ),
+    ]
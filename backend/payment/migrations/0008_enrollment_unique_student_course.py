@@ -0,0 +1,60 @@
+# Generated by Django 5.1.5 on 2026-10-18 21:55
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def remove_duplicate_enrollments(apps, schema_editor):
+    """
+    Keep one enrollment per student and course: the paid one, else the
+    furthest along, else the latest. The seats held by the removed
+    (not cancelled) duplicates go back to their course.
+    """
+    Course = apps.get_model("course", "Course")
+    Enrollment = apps.get_model("payment", "Enrollment")
+    duplicated = (
+        Enrollment.objects.values("student_id", "course_id")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for pair in duplicated.iterator():
+        enrollments = sorted(
+            Enrollment.objects.filter(
+                student_id=pair["student_id"], course_id=pair["course_id"]
+            ),
+            key=lambda enrollment: (
+                enrollment.payment_status == "success",
+                enrollment.status != "cancelled",
+                enrollment.completed_quiz_count,
+                enrollment.enrollment_date,
+            ),
+        )
+        removed = enrollments[:-1]
+        seats = sum(enrollment.status != "cancelled" for enrollment in removed)
+        Enrollment.objects.filter(id__in=[enrollment.id for enrollment in removed]).delete()
+        if seats:
+            Course.objects.filter(id=pair["course_id"]).update(
+                remaining_seat=F("remaining_seat") + seats
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0027_quiz_attempt'),
+        ('payment', '0007_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_enrollments, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='enrollment',
+            constraint=models.UniqueConstraint(fields=('student', 'course'), name='enrollment_unique_student_course'),
+        ),
+        migrations.RemoveIndex(
+            model_name='enrollment',
+            name='enrollment_student_course_idx',
+        ),
+    ]
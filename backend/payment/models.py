@@ -37,6 +37,8 @@ class Enrollment(models.Model):
     )
     enrollment_date = models.DateTimeField(auto_now_add=True)
     progress = models.IntegerField(default=0)  # Store as percentage
+    # Quizzes of the course the student has completed; drives `progress`
+    completed_quiz_count = models.PositiveIntegerField(default=0, editable=False)
     status = models.CharField(
         max_length=20,
         choices=EnrollmentStatus.choices,
@@ -50,6 +52,28 @@ class Enrollment(models.Model):
     certificate_issue_date = models.DateTimeField(null=True, blank=True)
     certificate_download_count = models.PositiveIntegerField(default=0)
 
+    class Meta:
+        indexes = [
+            # A student's paid enrollments (EntitlementService)
+            models.Index(
+                fields=["student", "payment_status", "status"],
+                name="enrollment_student_paid_idx",
+            ),
+            # Expired pending enrollments, oldest first (expire_pending_enrollments)
+            models.Index(
+                fields=["status", "payment_status", "enrollment_date"],
+                name="enrollment_pending_idx",
+            ),
+        ]
+        constraints = [
+            # One enrollment per student and course, so a double-submitted
+            # checkout cannot take two seats; its index also serves the lookup
+            # of a student's enrollment in a course (checkout, progress)
+            models.UniqueConstraint(
+                fields=["student", "course"], name="enrollment_unique_student_course"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.student.full_name} - {self.course.title} - {self.status}"
 
@@ -1,30 +1,162 @@
+from django.conf import settings
 from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Floor, Least
 from django.forms import ValidationError
 from django.utils.timezone import now
-from course.models import StudentProgress
-from payment.models import Enrollment
+from course.models import Course, StudentProgress
+from payment.models import Enrollment, Payment
+from payment.services.entitlement_service import EntitlementService
+from payment.utils.certificate_store import schedule_certificate_render
 from django.utils import timezone
 
 
 class EnrollmentRepository:
     """Handles database operations for Enrollment"""
 
+    @staticmethod
+    def reserve_seat(course_id):
+        """
+        Take one seat with a conditional UPDATE of `remaining_seat`.
+        Returns False when the course is sold out.
+        """
+        seat = Course.objects.filter(id=course_id)
+        if seat.filter(remaining_seat__gt=1).update(remaining_seat=F("remaining_seat") - 1):
+            return True
+        # Maybe the last seat: taking it sells the course out
+        if seat.filter(remaining_seat__gt=0).update(remaining_seat=F("remaining_seat") - 1):
+            EnrollmentRepository._availability_changed()
+            return True
+        return False
+
+    @staticmethod
+    def release_seats(course_id, count=1):
+        """Give `count` seats back to a course."""
+        if count:
+            seats = Course.objects.filter(id=course_id)
+            if not seats.filter(remaining_seat__gt=0).update(
+                remaining_seat=F("remaining_seat") + count
+            ):
+                # Sold out until now: the course becomes available again
+                seats.update(remaining_seat=F("remaining_seat") + count)
+                EnrollmentRepository._availability_changed()
+            EnrollmentRepository._seats_changed(course_id)
+
+    @staticmethod
+    def _seats_changed(course_id):
+        """.update() skips the Course signals: invalidate the course's catalog entries."""
+        from course.services.catalog_service import CatalogService
+
+        CatalogService.course_seats_changed(course_id)
+
+    @staticmethod
+    def _availability_changed():
+        """A course sold out or got seats back: its `available` facet bucket moved."""
+        from course.services.catalog_service import CatalogService
+
+        CatalogService.invalidate_facets()
+
+    @staticmethod
+    def reserve_seat_or_reclaim(course_id):
+        """Reserve a seat, reclaiming seats held by expired pending enrollments if sold out."""
+        if EnrollmentRepository.reserve_seat(course_id):
+            return True
+        if EnrollmentRepository.release_expired_pending(course_id):
+            return EnrollmentRepository.reserve_seat(course_id)
+        return False
+
+    @staticmethod
+    def get_expired_pending_filter(cutoff=None):
+        """Pending, unpaid enrollments whose payment window ended before `cutoff`."""
+        cutoff = cutoff or timezone.now() - settings.PENDING_ENROLLMENT_TTL
+        return Q(status="pending", payment_status="pending", enrollment_date__lt=cutoff)
+
+    @staticmethod
+    def get_expired_pending(batch_size, after=None, cutoff=None):
+        """
+        One batch of (enrollment_date, id, course_id) for expired pending
+        enrollments, oldest first, after the (enrollment_date, id) keyset
+        `after`. Served by the (status, payment_status, enrollment_date) index.
+        """
+        expired = Enrollment.objects.filter(
+            EnrollmentRepository.get_expired_pending_filter(cutoff)
+        )
+        if after is not None:
+            enrollment_date, enrollment_id = after
+            expired = expired.filter(
+                Q(enrollment_date__gt=enrollment_date)
+                | Q(enrollment_date=enrollment_date, id__gt=enrollment_id)
+            )
+        return list(
+            expired.order_by("enrollment_date", "id").values_list(
+                "enrollment_date", "id", "course_id"
+            )[:batch_size]
+        )
+
+    @staticmethod
+    def release_expired_pending(course_id, enrollment_ids=None, cutoff=None):
+        """
+        Cancel expired pending enrollments of a course (optionally only the
+        given ids), fail their pending payments and release their seats with
+        one UPDATE. Rows locked by a concurrent caller are skipped, so a seat
+        is never released twice. Returns the number of seats released.
+        """
+        expired = Enrollment.objects.filter(
+            EnrollmentRepository.get_expired_pending_filter(cutoff),
+            course_id=course_id,
+        )
+        if enrollment_ids is not None:
+            expired = expired.filter(id__in=enrollment_ids)
+
+        with transaction.atomic():
+            ids = list(
+                expired.select_for_update(skip_locked=True).values_list("id", flat=True)
+            )
+            if not ids:
+                return 0
+            released = Enrollment.objects.filter(id__in=ids).update(status="cancelled")
+            Payment.objects.filter(enrollment_id__in=ids, status="pending").update(
+                status="failed"
+            )
+            EnrollmentRepository.release_seats(course_id, released)
+        return released
+
     @staticmethod
     @transaction.atomic
     def create_enrollment(student, course):
-        """Creates an enrollment if it does not already exist abd decreses available seats"""
+        """Creates an enrollment if it does not already exist and reserves a seat"""
+        if not EnrollmentRepository.reserve_seat_or_reclaim(course.id):
+            return None
         try:
-            if course.remaining_seat <= 0:
-                return None
-            enrollment, created = Enrollment.objects.get_or_create(
-                student=student, course=course
-            )
-            if created:
-                course.remaining_seat -= 1
-                course.save()
-            return enrollment
+            with transaction.atomic():
+                enrollment, created = Enrollment.objects.get_or_create(
+                    student=student, course=course
+                )
         except IntegrityError:
+            # A concurrent checkout of the same student created it first
+            enrollment, created = EnrollmentRepository.get_enrollment(student, course), False
+        if not created:
+            # Someone else created it: hand the seat back
+            EnrollmentRepository.release_seats(course.id)
+            return enrollment
+        EnrollmentRepository._seats_changed(course.id)
+        return enrollment
+
+    @staticmethod
+    @transaction.atomic
+    def reopen_enrollment(enrollment):
+        """Put a cancelled enrollment back to pending with a newly reserved seat"""
+        if not EnrollmentRepository.reserve_seat_or_reclaim(enrollment.course_id):
             return None
+        reopened = Enrollment.objects.filter(id=enrollment.id, status="cancelled").update(
+            status="pending", payment_status="pending", enrollment_date=timezone.now()
+        )
+        if not reopened:
+            EnrollmentRepository.release_seats(enrollment.course_id)
+        else:
+            EnrollmentRepository._seats_changed(enrollment.course_id)
+        enrollment.refresh_from_db()
+        return enrollment
 
     @staticmethod
     def get_enrollment_by_id(enrollment_id):
@@ -36,6 +168,15 @@ class EnrollmentRepository:
         """Fetch an enrollment for a student in a specific course"""
         return Enrollment.objects.filter(student=student, course=course).first()
 
+    @staticmethod
+    def get_payment_status(student, course_id):
+        """Payment status of a student's enrollment in a course, or None"""
+        return (
+            Enrollment.objects.filter(student=student, course_id=course_id)
+            .values_list("payment_status", flat=True)
+            .first()
+        )
+
     @staticmethod
     def get_enrollments_by_student(student):
         """Fetch all enrollments for a given student"""
@@ -51,6 +192,19 @@ class EnrollmentRepository:
         """Fetch all enrollments for a given course"""
         return Enrollment.objects.filter(course=course)
 
+    @staticmethod
+    def get_issued_certificates(course):
+        """
+        Stream (id, student name, issue date) for every issued certificate
+        of a course, without building model instances.
+        """
+        return (
+            Enrollment.objects.filter(course=course, certificate_issued=True)
+            .order_by("enrollment_date", "id")
+            .values_list("id", "student__full_name", "certificate_issue_date")
+            .iterator(chunk_size=500)
+        )
+
     @staticmethod
     def get_enrollment_by_id_and_student(enrollment_id, student):
         try:
@@ -66,11 +220,16 @@ class EnrollmentRepository:
         enrollment = EnrollmentRepository.get_enrollment_by_id(enrollment_id)
         if enrollment:
             enrollment.progress = progress
+            issued = progress == 100 and not enrollment.certificate_issued
             if progress == 100:
                 enrollment.status = "completed"
                 enrollment.completion_date = now()
                 enrollment.certificate_issued = True
+            if issued:
+                enrollment.certificate_issue_date = now()
             enrollment.save()
+            if issued:
+                schedule_certificate_render(enrollment.id)
             return enrollment
         return None
 
@@ -81,6 +240,7 @@ class EnrollmentRepository:
         if enrollment:
             enrollment.status = status
             enrollment.save()
+            EntitlementService.invalidate(enrollment.student_id)
             return enrollment
         return None
 
@@ -93,6 +253,7 @@ class EnrollmentRepository:
             if payment_status == "completed":
                 enrollment.status = "active"  # Auto-activate on successful payment
             enrollment.save()
+            EntitlementService.invalidate(enrollment.student_id)
             return enrollment
         return None
 
@@ -102,6 +263,7 @@ class EnrollmentRepository:
         enrollment = EnrollmentRepository.get_enrollment_by_id(enrollment_id)
         if enrollment:
             enrollment.delete()
+            EntitlementService.invalidate(enrollment.student_id)
             return True
         return False
 
@@ -109,48 +271,132 @@ class EnrollmentRepository:
     @transaction.atomic
     def cancel_enrollment(enrollment):
         """Cancels enrollment and restores a seat"""
-        if enrollment.status != "cancelled":
-            enrollment.status = "cancelled"
-            enrollment.save()
+        # Conditional update: a concurrent cancel can't restore the seat twice
+        cancelled = (
+            Enrollment.objects.filter(id=enrollment.id)
+            .exclude(status="cancelled")
+            .update(status="cancelled")
+        )
+        enrollment.status = "cancelled"
+        if cancelled:
+            EntitlementService.invalidate(enrollment.student_id)
 
             # Restore the seat
-            course = enrollment.course
-            course.remaining_seat += 1
-            course.save()
+            EnrollmentRepository.release_seats(enrollment.course_id)
 
         return enrollment
 
     @staticmethod
-    def update_enrollment_progress(course, student):
+    def progress_expression(completed, total_quizzes):
+        """Progress percentage for `completed` of `total_quizzes`, rounded down."""
+        if not total_quizzes:
+            return Value(0)
+        percentage = Floor(completed * 100 / total_quizzes, output_field=IntegerField())
+        return Least(percentage, Value(100))
 
-        
-        enrollment = Enrollment.objects.filter(student=student, course=course).first()
-        if not enrollment:
+    @staticmethod
+    def update_enrollment_progress(course, student):
+        """
+        Count one more completed quiz for the student's enrollment with a
+        single UPDATE, then issue the certificate once every quiz of the
+        course is done. Call it only when the quiz was newly completed.
+        """
+        completed = F("completed_quiz_count") + 1
+        # `progress` comes first: MySQL applies SET assignments left to right
+        updated = Enrollment.objects.filter(student=student, course=course).update(
+            progress=EnrollmentRepository.progress_expression(
+                completed, course.total_quiz_count
+            ),
+            completed_quiz_count=completed,
+        )
+        if not updated:
             raise ValidationError("Enrollment not found.")
 
-        # Total quizzes across all modules in the course
-        total_quizzes = course.modules.filter(quiz__isnull=False).count()
-
-        # Completed quizzes for the student in this course
-        completed_quizzes = StudentProgress.objects.filter(
-            student=student,
-            quiz__module__course=course,
-            completed=True
-        ).count()
+        EnrollmentRepository.issue_completed_certificates(
+            course, Q(student=student)
+        )
 
-        # Calculate progress percentage
-        progress_percentage = (
-            (completed_quizzes / total_quizzes) * 100 if total_quizzes > 0 else 0
+    @staticmethod
+    def issue_completed_certificates(course, condition=Q()):
+        """
+        Complete the enrollments (matching `condition`) that finished every
+        quiz of the course, and render their certificates after commit.
+        Returns the number of certificates issued.
+        """
+        if not course.total_quiz_count:
+            return 0
+        enrollment_ids = list(
+            Enrollment.objects.filter(
+                condition,
+                course=course,
+                certificate_issued=False,
+                completed_quiz_count__gte=course.total_quiz_count,
+            ).values_list("id", flat=True)
         )
+        if not enrollment_ids:
+            return 0
 
-        # Update Enrollment progress
-        enrollment.progress = int(progress_percentage)
+        issued_at = timezone.now()
+        Enrollment.objects.filter(id__in=enrollment_ids).update(
+            status="completed",
+            certificate_issued=True,
+            completion_date=issued_at,
+            certificate_issue_date=issued_at,
+        )
+        # Render each certificate once, in the background, after commit
+        for enrollment_id in enrollment_ids:
+            schedule_certificate_render(enrollment_id)
+        return len(enrollment_ids)
 
-        # Check if all quizzes are completed
-        if progress_percentage == 100:
-            enrollment.status = "completed"
-            enrollment.certificate_issued = True
-            enrollment.completion_date = timezone.now()
+    @staticmethod
+    def reconcile_progress(course):
+        """
+        Recount the completed quizzes of every enrollment in a course and fix
+        the counters and progress that drifted, in one UPDATE. Returns the
+        number of corrected enrollments.
+        """
+        completed = Coalesce(
+            Subquery(
+                StudentProgress.objects.filter(
+                    student=OuterRef("student_id"),
+                    quiz__module__course=course,
+                    completed=True,
+                )
+                .values("student")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+        progress = EnrollmentRepository.progress_expression(
+            completed, course.total_quiz_count
+        )
+        drifted = list(
+            Enrollment.objects.filter(course=course)
+            .annotate(actual_completed=completed, actual_progress=progress)
+            .filter(
+                ~Q(completed_quiz_count=F("actual_completed"))
+                | ~Q(progress=F("actual_progress"))
+            )
+            .values_list("id", flat=True)
+        )
+        if drifted:
+            Enrollment.objects.filter(id__in=drifted).update(
+                progress=progress, completed_quiz_count=completed
+            )
+        return len(drifted)
 
-        # Save the updated enrollment
-        enrollment.save()
\ No newline at end of file
+    @staticmethod
+    def record_certificate_download(enrollment):
+        """
+        Count a certificate download without a read-modify-write race, and
+        stamp the issue date of certificates issued before it was recorded.
+        """
+        Enrollment.objects.filter(id=enrollment.id).update(
+            certificate_download_count=F("certificate_download_count") + 1
+        )
+        if not enrollment.certificate_issue_date:
+            Enrollment.objects.filter(
+                id=enrollment.id, certificate_issue_date__isnull=True
+            ).update(certificate_issue_date=timezone.now())
+            enrollment.refresh_from_db(fields=["certificate_issue_date"])
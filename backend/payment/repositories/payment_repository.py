@@ -1,5 +1,8 @@
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.forms import ValidationError
 from payment.models import Payment
+from payment.repositories.enrollment_repository import EnrollmentRepository
+from payment.services.entitlement_service import EntitlementService
 
 
 class PaymentRepository:
@@ -9,17 +12,26 @@ class PaymentRepository:
     def create_payment(
         enrollment, amount, payment_method, transaction_id, status="pending"
     ):
-        """Creates a new payment record, ensuring a single payment per enrollment"""
+        """
+        Creates the payment of an enrollment, ensuring a single payment per
+        enrollment. An unpaid one left from an earlier checkout (e.g. failed
+        when the enrollment expired) is reset to the new transaction.
+        """
+        fields = {
+            "amount": amount,
+            "payment_method": payment_method,
+            "transaction_id": transaction_id,
+            "status": status,
+        }
         try:
             payment, created = Payment.objects.get_or_create(
-                enrollment=enrollment,
-                defaults={
-                    "amount": amount,
-                    "payment_method": payment_method,
-                    "transaction_id": transaction_id,
-                    "status": status,
-                },
+                enrollment=enrollment, defaults=fields
             )
+            if not created and payment.status != "success":
+                for name, value in fields.items():
+                    setattr(payment, name, value)
+                with transaction.atomic():
+                    payment.save(update_fields=list(fields))
             return payment
         except IntegrityError:
             return None
@@ -40,19 +52,38 @@ class PaymentRepository:
         return Payment.objects.filter(enrollment__student=student, status="success")
 
     @staticmethod
+    @transaction.atomic
     def update_payment_status(transaction_id, status):
-        """Updates payment status and automatically activates enrollment if successful"""
-        payment = PaymentRepository.get_payment_by_transaction_id(transaction_id)
+        """
+        Updates payment status and automatically activates enrollment if
+        successful. An enrollment cancelled meanwhile (its payment window
+        expired and its seat was released) must take a seat again; raises
+        ValidationError when the course has none left.
+        """
+        payment = (
+            Payment.objects.select_for_update()
+            .select_related("enrollment")
+            .filter(transaction_id=transaction_id)
+            .first()
+        )
         if payment:
+            enrollment = payment.enrollment
+            if status == "success" and enrollment.status == "cancelled":
+                if not EnrollmentRepository.reserve_seat(enrollment.course_id):
+                    raise ValidationError(
+                        "The enrollment expired and the course has no seats left."
+                    )
+                EnrollmentRepository._seats_changed(enrollment.course_id)
+
             payment.status = status
             payment.save()
 
             if status == "success":
                 # Auto-activate enrollment
-                enrollment = payment.enrollment
                 enrollment.status = "active"
                 enrollment.payment_status = "success"
                 enrollment.save()
+                EntitlementService.invalidate(enrollment.student_id)
 
             return payment
         return None
@@ -1,3 +1,4 @@
+from core.pagination import FieldProjectionMixin
 from course.models import Course
 from course.services.course_service import CourseService
 from payment.models import Enrollment, Payment, PaymentMethod, PaymentStatus
@@ -87,7 +88,7 @@ class VerifyPaymentSerializer(serializers.ModelSerializer):
         return value
 
 
-class EnrollmentListSerializer(serializers.ModelSerializer):
+class EnrollmentListSerializer(FieldProjectionMixin, serializers.ModelSerializer):
     course_title = serializers.CharField(source="course.title")  # Title of the course
     course_slug = serializers.CharField(
         source="course.slug"
@@ -96,6 +97,13 @@ class EnrollmentListSerializer(serializers.ModelSerializer):
     batch = serializers.CharField(source="course.batch")
     progress = serializers.IntegerField()
 
+    projection_sources = {
+        "course_title": ["course", "course__title"],
+        "course_slug": ["course", "course__slug"],
+        "course_image_url": ["course", "course__course_picture"],
+        "batch": ["course", "course__batch"],
+    }
+
     class Meta:
         model = Enrollment
         fields = [
@@ -1,3 +1,4 @@
+from django.db import transaction
 from payment.models import Enrollment
 from course.repositories.course_repository import CourseRepository
 from payment.repositories.enrollment_repository import EnrollmentRepository
@@ -8,10 +9,13 @@ class EnrollmentService:
 
     @staticmethod
     def enroll_student(student, course):
-        """Enrolls a student in a course if not already enrolled"""
+        """Enrolls a student in a course if not already enrolled; None when sold out"""
         enrollment = EnrollmentRepository.get_enrollment(student, course)
         if not enrollment:
             enrollment = EnrollmentRepository.create_enrollment(student, course)
+        elif enrollment.status == "cancelled":
+            # e.g. the payment window expired: it needs a seat again
+            enrollment = EnrollmentRepository.reopen_enrollment(enrollment)
         return enrollment
 
     @staticmethod
@@ -20,19 +24,24 @@ class EnrollmentService:
         return EnrollmentRepository.get_enrollment_by_id(enrollment_id)
 
     @staticmethod
-    def get_enrolled_course(enrollment_id, student):
-        # Fetch the enrollment
+    def get_enrollment_with_course_content(enrollment_id, student):
+        """
+        Fetch a student's enrollment with its course, modules, quizzes and
+        ordered lessons loaded in a fixed number of queries.
+        """
         enrollment = EnrollmentRepository.get_enrollment_by_id_and_student(
             enrollment_id, student
         )
         if not enrollment:
             return None
 
-        # Fetch the course with its related modules and lessons
-        course = CourseRepository.get_course_with_modules_and_lessons(
-            enrollment.course.id
-        )
-        return course
+        CourseRepository.prefetch_modules_and_lessons(enrollment.course)
+        return enrollment
+
+    @staticmethod
+    def get_enrollment_status(student, course_id):
+        """Retrieves the payment status of a student's enrollment in a course"""
+        return EnrollmentRepository.get_payment_status(student, course_id)
 
     @staticmethod
     def get_student_enrollments(student):
@@ -49,11 +58,21 @@ class EnrollmentService:
         """Retrieves all enrollments for a course"""
         return EnrollmentRepository.get_enrollments_by_course(course)
 
+    @staticmethod
+    def get_issued_certificates(course):
+        """Retrieves the issued certificates of a course"""
+        return EnrollmentRepository.get_issued_certificates(course)
+
     @staticmethod
     def update_student_progress(enrollment_id, progress):
         """Updates the student's progress and issues a certificate if completed"""
         return EnrollmentRepository.update_progress(enrollment_id, progress)
 
+    @staticmethod
+    def record_certificate_download(enrollment):
+        """Counts a certificate download"""
+        return EnrollmentRepository.record_certificate_download(enrollment)
+
     @staticmethod
     def change_enrollment_status(enrollment_id, status):
         """Updates the status of an enrollment"""
@@ -80,4 +99,19 @@ class EnrollmentService:
             # Update enrollment progress
             EnrollmentRepository.update_enrollment_progress(student=student, course=course)
         except Enrollment.DoesNotExist:
-            raise ValueError("Student is not enrolled in this course.")
\ No newline at end of file
+            raise ValueError("Student is not enrolled in this course.")
+
+    @staticmethod
+    def reconcile_course_progress(course_id):
+        """
+        Recount the progress of a course's enrollments after quizzes were
+        added or removed, and issue the certificates that became due.
+        Returns the number of corrected enrollments (0 if the course is gone).
+        """
+        course = CourseRepository.get_courses_in_bulk([course_id]).get(course_id)
+        if course is None:
+            return 0
+        with transaction.atomic():
+            fixed = EnrollmentRepository.reconcile_progress(course)
+            EnrollmentRepository.issue_completed_certificates(course)
+        return fixed
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from payment.models import Enrollment
+
+
+class EntitlementService:
+    """
+    The ids of the enrollments a student has paid for, cached per user for a
+    short time and memoized on the request, so the permission check and the
+    view share one lookup (and usually no query at all).
+    """
+
+    @staticmethod
+    def _key(user_id):
+        return f"payment:entitlements:{user_id}"
+
+    @staticmethod
+    def get_enrollment_ids(user):
+        """Load the set of entitled enrollment ids (as str) from cache or DB."""
+        key = EntitlementService._key(user.id)
+        enrollment_ids = cache.get(key)
+        if enrollment_ids is None:
+            enrollment_ids = {
+                str(enrollment_id)
+                for enrollment_id in Enrollment.objects.filter(
+                    student=user, payment_status="success"
+                )
+                .exclude(status="cancelled")
+                .values_list("id", flat=True)
+            }
+            cache.set(key, enrollment_ids, timeout=settings.ENTITLEMENT_CACHE_TTL)
+        return enrollment_ids
+
+    @staticmethod
+    def is_entitled(request, enrollment_id):
+        """Whether the request's user has a paid, active enrollment with this id."""
+        enrollment_ids = getattr(request, "_entitled_enrollment_ids", None)
+        if enrollment_ids is None:
+            enrollment_ids = EntitlementService.get_enrollment_ids(request.user)
+            request._entitled_enrollment_ids = enrollment_ids
+        return str(enrollment_id) in enrollment_ids
+
+    @staticmethod
+    def invalidate(user_id):
+        """Drop a user's cached entitlements once the current transaction commits."""
+        key = EntitlementService._key(user_id)
+        cache.delete(key)
+        # Again after commit, in case a concurrent read cached the old state
+        transaction.on_commit(lambda: cache.delete(key))
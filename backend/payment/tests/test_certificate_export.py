@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO, StringIO
+
+from course.models import Course, CourseCategory
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from payment.models import Enrollment
+from payment.utils.certificate_store import get_certificate_path, store_certificate
+from rest_framework import status
+from rest_framework.test import APITestCase
+from useraccount.models import RoleChoices, User
+
+
+@override_settings(CERTIFICATE_EXPORT_WORKERS=0)
+class CertificateExportTestCase(APITestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        category = CourseCategory.objects.create(name="Programming")
+        self.course = Course.objects.create(
+            category=category,
+            title="Python Basics",
+            slug="python-basics",
+            description="Learn Python",
+            duration=120,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+        self.enrollments = []
+        for i in range(4):
+            student = User.objects.create_user(
+                email=f"student{i}@example.com",
+                password="TestPassword123",
+                full_name=f"Student {i}",
+                contact_number=f"123456789{i}",
+            )
+            self.enrollments.append(
+                Enrollment.objects.create(
+                    student=student,
+                    course=self.course,
+                    status="completed",
+                    payment_status="success",
+                    certificate_issued=i < 3,
+                    certificate_issue_date=timezone.now() if i < 3 else None,
+                )
+            )
+        self.admin = User.objects.create_user(
+            email="admin@example.com",
+            password="TestPassword123",
+            full_name="Admin User",
+            contact_number="1000000000",
+            role=RoleChoices.ADMIN,
+        )
+        self.url = reverse("export-certificates", args=[self.course.slug])
+
+    def read_zip(self, content):
+        with zipfile.ZipFile(BytesIO(content)) as archive:
+            return {name: archive.read(name) for name in archive.namelist()}
+
+    def test_export_streams_issued_certificates(self):
+        stored = self.enrollments[0]
+        store_certificate(stored.id, b"%PDF-stored")
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        files = self.read_zip(b"".join(response.streaming_content))
+
+        self.assertEqual(len(files), 3)
+        self.assertEqual(files[f"student-0_{stored.id}.pdf"], b"%PDF-stored")
+        for i in (1, 2):
+            enrollment = self.enrollments[i]
+            self.assertTrue(files[f"student-{i}_{enrollment.id}.pdf"].startswith(b"%PDF"))
+            # Rendered certificates are kept for later downloads
+            self.assertTrue(os.path.exists(get_certificate_path(enrollment.id)))
+
+    def test_export_requires_staff(self):
+        self.client.force_authenticate(user=self.enrollments[0].student)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_command_renders_in_a_process_pool(self):
+        output = os.path.join(self.media_root, "export.zip")
+        call_command(
+            "export_certificates", self.course.slug, "--output", output,
+            "--workers", "1", stdout=StringIO(),
+        )
+        with open(output, "rb") as archive:
+            files = self.read_zip(archive.read())
+        self.assertEqual(len(files), 3)
+        self.assertTrue(all(pdf.startswith(b"%PDF") for pdf in files.values()))
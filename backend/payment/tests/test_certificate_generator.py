@@ -0,0 +1,50 @@
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from payment.utils.certificate_generator import (
+    get_certificate_template,
+    render_certificate_pdf,
+)
+from reportlab.pdfgen import canvas
+
+
+class CertificateTemplateTestCase(SimpleTestCase):
+
+    def render(self, name):
+        return render_certificate_pdf(
+            {
+                "student_name": name,
+                "course_title": "Python Basics",
+                "issue_date": "On January 01, 2026, 10:00 AM",
+                "enrollment_id": "4b1c2f5e-0000-0000-0000-000000000000",
+            }
+        ).getvalue()
+
+    def test_certificates_reuse_the_compressed_background(self):
+        first = self.render("Student One")
+        second = self.render("Student Two")
+
+        image = get_certificate_template().image.streamContent
+        image = image if isinstance(image, bytes) else image.encode("latin-1")
+        for pdf in (first, second):
+            self.assertTrue(pdf.startswith(b"%PDF"))
+            self.assertEqual(pdf.count(b"/FormXob.certificate-background"), 1)
+            self.assertIn(image, pdf)
+        self.assertNotEqual(first, second)
+
+    def test_background_is_drawn_through_the_reportlab_internals(self):
+        # draw_background registers the shared image with PDFDocument methods
+        # reportlab does not document; this fails if an upgrade changes them
+        template = get_certificate_template()
+        p = canvas.Canvas(
+            BytesIO(), pagesize=(template.width_pt, template.height_pt), pageCompression=0
+        )
+        template.draw_background(p)
+        template.draw_background(p)  # registered once per document
+        p.showPage()
+        p.save()
+        pdf = p.getpdfdata()
+
+        self.assertEqual(pdf.count(b"/FormXob.certificate-background Do"), 2)
+        self.assertEqual(pdf.count(b"/Subtype /Image"), 1)
+        self.assertIn(b"/XObject <<\n/FormXob.certificate-background", pdf)
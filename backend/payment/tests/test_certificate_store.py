@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from course.models import Course, CourseCategory
+from django.test import override_settings
+from django.urls import reverse
+from payment.models import Enrollment
+from payment.repositories.enrollment_repository import EnrollmentRepository
+from payment.utils.certificate_store import get_certificate_path
+from rest_framework import status
+from rest_framework.test import APITestCase
+from useraccount.models import User
+
+
+class CertificateStoreTestCase(APITestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(
+            email="student@example.com",
+            password="TestPassword123",
+            full_name="Test Student",
+            contact_number="1234567890",
+        )
+        category = CourseCategory.objects.create(name="Programming")
+        self.course = Course.objects.create(
+            category=category,
+            title="Python Basics",
+            description="Learn Python",
+            duration=120,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+        self.enrollment = Enrollment.objects.create(
+            student=self.user,
+            course=self.course,
+            payment_status="success",
+            status="active",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("download-certificate", args=[self.enrollment.id])
+
+    def test_issuing_schedules_render_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            EnrollmentRepository.update_progress(self.enrollment.id, 100)
+
+        self.enrollment.refresh_from_db()
+        self.assertTrue(self.enrollment.certificate_issued)
+        self.assertIsNotNone(self.enrollment.certificate_issue_date)
+        self.assertEqual(len(callbacks), 1)
+
+        # Already issued: no second render
+        with self.captureOnCommitCallbacks() as callbacks:
+            EnrollmentRepository.update_progress(self.enrollment.id, 100)
+        self.assertEqual(len(callbacks), 0)
+
+    def test_download_renders_once_then_streams_the_stored_file(self):
+        Enrollment.objects.filter(id=self.enrollment.id).update(certificate_issued=True)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first = b"".join(response.streaming_content)
+        self.assertTrue(first.startswith(b"%PDF"))
+        self.assertTrue(os.path.exists(get_certificate_path(self.enrollment.id)))
+
+        with patch(
+            "payment.utils.certificate_store.generate_certificate_pdf"
+        ) as generate:
+            response = self.client.get(self.url)
+            self.assertEqual(b"".join(response.streaming_content), first)
+        generate.assert_not_called()
+
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.certificate_download_count, 2)
+        self.assertIsNotNone(self.enrollment.certificate_issue_date)
+
+    def test_download_before_issue_is_forbidden(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,126 @@
+from io import StringIO
+
+from course.models import Course, CourseCategory, Module, Quiz, StudentProgress
+from course.services.quiz_service import QuizService
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from payment.models import Enrollment
+from payment.repositories.enrollment_repository import EnrollmentRepository
+from useraccount.models import User
+
+
+class CourseProgressTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        category = CourseCategory.objects.create(name="Programming")
+        self.course = Course.objects.create(
+            category=category,
+            title="Python Basics",
+            description="Learn Python",
+            duration=120,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+        self.quizzes = [self.add_quiz(order) for order in range(1, 4)]
+        self.student = User.objects.create(
+            email="student@example.com",
+            full_name="Student",
+            contact_number="1000000000",
+        )
+        self.enrollment = Enrollment.objects.create(
+            student=self.student, course=self.course, status="active",
+            payment_status="success",
+        )
+
+    def add_quiz(self, order):
+        module = Module.objects.create(
+            course=self.course, title=f"Module {order}", description="", order=order
+        )
+        # Untimed, so they can be submitted without starting an attempt
+        return Quiz.objects.create(
+            module=module,
+            title=f"Quiz {order}",
+            total_questions=0,
+            passing_score=0,
+            time_limit=0,
+        )
+
+    def test_quiz_signals_keep_the_course_total(self):
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.total_quiz_count, 3)
+
+        self.quizzes[0].delete()
+        self.quizzes[1].module.delete()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.total_quiz_count, 1)
+
+    def test_quiz_changes_recount_enrolled_progress(self):
+        for quiz in self.quizzes[:2]:
+            StudentProgress.objects.create(student=self.student, quiz=quiz, completed=True)
+        EnrollmentRepository.reconcile_progress(Course.objects.get(id=self.course.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_quiz(4)
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.completed_quiz_count, self.enrollment.progress), (2, 50))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.quizzes[0].delete()
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.completed_quiz_count, self.enrollment.progress), (1, 33))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.quizzes[2].module.delete()
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.completed_quiz_count, self.enrollment.progress), (1, 50))
+        self.assertFalse(self.enrollment.certificate_issued)
+
+    def test_each_submission_increments_progress(self):
+        QuizService.submit_quiz(self.student, self.quizzes[0].id, {})
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.completed_quiz_count, self.enrollment.progress), (1, 33))
+        self.assertFalse(self.enrollment.certificate_issued)
+
+        QuizService.submit_quiz(self.student, self.quizzes[1].id, {})
+        QuizService.submit_quiz(self.student, self.quizzes[2].id, {})
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.completed_quiz_count, self.enrollment.progress), (3, 100))
+        self.assertEqual(self.enrollment.status, "completed")
+        self.assertTrue(self.enrollment.certificate_issued)
+        self.assertIsNotNone(self.enrollment.certificate_issue_date)
+
+    def test_progress_update_does_not_recount(self):
+        course = Course.objects.get(id=self.course.id)
+        # One UPDATE for the counter, one lookup for a now-due certificate
+        with self.assertNumQueries(2):
+            EnrollmentRepository.update_enrollment_progress(course, self.student)
+
+    def test_reconcile_repairs_drift(self):
+        for quiz in self.quizzes[:2]:
+            StudentProgress.objects.create(student=self.student, quiz=quiz, completed=True)
+        Course.objects.filter(id=self.course.id).update(total_quiz_count=7)
+        self.quizzes[2].module.course = Course.objects.create(
+            category=self.course.category,
+            title="Other",
+            description="",
+            duration=60,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+        self.quizzes[2].module.save()
+
+        out = StringIO()
+        call_command("reconcile_course_progress", stdout=out)
+
+        self.course.refresh_from_db()
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.course.total_quiz_count, 2)
+        self.assertEqual((self.enrollment.completed_quiz_count, self.enrollment.progress), (2, 100))
+        self.assertTrue(self.enrollment.certificate_issued)
+        self.assertIn("progress of 1 enrollment(s), issued 1 certificate(s)", out.getvalue())
+
+        out = StringIO()
+        call_command("reconcile_course_progress", stdout=out)
+        self.assertIn("quiz count of 0 course(s) and the progress of 0", out.getvalue())
@@ -0,0 +1,57 @@
+from course.models import Course, CourseCategory
+from django.core.cache import cache
+from django.urls import reverse
+from payment.models import Enrollment, Payment
+from payment.repositories.enrollment_repository import EnrollmentRepository
+from payment.repositories.payment_repository import PaymentRepository
+from payment.services.entitlement_service import EntitlementService
+from rest_framework import status
+from rest_framework.test import APITestCase
+from useraccount.models import User
+
+
+class EntitlementServiceTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="student@example.com",
+            password="TestPassword123",
+            full_name="Test Student",
+            contact_number="1234567890",
+        )
+        category = CourseCategory.objects.create(name="Programming")
+        self.course = Course.objects.create(
+            category=category,
+            title="Python Basics",
+            description="Learn Python",
+            duration=120,
+            batch="Batch 1",
+            demo_url="https://example.com/demo",
+        )
+        self.enrollment = Enrollment.objects.create(
+            student=self.user, course=self.course, payment_status="pending"
+        )
+        self.payment = Payment.objects.create(
+            enrollment=self.enrollment, amount=100, transaction_id="TX-1"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("enrollment-detail", args=[self.enrollment.id])
+
+    def test_entitlements_are_cached_between_requests(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+        PaymentRepository.update_payment_status("TX-1", "success")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                EntitlementService.get_enrollment_ids(self.user), {str(self.enrollment.id)}
+            )
+
+    def test_cancel_revokes_access(self):
+        PaymentRepository.update_payment_status("TX-1", "success")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        EnrollmentRepository.cancel_enrollment(self.enrollment)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,83 @@
+from datetime import timedelta
+from io import StringIO
+
+from course.models import Course, CourseCategory
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from payment.models import Enrollment, Payment
+from useraccount.models import User
+
+
+class ExpirePendingEnrollmentsTestCase(TestCase):
+
+    def setUp(self):
+        category = CourseCategory.objects.create(name="Programming")
+        self.courses = [
+            Course.objects.create(
+                category=category,
+                title=f"Course {i}",
+                description="",
+                duration=60,
+                batch="Batch 1",
+                remaining_seat=10,
+                demo_url="https://example.com/demo",
+            )
+            for i in range(2)
+        ]
+        self.students = User.objects.bulk_create(
+            [
+                User(
+                    email=f"student{i}@example.com",
+                    full_name=f"Student {i}",
+                    contact_number=f"{1000000000 + i}",
+                )
+                for i in range(5)
+            ]
+        )
+
+    def enroll(self, student, course, age, payment_status="pending", status="pending"):
+        enrollment = Enrollment.objects.create(
+            student=student, course=course, payment_status=payment_status, status=status
+        )
+        Enrollment.objects.filter(id=enrollment.id).update(
+            enrollment_date=timezone.now() - age
+        )
+        Payment.objects.create(
+            enrollment=enrollment,
+            amount=100,
+            transaction_id=f"TX-{enrollment.id}",
+            status=payment_status,
+        )
+        return enrollment
+
+    def test_expired_pending_enrollments_are_cancelled_and_seats_released(self):
+        stale = [
+            self.enroll(self.students[0], self.courses[0], timedelta(days=2)),
+            self.enroll(self.students[1], self.courses[0], timedelta(days=3)),
+            self.enroll(self.students[2], self.courses[1], timedelta(days=2)),
+        ]
+        fresh = self.enroll(self.students[3], self.courses[0], timedelta(hours=1))
+        paid = self.enroll(
+            self.students[4], self.courses[1], timedelta(days=5), "success", "active"
+        )
+
+        out = StringIO()
+        call_command("expire_pending_enrollments", "--batch-size", "2", stdout=out)
+
+        for enrollment in stale:
+            enrollment.refresh_from_db()
+            self.assertEqual(enrollment.status, "cancelled")
+            self.assertEqual(enrollment.payment.status, "failed")
+        for enrollment, expected in ((fresh, "pending"), (paid, "active")):
+            enrollment.refresh_from_db()
+            self.assertEqual(enrollment.status, expected)
+
+        self.assertEqual(
+            [Course.objects.get(id=c.id).remaining_seat for c in self.courses], [12, 11]
+        )
+        self.assertIn("cancelled 3", out.getvalue())
+
+        # A second run has nothing left to release
+        call_command("expire_pending_enrollments", stdout=StringIO())
+        self.assertEqual(Course.objects.get(id=self.courses[0].id).remaining_seat, 12)
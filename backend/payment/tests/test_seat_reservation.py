@@ -0,0 +1,192 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from course.models import Course, CourseCategory
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.urls import reverse
+from django.utils import timezone
+from payment.models import Enrollment
+from payment.repositories.enrollment_repository import EnrollmentRepository
+from rest_framework import status
+from rest_framework.test import APIClient
+from useraccount.models import User
+
+
+def create_course(seats):
+    category = CourseCategory.objects.create(name="Programming")
+    return Course.objects.create(
+        category=category,
+        title="Python Basics",
+        slug="python-basics",
+        description="Learn Python",
+        price=100,
+        duration=120,
+        batch="Batch 1",
+        remaining_seat=seats,
+        demo_url="https://example.com/demo",
+    )
+
+
+def create_students(count):
+    return User.objects.bulk_create(
+        [
+            User(
+                email=f"student{i}@example.com",
+                full_name=f"Student {i}",
+                contact_number=f"{1000000000 + i}",
+            )
+            for i in range(count)
+        ]
+    )
+
+
+def checkout(student, transaction_id):
+    client = APIClient()
+    client.force_authenticate(user=student)
+    return client.post(
+        f"{reverse('checkout')}?course=python-basics",
+        {"payment_method": "bkash", "amount": "100.00", "transaction_id": transaction_id},
+        format="json",
+    )
+
+
+def verify(admin, transaction_id):
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client.post(
+        reverse("verify-payment"),
+        {"transaction_id": transaction_id, "status": "success"},
+        format="json",
+    )
+
+
+class SeatReservationTestCase(TestCase):
+
+    def setUp(self):
+        self.course = create_course(seats=1)
+        self.students = create_students(3)
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com", password="AdminPassword123", contact_number="1999999999"
+        )
+
+    def test_sold_out_course_rejects_checkout(self):
+        self.assertEqual(checkout(self.students[0], "TX-0").status_code, status.HTTP_201_CREATED)
+        self.assertEqual(checkout(self.students[1], "TX-1").status_code, status.HTTP_409_CONFLICT)
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.remaining_seat, 0)
+
+    def test_second_enrollment_of_a_student_hands_its_seat_back(self):
+        existing = Enrollment.objects.create(student=self.students[0], course=self.course)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Enrollment.objects.create(student=self.students[0], course=self.course)
+
+        # A checkout that lost the race to create it gets the existing one
+        enrollment = EnrollmentRepository.create_enrollment(self.students[0], self.course)
+        self.assertEqual(enrollment, existing)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.remaining_seat, 1)
+
+    def test_expired_pending_enrollment_gives_its_seat_back(self):
+        self.assertEqual(checkout(self.students[0], "TX-0").status_code, status.HTTP_201_CREATED)
+        Enrollment.objects.update(enrollment_date=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(checkout(self.students[1], "TX-1").status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            Enrollment.objects.get(student=self.students[0]).status, "cancelled"
+        )
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.remaining_seat, 0)
+
+    def reap(self):
+        Enrollment.objects.update(enrollment_date=timezone.now() - timedelta(days=2))
+        EnrollmentRepository.release_expired_pending(self.course.id)
+
+    def test_verify_after_reap_takes_a_seat_again(self):
+        checkout(self.students[0], "TX-0")
+        self.reap()
+
+        self.assertEqual(verify(self.admin, "TX-0").status_code, status.HTTP_200_OK)
+        enrollment = Enrollment.objects.get(student=self.students[0])
+        self.assertEqual((enrollment.status, enrollment.payment_status), ("active", "success"))
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.remaining_seat, 0)
+
+    def test_verify_after_reap_is_rejected_once_the_seat_is_resold(self):
+        checkout(self.students[0], "TX-0")
+        self.reap()
+        self.assertEqual(checkout(self.students[1], "TX-1").status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(verify(self.admin, "TX-0").status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Enrollment.objects.get(student=self.students[0]).status, "cancelled")
+        self.assertEqual(verify(self.admin, "TX-1").status_code, status.HTTP_200_OK)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.remaining_seat, 0)
+
+    def test_checkout_again_after_reap_replaces_the_transaction(self):
+        checkout(self.students[0], "TX-0")
+        self.reap()
+
+        response = checkout(self.students[0], "TX-0-RETRY")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        payment = Enrollment.objects.get(student=self.students[0]).payment
+        self.assertEqual((payment.transaction_id, payment.status), ("TX-0-RETRY", "pending"))
+
+        self.assertEqual(verify(self.admin, "TX-0-RETRY").status_code, status.HTTP_200_OK)
+        enrollment = Enrollment.objects.get(student=self.students[0])
+        self.assertEqual((enrollment.status, enrollment.payment_status), ("active", "success"))
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.remaining_seat, 0)
+
+    def test_cancel_restores_the_seat_once(self):
+        enrollment = EnrollmentRepository.create_enrollment(self.students[0], self.course)
+        EnrollmentRepository.cancel_enrollment(enrollment)
+        EnrollmentRepository.cancel_enrollment(Enrollment.objects.get(id=enrollment.id))
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.remaining_seat, 1)
+
+
+class SeatReservationConcurrencyTestCase(TransactionTestCase):
+
+    # Needs a server database with row-level locking (MySQL); SQLite locks
+    # the whole file and rejects concurrent writers.
+    @skipUnlessDBFeature("has_select_for_update")
+    def test_parallel_checkouts_never_oversell(self):
+        course = create_course(seats=100)
+        students = create_students(500)
+
+        def attempt(i):
+            try:
+                return checkout(students[i], f"TX-{i}").status_code
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=50) as pool:
+            codes = list(pool.map(attempt, range(500)))
+
+        self.assertEqual(codes.count(status.HTTP_201_CREATED), 100)
+        self.assertEqual(codes.count(status.HTTP_409_CONFLICT), 400)
+        course.refresh_from_db()
+        self.assertEqual(course.remaining_seat, 0)
+        self.assertEqual(Enrollment.objects.filter(course=course).count(), 100)
+
+    @skipUnlessDBFeature("has_select_for_update")
+    def test_parallel_checkouts_of_one_student_take_one_seat(self):
+        course = create_course(seats=10)
+        [student] = create_students(1)
+
+        def attempt(i):
+            try:
+                return checkout(student, f"TX-{i}").status_code
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            codes = list(pool.map(attempt, range(20)))
+
+        self.assertTrue(all(code < 500 for code in codes), codes)
+        course.refresh_from_db()
+        self.assertEqual(course.remaining_seat, 9)
+        self.assertEqual(Enrollment.objects.filter(course=course).count(), 1)
@@ -1,41 +1,108 @@
+import copy
 import os
+import threading
 from io import BytesIO
 from django.conf import settings
 from django.utils.timezone import localtime
-from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfdoc
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 from reportlab.lib.colors import HexColor, white
-from PIL import Image  # To get the image size
 
-def generate_certificate_pdf(enrollment):
-    buffer = BytesIO()
 
-    # Background image
-    background_path = os.path.join(
-        settings.BASE_DIR, 'static', 'certificate', 'certificate.png'
-    )
-    with Image.open(background_path) as img:
-        img_width, img_height = img.size
+class CertificateTemplate:
+    """
+    The certificate background, decoded and compressed into a PDF image
+    XObject once per process. Every certificate reuses that stream, so only
+    the text overlay is produced per certificate.
+    """
+
+    name = "certificate-background"
+
+    def __init__(self, background_path):
+        reader = ImageReader(background_path)
+        img_width, img_height = reader.getSize()
+
+        dpi = 72
+        self.width_pt = img_width * 72.0 / dpi
+        self.height_pt = img_height * 72.0 / dpi
+
+        self.image = pdfdoc.PDFImageXObject(self.name, reader)
+
+    def _register(self, doc):
+        """Add the shared image to a PDF document as the named XObject `doForm` draws."""
+        # reportlab has no public call to add a prebuilt XObject (beginForm
+        # and drawImage would encode the image again for every certificate):
+        # these document methods are the ones drawImage uses internally.
+        # test_certificate_generator fails if an upgrade changes them.
+        reg_name = doc.getXObjectName(self.name)
+        if reg_name not in doc.idToObject:
+            # A shallow copy per document: the compressed stream is shared,
+            # the registration state reportlab sets on the object is not
+            image = copy.copy(self.image)
+            doc.Reference(image, reg_name)
+            doc.addForm(self.name, image)
+
+    def draw_background(self, p):
+        """Draw the shared image on canvas `p`, filling the page."""
+        self._register(p._doc)
+        p.saveState()
+        p.scale(self.width_pt, self.height_pt)
+        p.doForm(self.name)
+        p.restoreState()
+
+
+_template = None
+_template_lock = threading.Lock()
+
+
+def get_certificate_template():
+    """The process-wide certificate template, built on first use."""
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                background_path = os.path.join(
+                    settings.BASE_DIR, 'static', 'certificate', 'certificate.png'
+                )
+                _template = CertificateTemplate(background_path)
+    return _template
 
-    dpi = 72
-    width_pt = img_width * 72.0 / dpi
-    height_pt = img_height * 72.0 / dpi
+
+def format_issue_date(issue_date):
+    if issue_date:
+        return localtime(issue_date).strftime("On %B %d, %Y, %I:%M %p")
+    return ""
+
+
+def get_certificate_data(enrollment):
+    """The plain values printed on an enrollment's certificate."""
+    return {
+        "student_name": enrollment.student.full_name,
+        "course_title": enrollment.course.title,
+        "issue_date": format_issue_date(enrollment.certificate_issue_date),
+        "enrollment_id": str(enrollment.id),
+    }
+
+
+def render_certificate_pdf(data):
+    """Render a certificate from get_certificate_data() values into a buffer."""
+    template = get_certificate_template()
+    buffer = BytesIO()
 
     # Create a canvas with the same size as the image
-    p = canvas.Canvas(buffer, pagesize=(width_pt, height_pt))
+    p = canvas.Canvas(buffer, pagesize=(template.width_pt, template.height_pt))
 
     # Draw the image without scaling (it fits exactly)
-    img_reader = ImageReader(background_path)
-    p.drawImage(img_reader, 0, 0, width=width_pt, height=height_pt)
+    template.draw_background(p)
 
     # Center X (in the image-sized page)
-    center_x = width_pt / 2
+    center_x = template.width_pt / 2
 
     # Custom text positioning (adjust Y based on image height)
     p.setFont("Courier-Bold", 50)
     p.setFillColor(HexColor("#2D3748"))
-    p.drawCentredString(center_x, 660, f"{enrollment.student.full_name}")
+    p.drawCentredString(center_x, 660, f"{data['student_name']}")
 
     p.setFont("Helvetica", 35)
     p.setFillColor(HexColor("#4A5568"))
@@ -43,16 +110,11 @@ def generate_certificate_pdf(enrollment):
 
     p.setFont("Helvetica-Bold", 50)
     p.setFillColor(HexColor("#1A202C"))
-    p.drawCentredString(center_x, 560, f"{enrollment.course.title}")
-
-    if enrollment.certificate_issue_date:
-        formatted_date = localtime(enrollment.certificate_issue_date).strftime("On %B %d, %Y, %I:%M %p")
-    else:
-        formatted_date = ""
+    p.drawCentredString(center_x, 560, f"{data['course_title']}")
 
     p.setFont("Helvetica", 30)
     p.setFillColor(HexColor("#2D3748"))
-    p.drawCentredString(center_x, 490, f"{formatted_date} | ID: {enrollment.id}")
+    p.drawCentredString(center_x, 490, f"{data['issue_date']} | ID: {data['enrollment_id']}")
 
     p.setFont("Helvetica-Oblique", 20)
     p.setFillColor(white)
@@ -64,3 +126,11 @@ def generate_certificate_pdf(enrollment):
     buffer.seek(0)
     return buffer
 
+
+def generate_certificate_pdf(enrollment):
+    return render_certificate_pdf(get_certificate_data(enrollment))
+
+
+def render_certificate_bytes(data):
+    """render_certificate_pdf() for process pools: picklable in and out."""
+    return render_certificate_pdf(data).getvalue()
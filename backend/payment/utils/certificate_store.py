@@ -0,0 +1,89 @@
+"""
+On-disk store of rendered certificates.
+
+A certificate never changes once issued, so it is rendered once (in the
+background, right after the enrollment is completed) and downloads just
+stream the stored file. Files live under MEDIA_ROOT/certificates/v<version>/
+so bumping CERTIFICATE_TEMPLATE_VERSION after changing the layout makes every
+certificate render again on its next download.
+"""
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+from payment.models import Enrollment
+from payment.utils.certificate_generator import generate_certificate_pdf
+
+CERTIFICATE_TEMPLATE_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.CERTIFICATE_RENDER_WORKERS,
+    thread_name_prefix="certificate-render",
+)
+
+
+def get_certificate_path(enrollment_id):
+    return os.path.join(
+        settings.MEDIA_ROOT,
+        "certificates",
+        f"v{CERTIFICATE_TEMPLATE_VERSION}",
+        f"{enrollment_id}.pdf",
+    )
+
+
+def store_certificate(enrollment_id, content):
+    """Write a rendered PDF to the store; returns the file path."""
+    path = get_certificate_path(enrollment_id)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    # Write to a temporary file and rename so readers never see a partial PDF
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def render_certificate(enrollment):
+    """Render the certificate and store it; returns the file path."""
+    buffer = generate_certificate_pdf(enrollment)
+    return store_certificate(enrollment.id, buffer.getbuffer())
+
+
+def get_or_render_certificate(enrollment):
+    """Path of the stored certificate, rendering it now if it is missing."""
+    path = get_certificate_path(enrollment.id)
+    if not os.path.exists(path):
+        path = render_certificate(enrollment)
+    return path
+
+
+def _render_in_background(enrollment_id):
+    try:
+        enrollment = (
+            Enrollment.objects.select_related("student", "course")
+            .filter(id=enrollment_id, certificate_issued=True)
+            .first()
+        )
+        if enrollment:
+            get_or_render_certificate(enrollment)
+    except Exception:
+        # The download view renders on demand if this failed
+        logger.exception("Could not render certificate for enrollment %s", enrollment_id)
+    finally:
+        connection.close()
+
+
+def schedule_certificate_render(enrollment_id):
+    """Render the certificate in a worker thread once the transaction commits."""
+    transaction.on_commit(lambda: _executor.submit(_render_in_background, enrollment_id))
@@ -71,10 +71,14 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",  # Default to requiring authentication
     ),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "useraccount.authentication.ClaimsJWTAuthentication",
     ),
 }
 
+# Keyset pagination for list endpoints (core.pagination.KeysetPagination)
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", 50))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", 200))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -86,17 +90,34 @@ SIMPLE_JWT = {
     "ALOGRIGTHM": "HS512",
 }
 
+# Seconds a user's token version is cached (useraccount.authentication)
+TOKEN_VERSION_CACHE_TTL = int(os.getenv("TOKEN_VERSION_CACHE_TTL", 300))
+
 PASSWORD_RESET_TIMEOUT = 900  # 900 Sec = 15 Min
 
 # Email Configuration
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# Set EMAIL_BACKEND to the console or file backend for local runs
+EMAIL_BACKEND = os.environ.get(
+    "EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend"
+)
+EMAIL_FILE_PATH = os.environ.get("EMAIL_FILE_PATH", BASE_DIR / "tmp" / "emails")
 EMAIL_HOST = "smtp.gmail.com"
 EMAIL_PORT = 587
 EMAIL_HOST_USER = os.environ.get("EMAIL_USER")
 EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_PASS")
 EMAIL_USE_TLS = True
 
+# Email outbox (core.services.email_outbox_service), drained by the
+# `send_outbox_emails` worker. Delays are in seconds.
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv("EMAIL_OUTBOX_RETRY_DELAY", 30))
+EMAIL_OUTBOX_MAX_RETRY_DELAY = int(os.getenv("EMAIL_OUTBOX_MAX_RETRY_DELAY", 3600))
+EMAIL_OUTBOX_LEASE = int(os.getenv("EMAIL_OUTBOX_LEASE", 300))
+EMAIL_OUTBOX_POLL_INTERVAL = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL", 2))
+
 MIDDLEWARE = [
+    "core.middleware.PerformanceMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -144,6 +165,45 @@ DATABASES = {
     }
 }
 
+# DB_ENGINE=sqlite runs on a local file instead of MySQL (tests, budget suite)
+if os.getenv("DB_ENGINE") == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+        }
+    }
+
+
+# Cache
+# Local-memory by default (used by tests); point at a shared backend in production.
+# docker-compose uses Redis, which the quiz attempt autosave buffer requires.
+# Quiz answer keys are cached here, see course.repositories.quiz_answer_key_repository
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "slms"),
+    }
+}
+
+# Seconds a quiz's answer key and student-facing body are cached
+# (course.repositories.quiz_answer_key_repository); writes invalidate them sooner
+QUIZ_CACHE_TTL = int(os.getenv("QUIZ_CACHE_TTL", 3600))
+
+# Seconds a student's paid-enrollment set is cached (payment.services.entitlement_service)
+ENTITLEMENT_CACHE_TTL = int(os.getenv("ENTITLEMENT_CACHE_TTL", 60))
+
+# Seconds the catalog's category list, course ids and course rows are cached
+# (course.services.catalog_service); writes invalidate them sooner
+COURSE_CATALOG_CACHE_TTL = int(os.getenv("COURSE_CATALOG_CACHE_TTL", 3600))
+
+# Seconds an anonymous course detail page is cached (course.services.catalog_service);
+# writes invalidate it sooner, this bounds how long a missed invalidation can last
+COURSE_DETAIL_CACHE_TTL = int(os.getenv("COURSE_DETAIL_CACHE_TTL", 300))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -181,6 +241,66 @@ STATIC_URL = "static/"
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Course search (course.services.course_search_service): "fulltext" queries the MySQL
+# FULLTEXT index, "memory" an in-process inverted index; "auto" picks by database
+COURSE_SEARCH_BACKEND = os.getenv("COURSE_SEARCH_BACKEND", "auto")
+COURSE_SEARCH_MAX_RESULTS = int(os.getenv("COURSE_SEARCH_MAX_RESULTS", 1000))
+
+# Faceted catalog filter (courses/filter/): price bucket edges, and seconds the
+# facet counts of a filter are cached (writes move the catalog version sooner)
+COURSE_PRICE_FACETS = [
+    int(edge) for edge in os.getenv("COURSE_PRICE_FACETS", "0,1000,2000,5000").split(",")
+]
+COURSE_FACET_CACHE_TTL = int(os.getenv("COURSE_FACET_CACHE_TTL", 3600))
+
+# Largest quiz accepted by the bulk question import (quizzes/<id>/import/)
+QUIZ_IMPORT_MAX_QUESTIONS = int(os.getenv("QUIZ_IMPORT_MAX_QUESTIONS", 500))
+
+# Timed quiz attempts (course.services.quiz_attempt_service). Answers are accepted
+# QUIZ_ATTEMPT_GRACE_PERIOD seconds past the deadline. Autosaves are buffered in
+# the (shared) cache for QUIZ_ATTEMPT_BUFFER_TTL seconds past closing and written
+# in batches by the `flush_quiz_attempts` worker.
+QUIZ_ATTEMPT_GRACE_PERIOD = int(os.getenv("QUIZ_ATTEMPT_GRACE_PERIOD", 30))
+QUIZ_ATTEMPT_BUFFER_TTL = int(os.getenv("QUIZ_ATTEMPT_BUFFER_TTL", 3600))
+QUIZ_ATTEMPT_FLUSH_BATCH_SIZE = int(os.getenv("QUIZ_ATTEMPT_FLUSH_BATCH_SIZE", 500))
+QUIZ_ATTEMPT_FLUSH_INTERVAL = float(os.getenv("QUIZ_ATTEMPT_FLUSH_INTERVAL", 5))
+
+# Pending (unpaid) enrollments hold their seat this long, see
+# payment.repositories.enrollment_repository.release_expired_pending
+PENDING_ENROLLMENT_TTL = timedelta(
+    hours=int(os.getenv("PENDING_ENROLLMENT_TTL_HOURS", 24))
+)
+
+# Threads rendering issued certificates into MEDIA_ROOT/certificates
+CERTIFICATE_RENDER_WORKERS = int(os.getenv("CERTIFICATE_RENDER_WORKERS", 2))
+# Processes rendering missing certificates during a ZIP export (0: render inline)
+CERTIFICATE_EXPORT_WORKERS = int(os.getenv("CERTIFICATE_EXPORT_WORKERS", 2))
+
+# Per-request instrumentation (core.middleware.PerformanceMiddleware): Server-Timing
+# headers plus one JSON line per request on the "core.perf" logger, written to
+# PERF_LOG_FILE (stderr if unset). Aggregate it with `manage.py perf_report`.
+PERF_INSTRUMENTATION = os.getenv("PERF_INSTRUMENTATION", "False") == "True"
+PERF_LOG_FILE = os.getenv("PERF_LOG_FILE")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"message": {"format": "%(message)s"}},
+    "handlers": {
+        "perf": (
+            {"class": "logging.FileHandler", "filename": PERF_LOG_FILE, "formatter": "message"}
+            if PERF_LOG_FILE
+            else {"class": "logging.StreamHandler", "formatter": "message"}
+        ),
+        "console": {"class": "logging.StreamHandler", "formatter": "message"},
+    },
+    "loggers": {
+        "core.perf": {"handlers": ["perf"], "level": "INFO", "propagate": False},
+        # Data migrations report how many rows they changed
+        "course.migrations": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -1,11 +1,21 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.auth.forms import AdminPasswordChangeForm
 from django.forms import ValidationError
 from django.utils.translation import gettext_lazy as _
 from useraccount.models import Instructor, RoleChoices, User
 
 
+class UserPasswordChangeForm(AdminPasswordChangeForm):
+    """Setting a password from the admin also revokes the user's tokens."""
+
+    def save(self, commit=True):
+        self.user.revoke_tokens()
+        return super().save(commit)
+
+
 class UserAdmin(BaseUserAdmin):
+    change_password_form = UserPasswordChangeForm
     # Define the fields to display in the list view
     list_display = (
         "email",
@@ -70,6 +80,8 @@ class UserAdmin(BaseUserAdmin):
     def save_model(self, request, obj, form, change):
         if not change:
             obj.set_password(form.cleaned_data["password1"])
+        elif {"role", "is_active", "is_verified"} & set(form.changed_data):
+            obj.revoke_tokens()  # these are carried in the tokens
         super().save_model(request, obj, form, change)
 
 
@@ -0,0 +1,55 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from useraccount.models import ClaimsUser
+from useraccount.repositories.user_repository import UserRepository
+
+# User fields carried in the tokens, by claim name
+USER_CLAIMS = {
+    "role": "role",
+    "is_verified": "is_verified",
+    "is_active": "is_active",
+    "ver": "token_version",
+}
+
+
+def get_token_with_claims(user):
+    """A refresh token (and its access token) carrying the user's claims."""
+    refresh = RefreshToken.for_user(user)
+    for claim, field in USER_CLAIMS.items():
+        refresh[claim] = getattr(user, field)
+    return refresh
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds request.user from the token claims
+    instead of loading the row. The only lookup is the user's token version
+    (cached), which rejects tokens issued before a password, role or
+    activation change. Tokens without claims fall back to the DB lookup.
+    """
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user_id = ClaimsUser._meta.pk.to_python(user_id)
+        current_version = UserRepository.get_token_version(user_id)
+        if current_version is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if validated_token["ver"] != current_version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        if not validated_token["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return ClaimsUser.from_claims(
+            user_id,
+            **{field: validated_token[claim] for claim, field in USER_CLAIMS.items()},
+        )
@@ -1,12 +1,12 @@
+from core.pagination import KeysetPagination, get_requested_fields
 from django.contrib.auth import authenticate
 from django.forms import ValidationError
 from rest_framework import serializers, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
-from useraccount.models import User
+from useraccount.authentication import get_token_with_claims
 from useraccount.permissions import IsAdminOrStaff
 from useraccount.renderers import UserRenderer
 from useraccount.serializers import (
@@ -26,7 +26,7 @@ from useraccount.services.user_service import UserService
 # Create your views here.
 def get_token_for_user(user):
     """Get the token for a user."""
-    refresh = RefreshToken.for_user(user)
+    refresh = get_token_with_claims(user)
     return {
         "refresh": str(refresh),
         "access": str(refresh.access_token),
@@ -233,11 +233,23 @@ class UserPasswordResetView(APIView):
         )
 
 
+class UserPagination(KeysetPagination):
+    ordering = ("created_at", "id")
+    results_key = "users"
+
+
 class UserListView(APIView):
     renderer_classes = [UserRenderer]
     permission_classes = [IsAuthenticated, IsAdminOrStaff]
 
     def get(self, request):
-        users = User.objects.all()
-        serializer = UserSerializer(users, many=True)
-        return Response(serializer.data)
+        pagination = UserPagination()
+        fields = get_requested_fields(request, UserSerializer)
+        users = UserService.list_all_users()
+        if fields:
+            users = users.only(
+                *UserSerializer.get_only_fields(fields, extra=pagination.ordering)
+            )
+        page = pagination.paginate_queryset(users, request)
+        serializer = UserSerializer(page, many=True, fields=fields)
+        return pagination.get_paginated_response(serializer.data)
@@ -6,7 +6,7 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
-from django.db import models
+from django.db import models, router
 
 from .validators import *
 
@@ -75,6 +75,8 @@ class User(AbstractBaseUser, PermissionsMixin):
         max_length=6, blank=True, null=True
     )  # OTP for email verification
     is_verified = models.BooleanField(default=False)  # Email verification flag
+    # Bumped to revoke every token issued so far (see useraccount.authentication)
+    token_version = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -96,6 +98,37 @@ class User(AbstractBaseUser, PermissionsMixin):
         else:
             return ""
 
+    def revoke_tokens(self):
+        """Invalidate the user's issued tokens once this instance is saved."""
+        self.token_version += 1
+
+
+class ClaimsUser(User):
+    """
+    A User built from access-token claims without a query. Only the claimed
+    fields are loaded; touching any other field loads the rest of the row in
+    one query.
+    """
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, user_id, **claims):
+        values = {"id": user_id, **claims}
+        field_names = [
+            f.attname for f in cls._meta.concrete_fields if f.attname in values
+        ]
+        return cls.from_db(
+            router.db_for_read(cls), field_names, [values[name] for name in field_names]
+        )
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = deferred  # load the whole row on first touch
+        super().refresh_from_db(using, fields, from_queryset)
+
 
 class Instructor(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="instructor_profile")
@@ -1,5 +1,5 @@
 import re
-from payment.models import Enrollment
+from payment.services.entitlement_service import EntitlementService
 from rest_framework.permissions import BasePermission
 
 
@@ -28,9 +28,7 @@ class IsStudent(BasePermission):
 
         if enrollment_id:
             # Check if student is enrolled with successful payment
-            return Enrollment.objects.filter(
-                student=request.user, id=enrollment_id, payment_status="success"
-            ).exists()
+            return EntitlementService.is_entitled(request, enrollment_id)
 
         return False
 
@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from useraccount.models import User
 
@@ -52,3 +54,31 @@ class UserRepository:
     def filter_users(**filters):
         """Filter users based on given criteria."""
         return User.objects.filter(**filters)
+
+    @staticmethod
+    def _token_version_key(user_id):
+        return f"useraccount:token_version:{user_id}"
+
+    @staticmethod
+    def get_token_version(user_id):
+        """Current token version of a user (cached); None if the user is gone."""
+        key = UserRepository._token_version_key(user_id)
+        version = cache.get(key)
+        if version is None:
+            version = (
+                User.objects.filter(id=user_id)
+                .values_list("token_version", flat=True)
+                .first()
+            )
+            if version is not None:
+                cache.set(key, version, timeout=settings.TOKEN_VERSION_CACHE_TTL)
+        return version
+
+    @staticmethod
+    def set_cached_token_version(user_id, version):
+        """Publish a saved token version (None drops the cached one)."""
+        key = UserRepository._token_version_key(user_id)
+        if version is None:
+            cache.delete(key)
+        else:
+            cache.set(key, version, timeout=settings.TOKEN_VERSION_CACHE_TTL)
@@ -1,6 +1,7 @@
 import random
 from base64 import urlsafe_b64decode, urlsafe_b64encode
 
+from core.pagination import FieldProjectionMixin
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.core.exceptions import ValidationError
 from django.utils.encoding import DjangoUnicodeDecodeError, force_bytes, smart_str
@@ -12,7 +13,9 @@ from useraccount.validators import validate_password_strength
 from .models import Instructor, RoleChoices, User
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(FieldProjectionMixin, serializers.ModelSerializer):
+    projection_sources = {"profile_image_url": ["profile_picture"]}
+
     class Meta:
         model = User
         fields = [
@@ -211,6 +214,7 @@ class UserChangePasswordSerializer(serializers.Serializer):
                 "Password and Confirm Password doesn't match"
             )
         user.set_password(password)
+        user.revoke_tokens()
         user.save()
         return attrs
 
@@ -282,6 +286,7 @@ class UserPasswordResetSerializer(serializers.Serializer):
 
             # Update user's password
             user.set_password(password)
+            user.revoke_tokens()
             user.save()
 
         except DjangoUnicodeDecodeError:
@@ -72,6 +72,7 @@ class UserService:
             raise ValidationError("Old password is incorrect.")
 
         user.set_password(new_password)
+        user.revoke_tokens()
         user.save()
         return user
 
@@ -87,6 +88,7 @@ class UserService:
             raise ValidationError("Invalid role.")
 
         user.role = role
+        user.revoke_tokens()  # tokens carry the role
         user.save()
         return user
 
@@ -135,6 +137,7 @@ class UserService:
             raise ValidationError("User not found.")
 
         user.is_active = False
+        user.revoke_tokens()
         user.save()
         return user
 
@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from useraccount.models import ClaimsUser, User
+from useraccount.repositories.user_repository import UserRepository
+
+
+# Keep the cached token version in step with the saved user, so revoked
+# tokens are rejected on their next request
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=ClaimsUser)
+def publish_token_version(sender, instance, **kwargs):
+    if "token_version" in instance.get_deferred_fields():
+        version = None
+    else:
+        version = instance.token_version
+    UserRepository.set_cached_token_version(instance.id, None)
+    transaction.on_commit(
+        lambda: UserRepository.set_cached_token_version(instance.id, version)
+    )
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=ClaimsUser)
+def drop_token_version(sender, instance, **kwargs):
+    transaction.on_commit(lambda: UserRepository.set_cached_token_version(instance.id, None))
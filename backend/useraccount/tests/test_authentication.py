@@ -0,0 +1,85 @@
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from useraccount.models import RoleChoices, User
+from useraccount.services.user_service import UserService
+
+
+class ClaimsJWTAuthenticationTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="admin@example.com",
+            password="TestPassword@123",
+            full_name="Admin User",
+            contact_number="1000000000",
+            role=RoleChoices.ADMIN,
+            is_verified=True,
+        )
+        response = self.client.post(
+            reverse("login"),
+            {"email": "admin@example.com", "password": "TestPassword@123"},
+            format="json",
+        )
+        self.access = response.data["token"]["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def test_role_checks_do_not_load_the_user(self):
+        self.client.get(reverse("all-users"))  # warm the token version cache
+
+        # Only the user list itself is queried
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("all-users"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_other_fields_load_the_row_once(self):
+        with self.assertNumQueries(2):  # token version + the rest of the row
+            response = self.client.get(reverse("profile"))
+        self.assertEqual(response.data["user"]["full_name"], "Admin User")
+        self.assertEqual(response.data["user"]["email"], "admin@example.com")
+
+    def test_password_change_revokes_issued_tokens(self):
+        response = self.client.post(
+            reverse("changepassword"),
+            {"password": "NewPassword@123", "password2": "NewPassword@123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse("profile"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_role_change_revokes_issued_tokens(self):
+        UserService.set_user_role(self.user.id, RoleChoices.STUDENT)
+
+        response = self.client.get(reverse("all-users"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+        ]
+    )
+    def test_login_after_a_hasher_upgrade_keeps_the_token_valid(self):
+        User.objects.filter(id=self.user.id).update(
+            password=make_password("TestPassword@123", hasher="md5")
+        )
+        response = self.client.post(
+            reverse("login"),
+            {"email": "admin@example.com", "password": "TestPassword@123"},
+            format="json",
+        )
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+
+        cache.clear()  # the token version is read back from the database
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['token']['access']}"
+        )
+        response = self.client.get(reverse("profile"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1,13 +1,11 @@
-from django.core.mail import EmailMessage
-import os
+from core.services.email_outbox_service import EmailOutboxService
 
 class Util:
   @staticmethod
   def send_email(data):
-    email = EmailMessage(
+    """Queue the email in the outbox; the send_outbox_emails worker delivers it."""
+    EmailOutboxService.enqueue(
       subject=data['subject'],
       body=data['body'],
-      from_email=os.environ.get('EMAIL_FROM'),
-      to=[data['to_email']]
+      to_email=data['to_email'],
     )
-    email.send()
\ No newline at end of file
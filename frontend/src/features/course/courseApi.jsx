@@ -43,15 +43,26 @@ const baseQueryWithReauth = async (args, api, extraOptions) => {
   return result;
 };
 
+// List endpoints are paginated ({ [key]: [...], next }): follow `next`
+// until the last page so callers still get the whole list
+const fetchAllPages = async (url, key, api, extraOptions, baseQuery) => {
+  const items = [];
+  while (url) {
+    const result = await baseQuery({ url, method: "GET" }, api, extraOptions);
+    if (result.error) return result;
+    items.push(...result.data[key]);
+    url = result.data.next;
+  }
+  return { data: items };
+};
+
 export const courseApi = createApi({
   reducerPath: "courseApi",
   baseQuery: baseQueryWithReauth,
   endpoints: (builder) => ({
     getEnrolledCourse: builder.query({
-      query: () => ({
-        url: "purchase/my-courses/",
-        method: "GET",
-      }),
+      queryFn: (arg, api, extraOptions, baseQuery) =>
+        fetchAllPages("purchase/my-courses/", "enrollments", api, extraOptions, baseQuery),
     }),
     getEnrolledCourseModule: builder.query({
       query: (enrollments_id) => ({
@@ -72,16 +83,18 @@ export const courseApi = createApi({
       }),
     }),
     getAllCourses: builder.query({
-      query: (category) => ({
-        url: `courses/?category=${category}`,
-        method: "GET",
-      }),
+      queryFn: async (category, api, extraOptions, baseQuery) => {
+        const result = await fetchAllPages(
+          `courses/?category=${category}`, "courses", api, extraOptions, baseQuery
+        );
+        return result.error ? result : { data: { courses: result.data } };
+      },
     }),
     getAllCourseswithoutcategory: builder.query({
-      query: () => ({
-        url: `courses/`,
-        method: "GET",
-      }),
+      queryFn: async (arg, api, extraOptions, baseQuery) => {
+        const result = await fetchAllPages("courses/", "courses", api, extraOptions, baseQuery);
+        return result.error ? result : { data: { courses: result.data } };
+      },
     }),
     getCoursesDetails: builder.query({
       query: (slug) => ({
@@ -119,6 +132,19 @@ export const courseApi = createApi({
         method: "GET",
       }),
     }),
+    startQuizAttempt: builder.mutation({
+      query: ({ enrollments_id, module_id, quiz_id }) => ({
+        url: `courses/enrollments/${enrollments_id}/modules/${module_id}/quizzes/${quiz_id}/attempt/`,
+        method: "POST",
+      }),
+    }),
+    saveQuizAnswers: builder.mutation({
+      query: ({ attempt, answers }) => ({
+        url: `courses/quiz-attempts/${attempt}/answers/`,
+        method: "PATCH",
+        body: { answers },
+      }),
+    }),
     quizSubmit: builder.mutation({
       query: (payload) => ({
         url: `courses/quiz/submit/`,
@@ -144,6 +170,8 @@ export const {
   useLazyGetEnrolledModuleLessonsQuery,
   useLazyGetEnrolledModuleQuizzesQuery,
   useQuizSubmitMutation,
+  useStartQuizAttemptMutation,
+  useSaveQuizAnswersMutation,
   useLazyGetQuizResultQuery,
   useLazyGetCoursesDetailsQuery,
   useLazyGetChekoutCoursesDetailsQuery,
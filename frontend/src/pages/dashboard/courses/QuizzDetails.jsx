@@ -4,9 +4,11 @@ import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import {
   useLazyGetEnrolledModuleQuizzesQuery,
   useQuizSubmitMutation,
+  useSaveQuizAnswersMutation,
+  useStartQuizAttemptMutation,
 } from "@/features/course/courseApi";
 import { LucideTimer } from "lucide-react";
-import { useCallback, useEffect, useState } from "react";
+import { useCallback, useEffect, useRef, useState } from "react";
 import { useNavigate, useParams } from "react-router";
 
 const QuizzDetails = () => {
@@ -19,10 +21,17 @@ const QuizzDetails = () => {
     { isLoading: isSubmitting, isSuccess, error: submitError },
   ] = useQuizSubmitMutation();
 
+  // Timed quizzes run through an attempt: the server keeps the deadline
+  // and the autosaved answers
+  const [startQuizAttempt] = useStartQuizAttemptMutation();
+  const [saveQuizAnswers] = useSaveQuizAnswersMutation();
+
   // State for quiz data and selected options
   const [quizData, setQuizData] = useState(null);
   const [selectedOptions, setSelectedOptions] = useState({});
   const [timeLeft, setTimeLeft] = useState(null);
+  const [attempt, setAttempt] = useState(null);
+  const submittedRef = useRef(false);
 
   // Fetch quiz data using useLazyGetEnrolledModuleQuizzesQuery
   const [trigger, { data, isLoading, error }] =
@@ -50,38 +59,31 @@ const QuizzDetails = () => {
           navigate(
             `/dashboard/my-courses/${courseId}/modules/${moduleId}/quizes/${firstQuiz.result.quiz_result_id}/result`
           );
+        } else if (firstQuiz.time_limit) {
+          // Start (or resume) the attempt: the time left and saved answers
+          // come from the server, so a reload or another device picks them up
+          startQuizAttempt({
+            enrollments_id: courseId,
+            module_id: moduleId,
+            quiz_id: firstQuiz.id,
+          })
+            .unwrap()
+            .then((response) => {
+              setAttempt(response.attempt);
+              setSelectedOptions(response.answers);
+              setTimeLeft(response.time_remaining);
+            })
+            .catch((error) => console.error("Error starting quiz:", error));
         }
-
-        // Restore timer from localStorage or set to quiz's time limit
-        const storedTimeLeft = localStorage.getItem(
-          `quizTimer-${courseId}-${moduleId}`
-        );
-        const lastActiveTime = localStorage.getItem(
-          `quizLastActiveTime-${courseId}-${moduleId}`
-        );
-
-        if (storedTimeLeft && lastActiveTime) {
-          const elapsedTime = Math.floor((Date.now() - lastActiveTime) / 1000); // Calculate elapsed time
-          const updatedTimeLeft = Math.max(
-            parseInt(storedTimeLeft, 10) - elapsedTime,
-            0
-          ); // Ensure timeLeft doesn't go below 0
-          setTimeLeft(updatedTimeLeft);
-        } else {
-          setTimeLeft(firstQuiz.time_limit); // Initialize with quiz's time limit
-        }
-
-        // Store the current timestamp as the last active time
-        localStorage.setItem(
-          `quizLastActiveTime-${courseId}-${moduleId}`,
-          Date.now()
-        );
       }
     }
-  }, [data, courseId, moduleId,navigate]);
+  }, [data, courseId, moduleId, navigate, startQuizAttempt]);
 
   // Handle quiz submission
   const handleSubmit = useCallback(async () => {
+    if (submittedRef.current) return; // Already submitting
+    submittedRef.current = true;
+
     // Format selectedOptions to include all questions, even unanswered ones
     const formattedSelectedOptions = {};
     quizData.questions.forEach((question) => {
@@ -94,6 +96,9 @@ const QuizzDetails = () => {
       quiz_id: quizData.id,
       selected_options: formattedSelectedOptions,
     };
+    if (attempt) {
+      payload.attempt = attempt;
+    }
 
     try {
       const response = await quizSubmit(payload).unwrap();
@@ -102,49 +107,45 @@ const QuizzDetails = () => {
       // Extract the quiz_result_id from the response
       const { quiz_result_id } = response;
 
-      // Clear the timer and last active time from localStorage
-      localStorage.removeItem(`quizTimer-${courseId}-${moduleId}`);
-      localStorage.removeItem(`quizLastActiveTime-${courseId}-${moduleId}`);
-
       // Navigate to the result page
       navigate(
         `/dashboard/my-courses/${courseId}/modules/${moduleId}/quizes/${quiz_result_id}/result`
       );
     } catch (error) {
+      submittedRef.current = false;
       console.error("Error submitting quiz:", error);
     }
-  }, [navigate, quizData, selectedOptions, courseId, moduleId, quizSubmit]);
+  }, [navigate, quizData, selectedOptions, courseId, moduleId, quizSubmit, attempt]);
 
-  // Timer logic
+  // Timer logic; the latest handleSubmit is kept in a ref so answering
+  // does not restart the countdown
+  const handleSubmitRef = useRef(handleSubmit);
   useEffect(() => {
-    if (timeLeft !== null && timeLeft > 0) {
-      const timer = setInterval(() => {
-        setTimeLeft((prevTime) => {
-          if (prevTime === 1) {
-            clearInterval(timer);
-            handleSubmit(); // Auto-submit when timer reaches zero
-            return 0;
-          }
+    handleSubmitRef.current = handleSubmit;
+  }, [handleSubmit]);
 
-          // Persist the timer and last active time in localStorage
-          localStorage.setItem(
-            `quizTimer-${courseId}-${moduleId}`,
-            prevTime - 1
-          );
-          localStorage.setItem(
-            `quizLastActiveTime-${courseId}-${moduleId}`,
-            Date.now()
-          );
-          return prevTime - 1;
-        });
-      }, 1000);
-
-      return () => clearInterval(timer); // Cleanup interval on component unmount or manual submission
+  useEffect(() => {
+    if (timeLeft === 0) {
+      handleSubmitRef.current(); // Auto-submit when timer reaches zero
+    } else if (timeLeft !== null) {
+      const timer = setTimeout(() => setTimeLeft(timeLeft - 1), 1000);
+      return () => clearTimeout(timer); // Cleanup on unmount or manual submission
     }
-  }, [timeLeft, handleSubmit, courseId, moduleId]);
+  }, [timeLeft]);
 
   // Handle option selection
   const handleOptionSelect = (questionId, optionOrder) => {
+    // Autosave the answer (null clears a deselected one); the server grades
+    // what was saved by the deadline
+    if (attempt) {
+      const deselected = selectedOptions[questionId] === optionOrder;
+      saveQuizAnswers({
+        attempt,
+        answers: { [questionId]: deselected ? null : optionOrder },
+      })
+        .unwrap()
+        .catch((error) => console.error("Error saving answer:", error));
+    }
     setSelectedOptions((prevOptions) => {
       if (prevOptions[questionId] === optionOrder) {
         // Deselect the option if it's already selected
@@ -201,13 +202,15 @@ const QuizzDetails = () => {
       <div className="fixed right-10 top-14 md:!top-[72px] flex justify-end max-w-[inherit] py-2 px-4 z-[5] transition-all duration-[600ms] ease-linear">
         <div className="flex items-center gap-4">
           {/* Timer */}
-          <div className="flex flex-wrap justify-center items-center p-2 rounded-[4px] w-fit gap-2 text-center bg-slate-200">
-            <LucideTimer />
-            <p className="font-medium text-center leading-[19px] tracking-[0.02em] flex justify-center items-center text-[15px]">
-              {Math.floor(timeLeft / 60)}m:
-              {(timeLeft % 60).toString().padStart(2, "0")}s
-            </p>
-          </div>
+          {timeLeft !== null && (
+            <div className="flex flex-wrap justify-center items-center p-2 rounded-[4px] w-fit gap-2 text-center bg-slate-200">
+              <LucideTimer />
+              <p className="font-medium text-center leading-[19px] tracking-[0.02em] flex justify-center items-center text-[15px]">
+                {Math.floor(timeLeft / 60)}m:
+                {(timeLeft % 60).toString().padStart(2, "0")}s
+              </p>
+            </div>
+          )}
 
           {/* Answered Questions Counter */}
           <div className="flex flex-wrap justify-center items-center rounded-[4px] w-fit gap-2 text-center bg-slate-200 p-1">
@@ -275,7 +278,7 @@ const QuizzDetails = () => {
           ))}
           <Button
             onClick={handleSubmit}
-            disabled={isSubmitting || timeLeft === 0}
+            disabled={isSubmitting}
           >
             {isSubmitting ? "Submitting..." : "Submit"}
           </Button>